@@ -30,7 +30,9 @@ from arch.api.proto import kv_pb2, kv_pb2_grpc, processor_pb2, processor_pb2_grp
 from arch.api.utils import cloudpickle
 from arch.api.utils.core import string_to_bytes, bytes_to_string
 from arch.api.utils.iter_utils import split_every
-from arch.api.core import EggRollContext
+from arch.api.core import EggRollContext, Broadcast
+
+DEFAULT_BLOCK_SIZE = 4096
 
 
 def init(job_id=None, server_conf_path="arch/conf/server_conf.json", eggroll_context=None):
@@ -176,6 +178,10 @@ class _DTable(object):
         left, right = _DTable._repartition_small_table(self, other)
         return _EggRoll.get_instance().subtractByKey(left, right)
 
+    def filterByKeys(self, other):
+        # the processor has no key filter service, a join keeping the left values is the same filter
+        return self.join(other, lambda v1, v2: v1)
+
     def filter(self, func):
         return _EggRoll.get_instance().filter(self, func)
 
@@ -186,6 +192,35 @@ class _DTable(object):
     def flatMap(self, func):
         return _EggRoll.get_instance().flatMap(self, func)
 
+    def toBlocks(self, func, block_size=DEFAULT_BLOCK_SIZE):
+        """
+        Build a block table: rows of each partition are cut into chunks of at most block_size (k, v) pairs,
+        func converts a chunk to one block, which is keyed by the first key of the chunk.
+        """
+        def to_blocks(kv_iterator):
+            blocks = []
+            for chunk in split_every(kv_iterator, block_size):
+                kv_list = list(chunk)
+                blocks.append((kv_list[0][0], func(kv_list)))
+            return blocks
+
+        return self.mapPartitions(to_blocks).flatMap(lambda k, blocks: blocks)
+
+    def mapBlocks(self, func):
+        """
+        Apply func to each whole block of a block table built by toBlocks.
+        """
+        return self.mapValues(func)
+
+    def lazy(self):
+        """
+        Operators of the processors run one by one, there is no plan to fuse them into, so the table stays eager.
+        """
+        return self
+
+    def materialize(self):
+        return self
+
     @staticmethod
     def _repartition_small_table(left, right):
         left_partitions = left._partitions
@@ -264,6 +299,10 @@ class _EggRoll(object):
         LOGGER.debug("created table: %s", _table)
         return _table
 
+    def broadcast(self, value):
+        # functions are cached by the processors by their bytes, so the value goes with the function
+        return Broadcast(value)
+
     def cleanup(self, name, namespace, persistent):
         if namespace is None or name is None:
             raise ValueError("neither name nor namespace can be None")
@@ -16,6 +16,7 @@
 
 import asyncio
 import concurrent
+import time
 
 import grpc
 
@@ -34,16 +35,21 @@ CONF_KEY_SERVER = "servers"
 
 ERROR_STATES = [federation_pb2.CANCELLED, federation_pb2.ERROR]
 
+# checkStatus blocks on server side until the transfer finishes or times out,
+# backoff only applies when it keeps returning early, so that a failing server is not spun on
+CHECK_STATUS_MIN_BACKOFF = 0.01
+CHECK_STATUS_MAX_BACKOFF = 1
+
 
 async def _async_receive(stub, transfer_meta):
     LOGGER.debug("start receiving {}".format(transfer_meta))
-    resp_meta = stub.recv(transfer_meta)
+    loop = asyncio.get_event_loop()
+    resp_meta = await loop.run_in_executor(None, stub.recv, transfer_meta)
     while resp_meta.transferStatus != federation_pb2.COMPLETE:
         if resp_meta.transferStatus in ERROR_STATES:
             raise IOError(
                 "receive terminated, state: {}".format(federation_pb2.TransferStatus.Name(resp_meta.transferStatus)))
-        resp_meta = stub.checkStatusNow(resp_meta)
-        await asyncio.sleep(1)
+        resp_meta = await loop.run_in_executor(None, stub.checkStatus, resp_meta)
     LOGGER.info("finish receiving {}".format(resp_meta))
     return resp_meta
 
@@ -51,11 +57,18 @@ async def _async_receive(stub, transfer_meta):
 def _thread_receive(receive_func, check_func, transfer_meta):
     LOGGER.debug("start receiving {}".format(transfer_meta))
     resp_meta = receive_func(transfer_meta)
+    backoff = CHECK_STATUS_MIN_BACKOFF
     while resp_meta.transferStatus != federation_pb2.COMPLETE:
         if resp_meta.transferStatus in ERROR_STATES:
             raise IOError(
                 "receive terminated, state: {}".format(federation_pb2.TransferStatus.Name(resp_meta.transferStatus)))
+        start = time.time()
         resp_meta = check_func(resp_meta)
+        if resp_meta.transferStatus != federation_pb2.COMPLETE and time.time() - start < backoff:
+            time.sleep(backoff)
+            backoff = min(backoff * 2, CHECK_STATUS_MAX_BACKOFF)
+        else:
+            backoff = CHECK_STATUS_MIN_BACKOFF
     LOGGER.info("finish receiving {}".format(resp_meta))
     return resp_meta
 
@@ -102,6 +115,7 @@ class FederationRuntime(object):
             options=[('grpc.max_send_message_length', -1), ('grpc.max_receive_message_length', -1)])
         self.stub = federation_pb2_grpc.TransferSubmitServiceStub(self.channel)
         self.__pool = concurrent.futures.ThreadPoolExecutor()
+        self.__get_pool = concurrent.futures.ThreadPoolExecutor()
         FederationRuntime.instance = self
 
     def __get_locator(self, obj, name=None):
@@ -182,6 +196,9 @@ class FederationRuntime(object):
                                                            type=federation_pb2.SEND))
                 LOGGER.debug("[REMOTE] Sent {}".format(_tagged_key))
 
+    def async_get(self, name, tag, idx=-1):
+        return self.__get_pool.submit(self.get, name, tag, idx)
+
     def get(self, name, tag, idx=-1):
         algorithm, sub_name = self.__check_authorization(name, is_send=False)
 
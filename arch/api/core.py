@@ -25,4 +25,23 @@ class EggRollContext(object):
         return self._naming_policy
 
 
+class Broadcast(object):
+    """
+    Handle of a read-only value used by the functions of table operations, created by eggroll.broadcast.
+    Functions should capture the handle and read handle.value inside, instead of capturing the value itself.
+    """
+    def __init__(self, value):
+        self._value = value
+
+    @property
+    def value(self):
+        return self._value
+
+    def destroy(self):
+        """
+        Free the stored value once no function reads it any more, it is also freed when the handle is released
+        """
+        pass
+
+
 
@@ -66,6 +66,13 @@ def parallelize(data: Iterable, include_key=False, name=None, partition=1, names
                                                chunk_size=chunk_size,
                                                in_place_computing=in_place_computing)
 
+def broadcast(value):
+    """
+    Share a large read-only value, e.g. split points or a model, with the functions of table operations.
+    The returned handle is captured by the functions in place of the value, which is read by handle.value
+    """
+    return RuntimeInstance.EGGROLL.broadcast(value)
+
 def cleanup(name, namespace, persistent=False):
     return RuntimeInstance.EGGROLL.cleanup(name=name, namespace=namespace, persistent=persistent)
 
@@ -60,6 +60,19 @@ def get(name, tag: str, idx=-1):
     return RuntimeInstance.FEDERATION.get(name=name, tag=tag, idx=idx)
 
 
+def async_get(name, tag: str, idx=-1):
+    """
+    This method will return at once, gets of many tags can be waited concurrently,
+    e.g. by concurrent.futures.wait. In standalone mode the objects are read in the thread calling result,
+    and without unix sockets the get is done before this method returns.
+    :param name: {alogrithm}.{variableName} defined in transfer_conf.json.
+    :param tag: object version, should be a string.
+    :param idx: idx of the party_ids in runtime role list, if out-of-range, list of all objects will be returned.
+    :return: A concurrent.futures.Future, whose result is what get returns.
+    """
+    return RuntimeInstance.FEDERATION.async_get(name=name, tag=tag, idx=idx)
+
+
 def remote(obj, name: str, tag: str, role=None, idx=-1):
     """
     This method will send an object to other parties
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: rsa-intersect-key.proto
+
+import sys
+_b=sys.version_info[0]<3 and (lambda x:x) or (lambda x:x.encode('latin1'))
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from google.protobuf import reflection as _reflection
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor.FileDescriptor(
+  name='rsa-intersect-key.proto',
+  package='com.webank.ai.fate.core.mlmodel.buffer',
+  syntax='proto3',
+  serialized_options=_b('B\024RsaIntersectKeyProto'),
+  serialized_pb=_b('\n\x17rsa-intersect-key.proto\x12&com.webank.ai.fate.core.mlmodel.buffer\"Y\n\x0fRsaIntersectKey\x12\t\n\x01\x65\x18\x01 \x01(\t\x12\t\n\x01\x64\x18\x02 \x01(\t\x12\t\n\x01n\x18\x03 \x01(\t\x12\t\n\x01p\x18\x04 \x01(\t\x12\t\n\x01q\x18\x05 \x01(\t\x12\x0f\n\x07rsa_bit\x18\x06 \x01(\x05\x42\x16\x42\x14RsaIntersectKeyProtob\x06proto3')
+)
+
+
+
+
+_RSAINTERSECTKEY = _descriptor.Descriptor(
+  name='RsaIntersectKey',
+  full_name='com.webank.ai.fate.core.mlmodel.buffer.RsaIntersectKey',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='e', full_name='com.webank.ai.fate.core.mlmodel.buffer.RsaIntersectKey.e', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='d', full_name='com.webank.ai.fate.core.mlmodel.buffer.RsaIntersectKey.d', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='n', full_name='com.webank.ai.fate.core.mlmodel.buffer.RsaIntersectKey.n', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='p', full_name='com.webank.ai.fate.core.mlmodel.buffer.RsaIntersectKey.p', index=3,
+      number=4, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='q', full_name='com.webank.ai.fate.core.mlmodel.buffer.RsaIntersectKey.q', index=4,
+      number=5, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='rsa_bit', full_name='com.webank.ai.fate.core.mlmodel.buffer.RsaIntersectKey.rsa_bit', index=5,
+      number=6, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=67,
+  serialized_end=156,
+)
+
+DESCRIPTOR.message_types_by_name['RsaIntersectKey'] = _RSAINTERSECTKEY
+_sym_db.RegisterFileDescriptor(DESCRIPTOR)
+
+RsaIntersectKey = _reflection.GeneratedProtocolMessageType('RsaIntersectKey', (_message.Message,), dict(
+  DESCRIPTOR = _RSAINTERSECTKEY,
+  __module__ = 'rsa_intersect_key_pb2'
+  # @@protoc_insertion_point(class_scope:com.webank.ai.fate.core.mlmodel.buffer.RsaIntersectKey)
+  ))
+_sym_db.RegisterMessage(RsaIntersectKey)
+
+
+DESCRIPTOR._options = None
+# @@protoc_insertion_point(module_scope)
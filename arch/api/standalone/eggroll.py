@@ -14,18 +14,19 @@
 #  limitations under the License.
 #
 
+import atexit
 import os
-import pickle as c_pickle
 from arch.api import StoreType
-from arch.api.utils import cloudpickle as f_pickle, cache_utils, file_utils
+from arch.api.utils import cloudpickle as f_pickle, cache_utils, file_utils, eggroll_serdes
 from arch.api.utils.core import string_to_bytes, bytes_to_string
-from arch.api.core import EggRollContext
+from arch.api.utils.iter_utils import join_txns
+from arch.api.core import EggRollContext, Broadcast
 from heapq import heapify, heappop, heapreplace
 from typing import Iterable
 import uuid
 from concurrent.futures import ProcessPoolExecutor as Executor
 import lmdb
-from cachetools import cached
+from cachetools import cached, LRUCache
 import numpy as np
 from functools import partial
 from operator import is_not
@@ -35,6 +36,8 @@ import shutil
 import time
 import socket
 import random
+import threading
+import weakref
 
 DELIMETER = '-'
 DELIMETER_ENCODED = DELIMETER.encode()
@@ -43,9 +46,15 @@ DELIMETER_ENCODED = DELIMETER.encode()
 class Standalone:
     __instance = None
 
-    def __init__(self, job_id=None, eggroll_context=None):
+    def __init__(self, job_id=None, eggroll_context=None, shared_memory_dir=None):
         self.data_dir = os.path.join(file_utils.get_project_base_directory(), 'data')
+        self.shared_memory_dir = _get_shared_memory_dir(self.data_dir, shared_memory_dir or SHARED_MEMORY_DIR)
         self.job_id = str(uuid.uuid1()) if job_id is None else "{}".format(job_id)
+        self.pid = os.getpid()
+        if self.shared_memory_dir is not None:
+            _sweep_shared_memory(self.shared_memory_dir)
+            _lease_shared_memory(self.shared_memory_dir, self.job_id, self.pid)
+            atexit.register(_release_shared_memory, self.shared_memory_dir, self.pid)
         self.meta_table = _DTable('__META__', '__META__', 'fragments', 10)
         self.pool = Executor()
         Standalone.__instance = self
@@ -78,31 +87,61 @@ class Standalone:
                     error_if_exist=False,
                     persistent=False, chunk_size=100000, in_place_computing=False):
         _iter = data if include_key else enumerate(data)
+        # a table named by eggroll can only be reached by its objects, it is destroyed once they are released
+        _is_owned = name is None and not persistent
         if name is None:
             name = str(uuid.uuid1())
         if namespace is None:
             namespace = self.job_id
         __table = self.table(name, namespace, partition, persistent=persistent, in_place_computing=in_place_computing)
         __table.put_all(_iter, chunk_size=chunk_size)
-        return __table
+        return _track_table(__table) if _is_owned else __table
+
 
+    def broadcast(self, value):
+        broadcast_id = str(uuid.uuid1())
+        _put_broadcast_bytes(self.job_id, broadcast_id, _serdes.serialize(value))
+        return _Broadcast(self.job_id, broadcast_id, value)
 
     def cleanup(self, name, namespace, persistent):
         if not namespace or not name:
             raise ValueError("neither name nor namespace can be blank")
 
         _type = StoreType.LMDB.value if persistent else StoreType.IN_MEMORY.value
-        _base_dir = os.sep.join([Standalone.get_instance().data_dir, _type])
-        if not os.path.isdir(_base_dir):
+        _base_dirs = [_base_dir for _base_dir in _get_db_paths(_type) if os.path.isdir(_base_dir)]
+        if not _base_dirs:
             raise EnvironmentError("illegal datadir set for eggroll")
 
-        _namespace_dir = os.sep.join([_base_dir, namespace])
-        if not os.path.isdir(_namespace_dir):
+        _namespace_dirs = [os.sep.join([_base_dir, namespace]) for _base_dir in _base_dirs
+                           if os.path.isdir(os.sep.join([_base_dir, namespace]))]
+        if not _namespace_dirs:
             raise EnvironmentError("namespace does not exist")
 
-        _tables_to_delete = fnmatch.filter(os.listdir(_namespace_dir), name)
-        for table in _tables_to_delete:
-            shutil.rmtree(os.sep.join([_namespace_dir, table]))
+        for _namespace_dir in _namespace_dirs:
+            _tables_to_delete = fnmatch.filter(os.listdir(_namespace_dir), name)
+            for table in _tables_to_delete:
+                _table_dir = os.sep.join([_namespace_dir, table])
+                for _partition in os.listdir(_table_dir):
+                    _close_envs(os.sep.join([_table_dir, _partition]))
+                shutil.rmtree(_table_dir)
+
+    def disk_usage(self):
+        """
+        return dict: number and bytes of the IN_MEMORY tables of this job, in shared memory and in the data dir,
+        and number of them owned by this process, which are destroyed when released
+        """
+        _tables = set()
+        _bytes = 0
+        for _job_dir in _get_db_paths(StoreType.IN_MEMORY.value, self.job_id):
+            if not os.path.isdir(_job_dir):
+                continue
+            for _root, _, _files in os.walk(_job_dir):
+                for _file in _files:
+                    _bytes += os.stat(os.path.join(_root, _file)).st_blocks * 512
+            _tables.update(os.listdir(_job_dir))
+        _tables.discard(BROADCAST_TABLE_NAME)
+        _owned = sum(1 for _type, _namespace, _ in _table_refs if _namespace == self.job_id)
+        return {"tables": len(_tables), "bytes": _bytes, "owned_tables": _owned}
 
     def generateUniqueId(self):
         return self.unique_id_template % (self.job_id, self.host_name, self.host_ip, time.time(), random.randint(10000, 99999))
@@ -117,27 +156,282 @@ class Standalone:
         return self.eggroll_context
 
 
+# tables are pickled unless FATE_STANDALONE_SERDES selects another serdes, e.g. arch.api.utils.eggroll_serdes.BufferSerdes,
+# which writes ndarray and Instance values as raw buffers but adds a type check to every plain value
+_serdes = eggroll_serdes.get_serdes(os.environ.get('FATE_STANDALONE_SERDES'))
+
+DEFAULT_BLOCK_SIZE = 4096
+
+# functions pickled larger than this are stored in the broadcast table while their task info is alive,
+# and tasks only carry their id
+FUNCTION_INLINE_SIZE = 64 * 1024
+FUNCTION_CACHE_SIZE = 100
+BROADCAST_CACHE_SIZE = 1 << 30
+BROADCAST_TABLE_NAME = '__broadcast__'
+
+# IN_MEMORY tables are stored in this tmpfs directory if it is set, e.g. to '/dev/shm', None to keep them in the data dir.
+# A table written in one go may still fill it beyond SHARED_MEMORY_MIN_FREE, so it is only for hosts sized for the job.
+# Set by the environment variable FATE_SHARED_MEMORY_DIR, or per instance by the shared_memory_dir of Standalone.
+SHARED_MEMORY_DIR = os.environ.get('FATE_SHARED_MEMORY_DIR') or None
+SHARED_MEMORY_MIN_FREE = 1 << 30
+# namespaces of IN_MEMORY tables in shared memory, each with an empty file named by the pid of every process using it
+SHARED_MEMORY_LEASE_DIR = '__leases__'
+
+
 def serialize(_obj):
-    return c_pickle.dumps(_obj)
+    return _serdes.serialize(_obj)
 
 
 def _evict(_, env):
     env.close()
 
 
-@cached(cache=cache_utils.EvictLRUCache(maxsize=64, evict=_evict))
-def _open_env(path, write=False):
+_env_cache = cache_utils.EvictLRUCache(maxsize=64, evict=_evict)
+# the waiting threads of federation async_get read the status table through the cache too
+_env_cache_lock = threading.RLock()
+# namespaces leased in shared memory by this process
+_leased_namespaces = set()
+
+
+@cached(cache=_env_cache, lock=_env_cache_lock)
+def _open_env(path, write=False, sync=True):
     os.makedirs(path, exist_ok=True)
-    return lmdb.open(path, create=True, max_dbs=1, max_readers=1024, lock=write, sync=True, map_size=10_737_418_240)
+    return lmdb.open(path, create=True, max_dbs=1, max_readers=1024, lock=write, sync=sync, map_size=10_737_418_240)
+
+
+def _get_shared_memory_dir(data_dir, shared_memory_dir):
+    if shared_memory_dir is None or not os.access(shared_memory_dir, os.W_OK):
+        return None
+    return os.path.join(shared_memory_dir, 'fate_' + hashlib.md5(data_dir.encode()).hexdigest()[:16])
+
+
+def _get_shared_memory_free():
+    stat = os.statvfs(os.path.dirname(Standalone.get_instance().shared_memory_dir))
+    return stat.f_bavail * stat.f_frsize
+
+
+def _is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _lease_shared_memory(shared_memory_dir, namespace, pid):
+    """
+    keep the IN_MEMORY tables of namespace in shared memory while process pid runs
+    """
+    _lease_dir = os.sep.join([shared_memory_dir, SHARED_MEMORY_LEASE_DIR, namespace])
+    os.makedirs(_lease_dir, exist_ok=True)
+    open(os.sep.join([_lease_dir, str(pid)]), 'a').close()
+
+
+def _release_namespace(shared_memory_dir, namespace, pid=None):
+    """
+    Drop the lease of pid and the leases of dead processes on namespace, the IN_MEMORY tables of namespace are
+    removed from shared memory once no live process holds a lease
+    """
+    _lease_dir = os.sep.join([shared_memory_dir, SHARED_MEMORY_LEASE_DIR, namespace])
+    try:
+        _pids = [int(_pid) for _pid in os.listdir(_lease_dir)]
+    except (FileNotFoundError, ValueError):
+        return
+    for _pid in _pids:
+        if _pid == pid or not _is_alive(_pid):
+            try:
+                os.unlink(os.sep.join([_lease_dir, str(_pid)]))
+            except FileNotFoundError:
+                pass
+            continue
+        return
+
+    _namespace_dir = os.sep.join([shared_memory_dir, StoreType.IN_MEMORY.value, namespace])
+    for _key in [_key for _key in _env_cache.keys() if _key[0].startswith(_namespace_dir + os.sep)]:
+        _env_cache.pop(_key).close()
+    shutil.rmtree(_namespace_dir, ignore_errors=True)
+    shutil.rmtree(_lease_dir, ignore_errors=True)
+
+
+def _sweep_shared_memory(shared_memory_dir):
+    """
+    remove the IN_MEMORY tables left in shared memory by processes which did not exit normally
+    """
+    _lease_root = os.sep.join([shared_memory_dir, SHARED_MEMORY_LEASE_DIR])
+    if not os.path.isdir(_lease_root):
+        return
+    for _namespace in os.listdir(_lease_root):
+        _release_namespace(shared_memory_dir, _namespace)
+
+
+def _release_shared_memory(shared_memory_dir, pid):
+    """
+    called at exit, forked processes inherit the call and skip it
+    """
+    if os.getpid() != pid:
+        return
+    _lease_root = os.sep.join([shared_memory_dir, SHARED_MEMORY_LEASE_DIR])
+    if not os.path.isdir(_lease_root):
+        return
+    for _namespace in os.listdir(_lease_root):
+        _release_namespace(shared_memory_dir, _namespace, pid)
+
+
+def _get_db_paths(*args):
+    """
+    return list of the paths where args may be stored, the shared memory path comes first for IN_MEMORY tables
+    """
+    _instance = Standalone.get_instance()
+    _paths = [os.sep.join([_instance.data_dir, *args])]
+    if args[0] == StoreType.IN_MEMORY.value and _instance.shared_memory_dir is not None:
+        _paths.insert(0, os.sep.join([_instance.shared_memory_dir, *args]))
+    return _paths
 
 
 def _get_db_path(*args):
-    return os.sep.join([Standalone.get_instance().data_dir, *args])
+    """
+    If a shared memory dir is set, IN_MEMORY tables are kept in shared memory, which is seen by all processes on
+    the host and never hits the disk. A new partition spills to the data dir when shared memory has less than
+    SHARED_MEMORY_MIN_FREE left, an existing one is found where it was created. The tables of a namespace are
+    removed from shared memory when the last process using it exits.
+    """
+    _paths = _get_db_paths(*args)
+    for _path in _paths:
+        if os.path.isdir(_path):
+            return _path
+    if len(_paths) > 1 and _get_shared_memory_free() < SHARED_MEMORY_MIN_FREE:
+        return _paths[-1]
+    if len(_paths) > 1 and args[1] not in _leased_namespaces:
+        # the lease is taken for the process owning the instance, as worker processes come and go
+        _instance = Standalone.get_instance()
+        _lease_shared_memory(_instance.shared_memory_dir, args[1], _instance.pid)
+        _leased_namespaces.add(args[1])
+    return _paths[0]
 
 
 def _get_env(*args, write=False):
     _path = _get_db_path(*args)
-    return _open_env(_path, write=write)
+    # IN_MEMORY tables are temporary, there is nothing to recover after a crash, so they are never synced
+    return _open_env(_path, write=write, sync=args[0] != StoreType.IN_MEMORY.value)
+
+
+def _close_envs(path):
+    """
+    close and forget the cached envs of path, so a destroyed table does not hold a slot of the env cache
+    """
+    for _key in [_key for _key in _env_cache.keys() if _key[0] == path]:
+        _env_cache.pop(_key).close()
+
+
+# number of live _DTable objects of each temporary table created in this process, keyed by (type, namespace, name)
+_table_refs = {}
+# temporary tables whose names have left this process, sent by federation, they are never destroyed on release.
+# a table pickled with a task function is not pinned, the task only runs while the caller holds the table
+_pinned_tables = set()
+
+
+def _track_table(table, source=None):
+    """
+    Make table owned by this process: its data is destroyed once no _DTable object of it is left.
+    The output of an in-place operator is the source itself, which is tracked only if the source is.
+    """
+    _key = (table._type, table._namespace, table._name)
+    if source is not None and _key == (source._type, source._namespace, source._name) and _key not in _table_refs:
+        return table
+    _table_refs[_key] = _table_refs.get(_key, 0) + 1
+    weakref.finalize(table, _release_table, _key, table._partitions).atexit = False
+    return table
+
+
+def _pin_table(table):
+    _key = (table._type, table._namespace, table._name)
+    if _key in _table_refs:
+        _pinned_tables.add(_key)
+
+
+def _release_table(key, partitions):
+    _table_refs[key] -= 1
+    if _table_refs[key] > 0:
+        return
+    del _table_refs[key]
+    if key in _pinned_tables:
+        _pinned_tables.discard(key)
+        return
+    if any(os.path.isdir(_path) for _path in _get_db_paths(*key)):
+        _DTable(*key, partitions).destroy()
+
+
+def _get_broadcast_env(job_id, write=False):
+    return _get_env(StoreType.IN_MEMORY.value, job_id, BROADCAST_TABLE_NAME, '0', write=write)
+
+
+def _put_broadcast_bytes(job_id, broadcast_id, value_bytes):
+    with _get_broadcast_env(job_id, write=True).begin(write=True) as txn:
+        txn.put(broadcast_id.encode(), value_bytes, overwrite=False)
+
+
+def _delete_broadcast_bytes(job_id, broadcast_id):
+    with _get_broadcast_env(job_id, write=True).begin(write=True) as txn:
+        txn.delete(broadcast_id.encode())
+
+
+def _get_broadcast_bytes(job_id, broadcast_id):
+    with _get_broadcast_env(job_id).begin() as txn:
+        value_bytes = txn.get(broadcast_id.encode())
+    if value_bytes is None:
+        raise KeyError("broadcast {} not found in job {}".format(broadcast_id, job_id))
+    return value_bytes
+
+
+# caches of the worker processes, keyed by content hash and by broadcast id, so that a function or a broadcast value
+# is deserialized once per worker instead of once per task
+_function_cache = LRUCache(maxsize=FUNCTION_CACHE_SIZE)
+_broadcast_cache = LRUCache(maxsize=BROADCAST_CACHE_SIZE, getsizeof=lambda entry: entry[1])
+
+
+def _load_broadcast(job_id, broadcast_id):
+    entry = _broadcast_cache.get(broadcast_id)
+    if entry is None:
+        value_bytes = _get_broadcast_bytes(job_id, broadcast_id)
+        entry = _serdes.deserialize(value_bytes), len(value_bytes)
+        if entry[1] <= BROADCAST_CACHE_SIZE:
+            _broadcast_cache[broadcast_id] = entry
+    return entry[0]
+
+
+class _Broadcast(Broadcast):
+    """
+    Handle of a value stored once in the broadcast table of the job. Only the job id and the broadcast id
+    are pickled with the functions, workers load the value on access through their broadcast cache.
+    The value is deleted from the table by destroy, or once the handle created by broadcast is released.
+    """
+    def __init__(self, job_id, broadcast_id, value):
+        super(_Broadcast, self).__init__(value)
+        self._job_id = job_id
+        self._id = broadcast_id
+        self._is_local = True
+        self._finalizer = weakref.finalize(self, _delete_broadcast_bytes, job_id, broadcast_id)
+        self._finalizer.atexit = False
+
+    def destroy(self):
+        if self._is_local:
+            self._finalizer()
+
+    @property
+    def value(self):
+        if self._is_local:
+            return self._value
+        return _load_broadcast(self._job_id, self._id)
+
+    def __getstate__(self):
+        return {"_job_id": self._job_id, "_id": self._id}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._value = None
+        self._is_local = False
 
 
 def _hash_key_to_partition(key, partitions):
@@ -155,9 +449,11 @@ def _hash_key_to_partition(key, partitions):
 
 
 class _TaskInfo:
-    def __init__(self, task_id, function_id, function_bytes, is_in_place_computing):
+    def __init__(self, task_id, function_id, function_hash, function_bytes, is_in_place_computing):
         self._task_id = task_id
         self._function_id = function_id
+        self._function_hash = function_hash
+        # None if the function is stored in the broadcast table
         self._function_bytes = function_bytes
         self._is_in_place_computing = is_in_place_computing
 
@@ -199,13 +495,35 @@ class _BinaryProcess:
 
 
 def __get_function(info: _TaskInfo):
-    return f_pickle.loads(info._function_bytes)
+    func = _function_cache.get(info._function_hash)
+    if func is None:
+        function_bytes = info._function_bytes
+        if function_bytes is None:
+            function_bytes = _get_broadcast_bytes(info._task_id, info._function_id)
+        func = f_pickle.loads(function_bytes)
+        _function_cache[info._function_hash] = func
+    return func
 
 def __get_is_in_place_computing(info: _TaskInfo):
     return info._is_in_place_computing
 
+
+def _put_multi(txn, kv_iterable, is_sorted=False):
+    """
+    Write (key bytes, value bytes) pairs with one cursor.putmulti, the loop runs in lmdb instead of a put per pair.
+    Pairs in ascending key order, e.g. read from a source cursor, are appended if the db is empty, which skips
+    the tree search of every put. Return number of pairs written.
+    """
+    with txn.cursor() as cursor:
+        append = is_sorted and not cursor.last()
+        consumed, added = cursor.putmulti(kv_iterable, append=append)
+    if append and consumed != added:
+        raise ValueError("keys are not in ascending order, {} of {} appended".format(added, consumed))
+    return added
+
+
 def _generator_from_cursor(cursor):
-    deserialize = c_pickle.loads
+    deserialize = _serdes.deserialize
     for k, v in cursor:
         yield deserialize(k), deserialize(v)
 
@@ -215,8 +533,8 @@ def do_map(p: _UnaryProcess):
     op = p._operand
     rtn = __create_output_operand(op, p._info, p._process_conf, False)
     source_env = op.as_env()
-    serialize = c_pickle.dumps
-    deserialize = c_pickle.loads
+    serialize = _serdes.serialize
+    deserialize = _serdes.deserialize
     _table_key = ".".join([op._type, op._namespace, op._name])
     txn_map = {}
     partitions = Standalone.get_instance().meta_table.get(_table_key)
@@ -245,7 +563,7 @@ def do_map_partitions(p: _UnaryProcess):
     rtn = __create_output_operand(op, p._info, p._process_conf, False)
     source_env = op.as_env()
     dst_env = rtn.as_env(write=True)
-    serialize = c_pickle.dumps
+    serialize = _serdes.serialize
     with source_env.begin() as source_txn:
         with dst_env.begin(write=True) as dst_txn:
             cursor = source_txn.cursor()
@@ -264,15 +582,13 @@ def do_map_values(p: _UnaryProcess):
     rtn = __create_output_operand(op, p._info, p._process_conf, True)
     source_env = op.as_env()
     dst_env = rtn.as_env(write=True)
-    serialize = c_pickle.dumps
-    deserialize = c_pickle.loads
+    serialize = _serdes.serialize
+    deserialize = _serdes.deserialize
     with source_env.begin() as source_txn:
         with dst_env.begin(write=True) as dst_txn:
             cursor = source_txn.cursor()
-            for k_bytes, v_bytes in cursor:
-                v = deserialize(v_bytes)
-                v1 = _mapper(v)
-                dst_txn.put(k_bytes, serialize(v1))
+            _put_multi(dst_txn, ((k_bytes, serialize(_mapper(deserialize(v_bytes)))) for k_bytes, v_bytes in cursor),
+                       is_sorted=True)
             cursor.close()
     return rtn
 
@@ -286,22 +602,25 @@ def do_join(p: _BinaryProcess):
     right_env = right_op.as_env()
     left_env = left_op.as_env()
     dst_env = rtn.as_env(write=True)
-    serialize = c_pickle.dumps
-    deserialize = c_pickle.loads
+    serialize = _serdes.serialize
+    deserialize = _serdes.deserialize
     with left_env.begin() as left_txn:
         with right_env.begin() as right_txn:
             with dst_env.begin(write=True) as dst_txn:
-                cursor = left_txn.cursor()
-                for k_bytes, v1_bytes in cursor:
-                    v2_bytes = right_txn.get(k_bytes)
-                    if v2_bytes is None:
-                        if is_in_place_computing:
+                if is_in_place_computing:
+                    for k_bytes, v1_bytes in left_txn.cursor():
+                        v2_bytes = right_txn.get(k_bytes)
+                        if v2_bytes is None:
                             dst_txn.delete(k_bytes)
-                        continue
-                    v1 = deserialize(v1_bytes)
-                    v2 = deserialize(v2_bytes)
-                    v3 = _joiner(v1, v2)
-                    dst_txn.put(k_bytes, serialize(v3))
+                            continue
+                        v1 = deserialize(v1_bytes)
+                        v2 = deserialize(v2_bytes)
+                        v3 = _joiner(v1, v2)
+                        dst_txn.put(k_bytes, serialize(v3))
+                else:
+                    _put_multi(dst_txn, ((k_bytes, serialize(_joiner(deserialize(v1_bytes), deserialize(v2_bytes))))
+                                         for k_bytes, v1_bytes, v2_bytes in join_txns(left_txn, right_txn)),
+                               is_sorted=True)
     return rtn
 
 
@@ -309,7 +628,7 @@ def do_reduce(p: _UnaryProcess):
     _reducer = __get_function(p._info)
     op = p._operand
     source_env = op.as_env()
-    deserialize = c_pickle.loads
+    deserialize = _serdes.deserialize
     value = None
     with source_env.begin() as source_txn:
         cursor = source_txn.cursor()
@@ -327,8 +646,8 @@ def do_glom(p: _UnaryProcess):
     rtn = __create_output_operand(op, p._info, p._process_conf, False)
     source_env = op.as_env()
     dst_env = rtn.as_env(write=True)
-    serialize = c_pickle.dumps
-    deserialize = c_pickle.loads
+    serialize = _serdes.serialize
+    deserialize = _serdes.deserialize
     with source_env.begin() as source_txn:
         with dst_env.begin(write=True) as dest_txn:
             cursor = source_txn.cursor()
@@ -347,16 +666,13 @@ def do_sample(p: _UnaryProcess):
     rtn = __create_output_operand(op, p._info, p._process_conf, False)
     source_env = op.as_env()
     dst_env = rtn.as_env(write=True)
-    deserialize = c_pickle.loads
-    fraction, seed = deserialize(p._info._function_bytes)
+    fraction, seed = __get_function(p._info)
     with source_env.begin() as source_txn:
         with dst_env.begin(write=True) as dst_txn:
             cursor = source_txn.cursor()
             cursor.first()
             random_state = np.random.RandomState(seed)
-            for k, v in cursor:
-                if random_state.rand() < fraction:
-                    dst_txn.put(k, v)
+            _put_multi(dst_txn, ((k, v) for k, v in cursor if random_state.rand() < fraction), is_sorted=True)
     return rtn
 
 def do_subtract_by_key(p: _BinaryProcess):
@@ -367,23 +683,37 @@ def do_subtract_by_key(p: _BinaryProcess):
     right_env = right_op.as_env()
     left_env = left_op.as_env()
     dst_env = rtn.as_env(write=True)
-    serialize = c_pickle.dumps
-    deserialize = c_pickle.loads
+    serialize = _serdes.serialize
+    deserialize = _serdes.deserialize
     with left_env.begin() as left_txn:
         with right_env.begin() as right_txn:
             with dst_env.begin(write=True) as dst_txn:
                 cursor = left_txn.cursor()
-                for k_bytes, left_v_bytes in cursor:
-                    right_v_bytes = right_txn.get(k_bytes)
-                    if right_v_bytes is None:
-                        if not is_in_place_computing:       # add to new table (not in-place)
-                            dst_txn.put(k_bytes, left_v_bytes)
-                    else:                                   # delete in existing table (in-place)
-                        if is_in_place_computing:
+                if is_in_place_computing:                   # delete in existing table
+                    for k_bytes, left_v_bytes in cursor:
+                        if right_txn.get(k_bytes) is not None:
                             dst_txn.delete(k_bytes)
+                else:                                       # add to new table
+                    _put_multi(dst_txn, ((k_bytes, left_v_bytes) for k_bytes, left_v_bytes in cursor
+                                         if right_txn.get(k_bytes) is None), is_sorted=True)
                 cursor.close()
     return rtn
 
+def do_filter_by_keys(p: _BinaryProcess):
+    left_op = p._left
+    right_op = p._right
+    rtn = __create_output_operand(left_op, p._info, p._process_conf, False)
+    right_env = right_op.as_env()
+    left_env = left_op.as_env()
+    dst_env = rtn.as_env(write=True)
+    with left_env.begin() as left_txn:
+        with right_env.begin() as right_txn:
+            with dst_env.begin(write=True) as dst_txn:
+                _put_multi(dst_txn, ((k_bytes, left_v_bytes) for k_bytes, left_v_bytes, _ in
+                                     join_txns(left_txn, right_txn)), is_sorted=True)
+    return rtn
+
+
 def do_filter(p: _UnaryProcess):
     _func = __get_function(p._info)
     is_in_place_computing = __get_is_in_place_computing(p._info)
@@ -391,20 +721,18 @@ def do_filter(p: _UnaryProcess):
     rtn = __create_output_operand(op, p._info, p._process_conf, True)
     source_env = op.as_env()
     dst_env = rtn.as_env(write=True)
-    serialize = c_pickle.dumps
-    deserialize = c_pickle.loads
+    serialize = _serdes.serialize
+    deserialize = _serdes.deserialize
     with source_env.begin() as source_txn:
         with dst_env.begin(write=True) as dst_txn:
             cursor = source_txn.cursor()
-            for k_bytes, v_bytes in cursor:
-                k = deserialize(k_bytes)
-                v = deserialize(v_bytes)
-                if _func(k, v):
-                    if not is_in_place_computing:
-                        dst_txn.put(k_bytes, v_bytes)
-                else:
-                    if is_in_place_computing:
+            if is_in_place_computing:
+                for k_bytes, v_bytes in cursor:
+                    if not _func(deserialize(k_bytes), deserialize(v_bytes)):
                         dst_txn.delete(k_bytes)
+            else:
+                _put_multi(dst_txn, ((k_bytes, v_bytes) for k_bytes, v_bytes in cursor
+                                     if _func(deserialize(k_bytes), deserialize(v_bytes))), is_sorted=True)
             cursor.close()
     return rtn
 
@@ -417,8 +745,8 @@ def do_union(p: _BinaryProcess):
     right_env = right_op.as_env()
     left_env = left_op.as_env()
     dst_env = rtn.as_env(write=True)
-    serialize = c_pickle.dumps
-    deserialize = c_pickle.loads
+    serialize = _serdes.serialize
+    deserialize = _serdes.deserialize
     with left_env.begin() as left_txn:
         with right_env.begin() as right_txn:
             with dst_env.begin(write=True) as dst_txn:
@@ -451,20 +779,127 @@ def do_flat_map(p: _UnaryProcess):
     rtn = __create_output_operand(op, p._info, p._process_conf, False)
     source_env = op.as_env()
     dst_env = rtn.as_env(write=True)
-    serialize = c_pickle.dumps
-    deserialize = c_pickle.loads
+    serialize = _serdes.serialize
+    deserialize = _serdes.deserialize
+    with source_env.begin() as source_txn:
+        with dst_env.begin(write=True) as dst_txn:
+            cursor = source_txn.cursor()
+            _put_multi(dst_txn, ((serialize(result_k), serialize(result_v)) for k_bytes, v_bytes in cursor
+                                 for result_k, result_v in _func(deserialize(k_bytes), deserialize(v_bytes))))
+            cursor.close()
+    return rtn
+
+
+def do_to_blocks(p: _UnaryProcess):
+    _block_func, block_size = __get_function(p._info)
+    op = p._operand
+    rtn = __create_output_operand(op, p._info, p._process_conf, False)
+    source_env = op.as_env()
+    dst_env = rtn.as_env(write=True)
+    serialize = _serdes.serialize
+    deserialize = _serdes.deserialize
     with source_env.begin() as source_txn:
         with dst_env.begin(write=True) as dst_txn:
             cursor = source_txn.cursor()
+            block_k_bytes = None
+            kv_list = []
             for k_bytes, v_bytes in cursor:
-                k = deserialize(k_bytes)
-                v = deserialize(v_bytes)
-                map_result = _func(k, v)
-                for result_k, result_v in map_result:
-                    dst_txn.put(serialize(result_k), serialize(result_v))
+                if block_k_bytes is None:
+                    block_k_bytes = k_bytes
+                kv_list.append((deserialize(k_bytes), deserialize(v_bytes)))
+                if len(kv_list) >= block_size:
+                    dst_txn.put(block_k_bytes, serialize(_block_func(kv_list)))
+                    block_k_bytes = None
+                    kv_list = []
+            if kv_list:
+                dst_txn.put(block_k_bytes, serialize(_block_func(kv_list)))
             cursor.close()
     return rtn
 
+
+def do_map_blocks(p: _UnaryProcess):
+    _mapper = __get_function(p._info)
+    op = p._operand
+    rtn = __create_output_operand(op, p._info, p._process_conf, False)
+    source_env = op.as_env()
+    dst_env = rtn.as_env(write=True)
+    serialize = _serdes.serialize
+    deserialize = _serdes.deserialize
+    with source_env.begin() as source_txn:
+        with dst_env.begin(write=True) as dst_txn:
+            cursor = source_txn.cursor()
+            _put_multi(dst_txn, ((k_bytes, serialize(_mapper(deserialize(v_bytes)))) for k_bytes, v_bytes in cursor),
+                       is_sorted=True)
+            cursor.close()
+    return rtn
+
+
+def _run_step(step, rows, other_txns):
+    op, info, _ = step
+    _func = __get_function(info)
+    serialize = _serdes.serialize
+    deserialize = _serdes.deserialize
+    if op == 'mapValues':
+        return ((k_bytes, _func(v)) for k_bytes, v in rows)
+    elif op == 'filter':
+        return ((k_bytes, v) for k_bytes, v in rows if _func(deserialize(k_bytes), v))
+    elif op == 'flatMap':
+        return ((serialize(result_k), result_v) for k_bytes, v in rows
+                for result_k, result_v in _func(deserialize(k_bytes), v))
+    elif op == 'join':
+        other_txn = other_txns[id(step)]
+        return ((k_bytes, _func(v, deserialize(other_v_bytes))) for k_bytes, v, other_v_bytes in
+                ((k_bytes, v, other_txn.get(k_bytes)) for k_bytes, v in rows) if other_v_bytes is not None)
+    raise ValueError("unknown step of plan: {}".format(op))
+
+
+def do_run_plan(p: _UnaryProcess):
+    steps = __get_function(p._info)
+    op = p._operand
+    rtn = __create_output_operand(op, p._info, p._process_conf, False)
+    source_env = op.as_env()
+    dst_env = rtn.as_env(write=True)
+    serialize = _serdes.serialize
+    deserialize = _serdes.deserialize
+    other_txns = {}
+    try:
+        for step in steps:
+            _, _, other = step
+            if other is not None:
+                other_op = _Operand(*other, op._partition)
+                other_txns[id(step)] = other_op.as_env().begin()
+        with source_env.begin() as source_txn:
+            with dst_env.begin(write=True) as dst_txn:
+                cursor = source_txn.cursor()
+                rows = ((k_bytes, deserialize(v_bytes)) for k_bytes, v_bytes in cursor)
+                mapper_step = steps[-1] if steps[-1][0] == 'mapPartitions' else None
+                if mapper_step is not None:
+                    steps = steps[:-1]
+                for step in steps:
+                    rows = _run_step(step, rows, other_txns)
+                if mapper_step is not None:
+                    # as do_map_partitions, the result is put under the last key the mapper reads
+                    last_key = []
+
+                    def _mapper_rows(rows):
+                        for k_bytes, v in rows:
+                            last_key[:] = [k_bytes]
+                            yield deserialize(k_bytes), v
+
+                    v = __get_function(mapper_step[1])(_mapper_rows(rows))
+                    if last_key:
+                        dst_txn.put(last_key[0], serialize(v))
+                else:
+                    # keys stay in the order of the source unless a flatMap emits new ones
+                    _put_multi(dst_txn, ((k_bytes, serialize(v)) for k_bytes, v in rows),
+                               is_sorted=all(op != 'flatMap' for op, _, _ in steps))
+                cursor.close()
+    finally:
+        for txn in other_txns.values():
+            txn.abort()
+    return rtn
+
+
 def __get_in_place_computing_from_task_info(task_info):
     return task_info._is_in_place_computing
 
@@ -478,7 +913,7 @@ def __create_output_operand(src_op, task_info, process_conf, is_in_place_computi
         storage_name = DELIMETER.join([src_op._namespace, src_op._name, src_op._type])
         name_ba = bytearray(storage_name.encode())
         name_ba.extend(DELIMETER_ENCODED)
-        name_ba.extend(task_info._function_bytes)
+        name_ba.extend(task_info._function_hash.encode())
 
         name = hashlib.md5(name_ba).hexdigest()
     else:
@@ -520,14 +955,14 @@ class _DTable(object):
         # can not use is None
         if "k" in kwargs and "v" in kwargs:
             k, v = kwargs["k"], kwargs["v"]
-            return (c_pickle.dumps(k), c_pickle.dumps(v)) if use_serialize \
+            return (_serdes.serialize(k), _serdes.serialize(v)) if use_serialize \
                 else (string_to_bytes(k), string_to_bytes(v))
         elif "k" in kwargs:
             k = kwargs["k"]
-            return c_pickle.dumps(k) if use_serialize else string_to_bytes(k)
+            return _serdes.serialize(k) if use_serialize else string_to_bytes(k)
         elif "v" in kwargs:
             v = kwargs["v"]
-            return c_pickle.dumps(v) if use_serialize else string_to_bytes(v)
+            return _serdes.serialize(v) if use_serialize else string_to_bytes(v)
 
     def put(self, k, v, use_serialize=True):
         k_bytes, v_bytes = self.kv_to_bytes(k=k, v=v, use_serialize=use_serialize)
@@ -551,7 +986,7 @@ class _DTable(object):
         with env.begin(write=True) as txn:
             old_value_bytes = txn.get(k_bytes)
             if txn.delete(k_bytes):
-                return None if old_value_bytes is None else (c_pickle.loads(old_value_bytes) if use_serialize else old_value_bytes)
+                return None if old_value_bytes is None else (_serdes.deserialize(old_value_bytes) if use_serialize else old_value_bytes)
             return None
 
     def put_if_absent(self, k, v, use_serialize=True):
@@ -564,7 +999,7 @@ class _DTable(object):
                 v_bytes = self.kv_to_bytes(v=v, use_serialize=use_serialize)
                 txn.put(k_bytes, v_bytes)
                 return None
-            return c_pickle.loads(old_value_bytes) if use_serialize else old_value_bytes
+            return _serdes.deserialize(old_value_bytes) if use_serialize else old_value_bytes
 
     def put_all(self, kv_list: Iterable, use_serialize=True, chunk_size=100000):
         txn_map = {}
@@ -573,14 +1008,24 @@ class _DTable(object):
             env = self._get_env_for_partition(p, write=True)
             txn = env.begin(write=True)
             txn_map[p] = env, txn
-        for k, v in kv_list:
-            try:
+        # pairs are buffered per partition and written sorted by key, the last value of a duplicated key wins
+        buffers = {p: {} for p in txn_map}
+
+        def _flush(p):
+            _put_multi(txn_map[p][1], sorted(buffers[p].items()), is_sorted=True)
+            buffers[p] = {}
+
+        try:
+            for k, v in kv_list:
                 k_bytes, v_bytes = self.kv_to_bytes(k=k, v=v, use_serialize=use_serialize)
                 p = _hash_key_to_partition(k_bytes, self._partitions)
-                _succ = _succ and txn_map[p][1].put(k_bytes, v_bytes)
-            except Exception as e:
-                _succ = False
-                break
+                buffers[p][k_bytes] = v_bytes
+                if len(buffers[p]) >= chunk_size:
+                    _flush(p)
+            for p in txn_map:
+                _flush(p)
+        except Exception as e:
+            _succ = False
         for p, (env, txn) in txn_map.items():
             txn.commit() if _succ else txn.abort()
 
@@ -590,19 +1035,16 @@ class _DTable(object):
         env = self._get_env_for_partition(p)
         with env.begin(write=True) as txn:
             old_value_bytes = txn.get(k_bytes)
-            return None if old_value_bytes is None else (c_pickle.loads(old_value_bytes) if use_serialize else old_value_bytes)
+            return None if old_value_bytes is None else (_serdes.deserialize(old_value_bytes) if use_serialize else old_value_bytes)
 
     def destroy(self):
-        for p in range(self._partitions):
-            env = self._get_env_for_partition(p, write=True)
-            db = env.open_db()
-            with env.begin(write=True) as txn:
-                txn.drop(db)
         _table_key = ".".join([self._type, self._namespace, self._name])
         Standalone.get_instance().meta_table.delete(_table_key)
-        _path = _get_db_path(self._type, self._namespace, self._name)
-        import shutil
-        shutil.rmtree(_path)
+        for _path in _get_db_paths(self._type, self._namespace, self._name):
+            for p in range(self._partitions):
+                _close_envs(os.sep.join([_path, str(p)]))
+            if os.path.isdir(_path):
+                shutil.rmtree(_path)
 
     def collect(self, min_chunk_size=0, use_serialize=True):
         iterators = []
@@ -610,7 +1052,11 @@ class _DTable(object):
             env = self._get_env_for_partition(p)
             txn = env.begin()
             iterators.append(txn.cursor())
-        return self._merge(iterators, use_serialize)
+        return self._hold(self._merge(iterators, use_serialize))
+
+    def _hold(self, iterator):
+        # the table is not released while its cursors are read, even if the caller only keeps the iterator
+        yield from iterator
 
     def save_as(self, name, namespace, partition=None, use_serialize=True):
         if partition is None:
@@ -656,7 +1102,7 @@ class _DTable(object):
         while entries:
             key, value, _, it = entry = entries[0]
             if use_serialize:
-                yield c_pickle.loads(key), c_pickle.loads(value)
+                yield _serdes.deserialize(key), _serdes.deserialize(value)
             else:
                 yield bytes_to_string(key), value
             if it.next():
@@ -672,13 +1118,29 @@ class _DTable(object):
         func_id = str(uuid.uuid1())
         return func_id, pickled_function
 
+    def _create_task_info(self, func):
+        _job_id = Standalone.get_instance().job_id
+        func_id, pickled_function = self._serialize_and_hash_func(func)
+        function_hash = hashlib.sha1(pickled_function).hexdigest()
+        if len(pickled_function) <= FUNCTION_INLINE_SIZE:
+            return _TaskInfo(_job_id, func_id, function_hash, pickled_function, self.get_in_place_computing())
+
+        _put_broadcast_bytes(_job_id, func_id, pickled_function)
+        task_info = _TaskInfo(_job_id, func_id, function_hash, None, self.get_in_place_computing())
+        # the copies pickled to the workers are done with once the caller drops the task info
+        weakref.finalize(task_info, _delete_broadcast_bytes, _job_id, func_id).atexit = False
+        return task_info
+
     @staticmethod
     def _repartition(dtable, partition_num, repartition_policy=None):
-        return dtable.save_as(str(uuid.uuid1()), Standalone.get_instance().job_id, partition_num)
+        return _track_table(dtable.save_as(str(uuid.uuid1()), Standalone.get_instance().job_id, partition_num))
+
+    def _create_result_table(self, result):
+        table = Standalone.get_instance().table(result._name, result._namespace, self._partitions, persistent=False)
+        return _track_table(table, source=self)
 
     def _submit_to_pool(self, func, _do_func):
-        func_id, pickled_function = self._serialize_and_hash_func(func)
-        _task_info = _TaskInfo(Standalone.get_instance().job_id, func_id, pickled_function, self.get_in_place_computing())
+        _task_info = self._create_task_info(func)
         results = []
         for p in range(self._partitions):
             _op = _Operand(self._type, self._namespace, self._name, p)
@@ -691,19 +1153,19 @@ class _DTable(object):
         results = self._submit_to_pool(func, do_map)
         for r in results:
             result = r.result()
-        return Standalone.get_instance().table(result._name, result._namespace, self._partitions, persistent=False)
+        return self._create_result_table(result)
 
     def mapValues(self, func):
         results = self._submit_to_pool(func, do_map_values)
         for r in results:
             result = r.result()
-        return Standalone.get_instance().table(result._name, result._namespace, self._partitions, persistent=False)
+        return self._create_result_table(result)
 
     def mapPartitions(self, func):
         results = self._submit_to_pool(func, do_map_partitions)
         for r in results:
             result = r.result()
-        return Standalone.get_instance().table(result._name, result._namespace, self._partitions, persistent=False)
+        return self._create_result_table(result)
 
     def reduce(self, func):
         rs = [r.result() for r in self._submit_to_pool(func, do_reduce)]
@@ -719,19 +1181,15 @@ class _DTable(object):
         results = self._submit_to_pool(None, do_glom)
         for r in results:
             result = r.result()
-        return Standalone.get_instance().table(result._name, result._namespace, self._partitions, persistent=False)
+        return self._create_result_table(result)
 
     def join(self, other, func):
-        _job_id = Standalone.get_instance().job_id
         if other._partitions != self._partitions:
             if other.count() > self.count():
-                return self.save_as(str(uuid.uuid1()), _job_id, partition=other._partitions).join(other,
-                                                                                                  func)
+                return self._repartition(self, other._partitions).join(other, func)
             else:
-                return self.join(other.save_as(str(uuid.uuid1()), _job_id, partition=self._partitions),
-                                 func)
-        func_id, pickled_function = self._serialize_and_hash_func(func)
-        _task_info = _TaskInfo(_job_id, func_id, pickled_function, self.get_in_place_computing())
+                return self.join(self._repartition(other, self._partitions), func)
+        _task_info = self._create_task_info(func)
         results = []
         for p in range(self._partitions):
             _left = _Operand(self._type, self._namespace, self._name, p)
@@ -741,23 +1199,21 @@ class _DTable(object):
             results.append(Standalone.get_instance().pool.submit(do_join, _p))
         for r in results:
             result = r.result()
-        return Standalone.get_instance().table(result._name, result._namespace, self._partitions, persistent=False)
+        return self._create_result_table(result)
 
     def sample(self, fraction, seed=None):
         results = self._submit_to_pool((fraction, seed), do_sample)
         for r in results:
             result = r.result()
-        return Standalone.get_instance().table(result._name, result._namespace, self._partitions, persistent=False)
+        return self._create_result_table(result)
 
     def subtractByKey(self, other):
-        _job_id = Standalone.get_instance().job_id
         if other._partitions != self._partitions:
             if other.count() > self.count():
-                return self.save_as(str(uuid.uuid1()), _job_id, partition=other._partitions).subtractByKey(other)
+                return self._repartition(self, other._partitions).subtractByKey(other)
             else:
-                return self.union(other.save_as(str(uuid.uuid1()), _job_id, partition=self._partitions))
-        func_id, pickled_function = self._serialize_and_hash_func(self._namespace + '.' + self._name + '-' + other._namespace + '.' + other._name)
-        _task_info = _TaskInfo(_job_id, func_id, pickled_function, self.get_in_place_computing())
+                return self.union(self._repartition(other, self._partitions))
+        _task_info = self._create_task_info(self._namespace + '.' + self._name + '-' + other._namespace + '.' + other._name)
         results = []
         for p in range(self._partitions):
             _left = _Operand(self._type, self._namespace, self._name, p)
@@ -767,25 +1223,39 @@ class _DTable(object):
             results.append(Standalone.get_instance().pool.submit(do_subtract_by_key, _p))
         for r in results:
             result = r.result()
-        return Standalone.get_instance().table(result._name, result._namespace, self._partitions, persistent=False)
+        return self._create_result_table(result)
+
+    def filterByKeys(self, other):
+        if other._partitions != self._partitions:
+            if other.count() > self.count():
+                return self._repartition(self, other._partitions).filterByKeys(other)
+            else:
+                return self.filterByKeys(self._repartition(other, self._partitions))
+        _task_info = self._create_task_info(self._namespace + '.' + self._name + '-' + other._namespace + '.' + other._name)
+        results = []
+        for p in range(self._partitions):
+            _left = _Operand(self._type, self._namespace, self._name, p)
+            _right = _Operand(other._type, other._namespace, other._name, p)
+            _p_conf = _ProcessConf.get_default()
+            _p = _BinaryProcess(_task_info, _left, _right, _p_conf)
+            results.append(Standalone.get_instance().pool.submit(do_filter_by_keys, _p))
+        for r in results:
+            result = r.result()
+        return self._create_result_table(result)
 
     def filter(self, func):
         results = self._submit_to_pool(func, do_filter)
         for r in results:
             result = r.result()
-        return Standalone.get_instance().table(result._name, result._namespace, self._partitions, persistent=False)
+        return self._create_result_table(result)
 
     def union(self, other, func=lambda v1, v2 : v1):
-        _job_id = Standalone.get_instance().job_id
         if other._partitions != self._partitions:
             if other.count() > self.count():
-                return self.save_as(str(uuid.uuid1()), _job_id, partition=other._partitions).union(other,
-                                                                                                  func)
+                return self._repartition(self, other._partitions).union(other, func)
             else:
-                return self.union(other.save_as(str(uuid.uuid1()), _job_id, partition=self._partitions),
-                                 func)
-        func_id, pickled_function = self._serialize_and_hash_func(func)
-        _task_info = _TaskInfo(_job_id, func_id, pickled_function, self.get_in_place_computing())
+                return self.union(self._repartition(other, self._partitions), func)
+        _task_info = self._create_task_info(func)
         results = []
         for p in range(self._partitions):
             _left = _Operand(self._type, self._namespace, self._name, p)
@@ -795,10 +1265,132 @@ class _DTable(object):
             results.append(Standalone.get_instance().pool.submit(do_union, _p))
         for r in results:
             result = r.result()
-        return Standalone.get_instance().table(result._name, result._namespace, self._partitions, persistent=False)
+        return self._create_result_table(result)
 
     def flatMap(self, func):
         results = self._submit_to_pool(func, do_flat_map)
         for r in results:
             result = r.result()
-        return Standalone.get_instance().table(result._name, result._namespace, self._partitions, persistent=False)
\ No newline at end of file
+        return self._create_result_table(result)
+
+    def toBlocks(self, func, block_size=DEFAULT_BLOCK_SIZE):
+        """
+        Build a block table: rows of each partition are cut into chunks of at most block_size (k, v) pairs,
+        func converts a chunk to one block, e.g. a columnar feature block, which is kept in the same partition
+        under the first key of the chunk.
+        """
+        results = self._submit_to_pool((func, block_size), do_to_blocks)
+        for r in results:
+            result = r.result()
+        return self._create_result_table(result)
+
+    def mapBlocks(self, func):
+        """
+        Apply func to each whole block of a block table built by toBlocks, the blocks are never computed in place.
+        """
+        results = self._submit_to_pool(func, do_map_blocks)
+        for r in results:
+            result = r.result()
+        return self._create_result_table(result)
+
+    def lazy(self):
+        """
+        Return a lazy view of this table, see _LazyDTable.
+        """
+        return _LazyDTable(self)
+
+    def materialize(self):
+        return self
+
+
+class _LazyDTable(_DTable):
+    """
+    Lazy view of a table: mapValues, filter, flatMap and co-partitioned join are recorded in a plan instead of
+    being executed. The plan runs in one pass per partition, writing only its final table, when the view is
+    used by any other operation, e.g. collect, count, reduce, save_as, a non-narrow operator or federation remote.
+    mapPartitions ends a plan: it runs in the same pass, so only its one value per partition is written.
+
+    Functions are pickled when their operator is called, as in eager mode, but the source table and the tables
+    joined are read when the plan runs, so they should not be changed or destroyed before that.
+    The plan never computes in place.
+    """
+
+    def __init__(self, source, steps=(), others=()):
+        self._source = source
+        self._steps = list(steps)
+        # tables joined by the steps, held so that they are not released before the plan runs
+        self._others = list(others)
+        self._table = None
+        self._partitions = source._partitions
+        self._in_place_computing = False
+        self.schema = {} if steps else source.schema
+
+    def __str__(self):
+        return "lazy plan of {} steps {} on {}".format(len(self._steps), [op for op, _, _ in self._steps],
+                                                       self._source)
+
+    def __reduce__(self):
+        # pickled as the table the plan writes
+        table = self.materialize()
+        return _DTable, (table._type, table._namespace, table._name, table._partitions), table.__dict__
+
+    @property
+    def _type(self):
+        return self.materialize()._type
+
+    @property
+    def _namespace(self):
+        return self.materialize()._namespace
+
+    @property
+    def _name(self):
+        return self.materialize()._name
+
+    def materialize(self):
+        """
+        Run the plan if it has not been run, return the table it writes, or the source table if the plan is empty
+        """
+        if self._table is None:
+            if not self._steps:
+                self._table = self._source
+            else:
+                results = self._source._submit_to_pool(self._steps, do_run_plan)
+                for r in results:
+                    result = r.result()
+                self._table = self._source._create_result_table(result)
+                self._others = []
+                self._table.schema = self.schema
+        return self._table
+
+    def lazy(self):
+        return self
+
+    def _add_step(self, op, func, other=None):
+        if self._table is not None:
+            return _LazyDTable(self._table)._add_step(op, func, other)
+        locator = None if other is None else (other._type, other._namespace, other._name)
+        others = self._others if other is None else self._others + [other]
+        return _LazyDTable(self._source, self._steps + [(op, self._source._create_task_info(func), locator)], others)
+
+    def mapValues(self, func):
+        return self._add_step('mapValues', func)
+
+    def filter(self, func):
+        return self._add_step('filter', func)
+
+    def flatMap(self, func):
+        return self._add_step('flatMap', func)
+
+    def join(self, other, func):
+        if other._partitions != self._partitions:
+            return super(_LazyDTable, self).join(other, func)
+        return self._add_step('join', func, other)
+
+    def mapPartitions(self, func):
+        if self._table is not None or not self._steps:
+            return super(_LazyDTable, self).mapPartitions(func)
+        steps = self._steps + [('mapPartitions', self._source._create_task_info(func), None)]
+        results = self._source._submit_to_pool(steps, do_run_plan)
+        for r in results:
+            result = r.result()
+        return self._source._create_result_table(result)
@@ -14,11 +14,20 @@
 #  limitations under the License.
 #
 
-from arch.api.standalone.eggroll import _DTable
+from arch.api.standalone.eggroll import _DTable, _pin_table
 from arch.api.standalone.eggroll import Standalone
 from arch.api.utils import file_utils
 from arch.api.utils.log_utils import getLogger
-import asyncio
+import atexit
+import concurrent.futures
+import hashlib
+import os
+import socket
+import tempfile
+import threading
+import time
+import uuid
+import lmdb
 from arch.api import StoreType
 
 OBJECT_STORAGE_NAME = "__federation__"
@@ -27,6 +36,11 @@ STATUS_TABLE_NAME = "__status__"
 CONF_KEY_FEDERATION = "federation"
 CONF_KEY_LOCAL = "local"
 
+# a notification may be lost if the receiver restarts, the status table is checked again after this timeout
+NOTIFY_WAIT_TIMEOUT = 1
+POLL_MIN_INTERVAL = 0.001
+POLL_MAX_INTERVAL = 0.1
+
 
 def init(job_id, runtime_conf):
     global LOGGER
@@ -38,19 +52,123 @@ def init(job_id, runtime_conf):
     return FederationRuntime(job_id, _party_id, _role, runtime_conf)
 
 
-async def check_status_and_get_value(_table, _key):
-    _value = _table.get(_key)
-    while _value is None:
-        await asyncio.sleep(0.1)
-        _value = _table.get(_key)
-    LOGGER.debug("[GET] Got {} type {}".format(_key, 'Table' if isinstance(_value, tuple) else 'Object'))
-    return _value
-
-
 def _get_meta_table(_name, _job_id):
     return Standalone.get_instance().table(_name, _job_id, partition=10)
 
 
+def _notify_address(job_id, role, party_id):
+    # unique to each notifier, so a runtime never binds or unlinks the socket of another one of the same party
+    _digest = hashlib.sha1("{}-{}-{}".format(job_id, role, party_id).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), "fate_federation_{}_{}.sock".format(_digest, uuid.uuid4().hex[:16]))
+
+
+def _notify_address_key(role, party_id):
+    return "__notify__-{}-{}".format(role, party_id)
+
+
+class _StatusNotifier(object):
+    """
+    Wakes up gets of this party when a remote to it is done.
+
+    Each party listens on a unix datagram socket whose address it registers in the status table, remote sends
+    the tagged key to the registered socket of the destination party after the status is written, and the
+    listening thread sets the event
+    of the key if a get watches it. A get watches its key before it checks the status table, so a
+    notification sent before that is not needed. On platforms without unix sockets, get falls back
+    to polling the status table.
+    """
+
+    def __init__(self, job_id, role, party_id):
+        self.job_id = job_id
+        # key -> [event, number of gets watching it], a key is dropped once no get watches it
+        self._events = {}
+        self._lock = threading.Lock()
+        self._address = _notify_address(job_id, role, party_id)
+        self._address_key = _notify_address_key(role, party_id)
+        self._sock = None
+        if not hasattr(socket, "AF_UNIX"):
+            return
+
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(self._address)
+        # a later runtime of the same party takes over the notifications, this one falls back to its timeout
+        _get_meta_table(STATUS_TABLE_NAME, job_id).put(self._address_key, self._address)
+        atexit.register(self.close)
+        threading.Thread(target=self._listen, daemon=True).start()
+
+    @property
+    def enabled(self):
+        return self._sock is not None
+
+    def _listen(self):
+        while True:
+            try:
+                _key = self._sock.recv(65536).decode("utf-8")
+            except OSError:
+                return
+            with self._lock:
+                if _key in self._events:
+                    self._events[_key][0].set()
+
+    def watch(self, key):
+        with self._lock:
+            if key not in self._events:
+                self._events[key] = [threading.Event(), 0]
+            self._events[key][1] += 1
+            return self._events[key][0]
+
+    def unwatch(self, key):
+        with self._lock:
+            if key in self._events:
+                self._events[key][1] -= 1
+                if self._events[key][1] <= 0:
+                    del self._events[key]
+
+    def notify(self, key, role, party_id):
+        if not self.enabled:
+            return
+        _address = _get_meta_table(STATUS_TABLE_NAME, self.job_id).get(_notify_address_key(role, party_id))
+        if _address is None:
+            # receiver not started yet, it will find the status when it starts to get
+            return
+        try:
+            self._sock.sendto(key.encode("utf-8"), _address)
+        except OSError:
+            # receiver closed, a restarted one finds the status when it gets
+            pass
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+            _status_table = _get_meta_table(STATUS_TABLE_NAME, self.job_id)
+            if _status_table.get(self._address_key) == self._address:
+                _status_table.delete(self._address_key)
+            os.unlink(self._address)
+
+
+class _GetFuture(concurrent.futures.Future):
+    """
+    Future of async_get, it is done once the objects are remoted, and result reads them by get
+    in the calling thread.
+    """
+
+    def __init__(self, get, name, tag, idx):
+        super().__init__()
+        self._get = get
+        self._args = (name, tag, idx)
+        self._value = None
+        self._value_lock = threading.Lock()
+
+    def result(self, timeout=None):
+        super().result(timeout)
+        with self._value_lock:
+            if self._get is not None:
+                self._value = self._get(*self._args)
+                self._get = None
+        return self._value
+
+
 class FederationRuntime(object):
     instance = None
 
@@ -70,7 +188,8 @@ class FederationRuntime(object):
         self.party_id = party_id
         self.role = role
         self.runtime_conf = runtime_conf
-        self._loop = asyncio.get_event_loop()
+        self._notifier = _StatusNotifier(job_id, role, party_id)
+        self._get_pool = concurrent.futures.ThreadPoolExecutor()
         FederationRuntime.instance = self
 
     def __get_parties(self, role):
@@ -116,14 +235,82 @@ class FederationRuntime(object):
                                                         _partyId)
                 _status_table = _get_meta_table(STATUS_TABLE_NAME, self.job_id)
                 if isinstance(obj, _DTable):
+                    # the receiver reads the table by name, the sender must not destroy it when releasing it
+                    _pin_table(obj)
                     _status_table.put(_tagged_key, (obj._type, obj._name, obj._namespace, obj._partitions))
                 else:
                     _table = _get_meta_table(OBJECT_STORAGE_NAME, self.job_id)
                     _table.put(_tagged_key, obj)
                     _status_table.put(_tagged_key, _tagged_key)
+                self._notifier.notify(_tagged_key, _role, _partyId)
                 LOGGER.debug("[REMOTE] Sent {}".format(_tagged_key))
 
-    def get(self, name, tag, idx=-1):
+    def __check_status_and_get_value(self, _table, _key):
+        if self._notifier.enabled:
+            _event = self._notifier.watch(_key)
+            try:
+                _value = _table.get(_key)
+                while _value is None:
+                    _event.wait(NOTIFY_WAIT_TIMEOUT)
+                    _value = _table.get(_key)
+            finally:
+                self._notifier.unwatch(_key)
+        else:
+            _interval = POLL_MIN_INTERVAL
+            _value = _table.get(_key)
+            while _value is None:
+                time.sleep(_interval)
+                _interval = min(_interval * 2, POLL_MAX_INTERVAL)
+                _value = _table.get(_key)
+        LOGGER.debug("[GET] Got {} type {}".format(_key, 'Table' if isinstance(_value, tuple) else 'Object'))
+        return _value
+
+    def async_get(self, name, tag, idx=-1):
+        """
+        Only the wait for the notifications runs in the pool, the objects are read by get in the thread calling
+        result of the returned future. As in get, the waiting thread checks the status table again after each
+        NOTIFY_WAIT_TIMEOUT, in case a notification was lost. Without notifications, get runs at once in the
+        calling thread.
+        """
+        _tagged_keys, _ = self.__get_tagged_keys(name, tag, idx)
+        _future = _GetFuture(self.get, name, tag, idx)
+        if not self._notifier.enabled:
+            _future.set_result(None)
+            _future.result()
+            return _future
+
+        _events = [self._notifier.watch(_key) for _key in _tagged_keys]
+        _status_table = _get_meta_table(STATUS_TABLE_NAME, self.job_id)
+        _waiting = [(_key, _event) for _key, _event in zip(_tagged_keys, _events) if _status_table.get(_key) is None]
+
+        def _is_remoted(_key):
+            try:
+                return _status_table.get(_key) is not None
+            except lmdb.Error:
+                # the env was evicted from the cache by the calling thread, check again after the next timeout
+                return False
+
+        def _wait():
+            try:
+                for _key, _event in _waiting:
+                    # as in get, a notification may be lost, the status is checked again after each timeout
+                    while not _event.wait(NOTIFY_WAIT_TIMEOUT) and not _is_remoted(_key):
+                        pass
+            finally:
+                for _key in _tagged_keys:
+                    self._notifier.unwatch(_key)
+            _future.set_result(None)
+
+        if _waiting:
+            self._get_pool.submit(_wait)
+        else:
+            _wait()
+        return _future
+
+    def __get_tagged_keys(self, name, tag, idx):
+        """
+        return (list, bool): tagged keys of the objects to get, whether idx specifies one party
+        """
         algorithm, sub_name = self.__check_authorization(name, is_send=False)
 
         auth_dict = self.trans_conf.get(algorithm)
@@ -132,24 +319,26 @@ class FederationRuntime(object):
 
         src_party_ids = self.__get_parties(src_role)
 
-        if 0 <= idx < len(src_party_ids):
+        _is_single = 0 <= idx < len(src_party_ids)
+        if _is_single:
             # idx is specified, return the remote object
             party_ids = [src_party_ids[idx]]
         else:
             # idx is not valid, return remote object list
             party_ids = src_party_ids
 
-        _status_table = _get_meta_table(STATUS_TABLE_NAME, self.job_id)
-
         LOGGER.debug("[GET] {} {} getting remote object {} from {} {}".format(self.role, self.party_id, tag, src_role,
                                                                               party_ids))
-        tasks = []
+        return [self.__remote__object_key(self.job_id, name, tag, src_role, party_id, self.role, self.party_id)
+                for party_id in party_ids], _is_single
+
+    def get(self, name, tag, idx=-1):
+        _tagged_keys, _is_single = self.__get_tagged_keys(name, tag, idx)
+        _status_table = _get_meta_table(STATUS_TABLE_NAME, self.job_id)
 
-        for party_id in party_ids:
-            _tagged_key = self.__remote__object_key(self.job_id, name, tag, src_role, party_id, self.role,
-                                                    self.party_id)
-            tasks.append(check_status_and_get_value(_status_table, _tagged_key))
-        results = self._loop.run_until_complete(asyncio.gather(*tasks))
+        results = []
+        for _tagged_key in _tagged_keys:
+            results.append(self.__check_status_and_get_value(_status_table, _tagged_key))
 
         rtn = []
 
@@ -162,6 +351,6 @@ class FederationRuntime(object):
             else:
                 rtn.append(_object_table.get(r))
 
-        if 0 <= idx < len(src_party_ids):
+        if _is_single:
             return rtn[0]
         return rtn
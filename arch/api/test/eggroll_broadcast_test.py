@@ -0,0 +1,87 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import gc
+import pickle
+import unittest
+
+import numpy as np
+
+from arch.api import eggroll
+
+eggroll.init("test_eggroll_broadcast")
+
+from arch.api.standalone.eggroll import FUNCTION_INLINE_SIZE, Standalone, _get_broadcast_env
+
+
+class TestBroadcast(unittest.TestCase):
+    def setUp(self):
+        self.table = eggroll.parallelize(range(100), partition=4)
+        self.weights = np.random.rand(100)
+
+    @classmethod
+    def tearDownClass(cls):
+        # the workers keep the broadcast table open, so it is only removed once all tests are done
+        eggroll.cleanup("*", Standalone.get_instance().job_id, persistent=False)
+
+    def broadcast_entries(self):
+        with _get_broadcast_env(Standalone.get_instance().job_id, write=True).begin() as txn:
+            return txn.stat()['entries']
+
+    def test_broadcast_value(self):
+        weights = eggroll.broadcast(self.weights)
+        self.assertTrue(weights.value is self.weights)
+
+        result = dict(self.table.mapValues(lambda v: v * weights.value[v]).collect())
+        for k, v in result.items():
+            self.assertEqual(v, k * self.weights[k])
+
+    def test_handle_pickles_without_value(self):
+        weights = eggroll.broadcast(self.weights)
+        self.assertTrue(len(pickle.dumps(weights)) < 1024)
+        self.assertTrue((pickle.loads(pickle.dumps(weights)).value == self.weights).all())
+
+    def test_destroy(self):
+        entries = self.broadcast_entries()
+        weights = eggroll.broadcast(self.weights)
+        other_weights = eggroll.broadcast(self.weights)
+        self.assertEqual(self.broadcast_entries(), entries + 2)
+
+        weights.destroy()
+        self.assertEqual(self.broadcast_entries(), entries + 1)
+        result = dict(self.table.mapValues(lambda v: other_weights.value[v]).collect())
+        self.assertEqual(result[1], self.weights[1])
+
+        del other_weights
+        gc.collect()
+        self.assertEqual(self.broadcast_entries(), entries)
+
+    def test_large_function(self):
+        entries = self.broadcast_entries()
+        weights = np.random.rand(FUNCTION_INLINE_SIZE)
+        result = dict(self.table.mapValues(lambda v: weights[v]).collect())
+        for k, v in result.items():
+            self.assertEqual(v, weights[k])
+
+        result = dict(self.table.join(self.table, lambda v1, v2: weights[v1] + v2).collect())
+        for k, v in result.items():
+            self.assertEqual(v, weights[k] + k)
+        gc.collect()
+        self.assertEqual(self.broadcast_entries(), entries)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import unittest
+
+from arch.api import eggroll
+
+eggroll.init("test_eggroll_bulk_load")
+
+
+class TestBulkLoad(unittest.TestCase):
+    def test_put_all(self):
+        table = eggroll.table("test_put_all", "test_eggroll_bulk_load", partition=4)
+        table.put_all([(k, k) for k in range(100, 0, -1)] + [(k, -k) for k in range(50)], chunk_size=16)
+        expected = {k: k for k in range(50, 101)}
+        expected.update({k: -k for k in range(50)})
+        self.assertEqual(dict(table.collect()), expected)
+
+        table.put_all([(k, 0) for k in range(10)])
+        expected.update({k: 0 for k in range(10)})
+        self.assertEqual(dict(table.collect()), expected)
+        table.destroy()
+
+    def test_operators(self):
+        table = eggroll.parallelize([("k" + str(i), i) for i in range(1000)], include_key=True, partition=4)
+        other = table.filter(lambda k, v: v % 2 == 0)
+        self.assertEqual(dict(table.mapValues(lambda v: v + 1).collect()),
+                         {"k" + str(i): i + 1 for i in range(1000)})
+        self.assertEqual(dict(table.join(other, lambda v1, v2: v1 + v2).collect()),
+                         {"k" + str(i): 2 * i for i in range(0, 1000, 2)})
+        self.assertEqual(dict(table.subtractByKey(other).collect()),
+                         {"k" + str(i): i for i in range(1, 1000, 2)})
+        self.assertEqual(dict(table.flatMap(lambda k, v: [(v, k), (-v, k)]).collect()),
+                         dict([(i, "k" + str(i)) for i in range(1000)] + [(-i, "k" + str(i)) for i in range(1000)]))
+
+
+if __name__ == '__main__':
+    unittest.main()
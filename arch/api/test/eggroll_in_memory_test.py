@@ -0,0 +1,130 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import os
+import subprocess
+import sys
+import time
+import unittest
+
+from concurrent.futures import ProcessPoolExecutor
+
+from arch.api import StoreType
+from arch.api import eggroll
+from arch.api.standalone import eggroll as standalone_eggroll
+
+eggroll.init("test_eggroll_in_memory")
+
+from arch.api.standalone.eggroll import Standalone
+
+SHARED_MEMORY_DIR = '/dev/shm'
+
+# creates a table in a job of its own and exits, normally or without running atexit
+JOB_SCRIPT = """
+import os, sys
+from arch.api import eggroll
+eggroll.init(sys.argv[1])
+table = eggroll.parallelize(range(10), partition=2, name="table", namespace=sys.argv[1])
+other = eggroll.parallelize(range(10), partition=2, name="table", namespace=sys.argv[1] + "_other")
+if sys.argv[2] == "crash":
+    os._exit(0)
+"""
+
+@unittest.skipIf(not os.access(SHARED_MEMORY_DIR, os.W_OK), "no shared memory dir")
+class TestInMemoryTable(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # shared memory is turned on for this class only, with a new pool whose workers see it
+        instance = Standalone.get_instance()
+        cls.default_shared_memory_dir, cls.default_pool = instance.shared_memory_dir, instance.pool
+        instance.shared_memory_dir = standalone_eggroll._get_shared_memory_dir(instance.data_dir, SHARED_MEMORY_DIR)
+        standalone_eggroll._lease_shared_memory(instance.shared_memory_dir, instance.job_id, instance.pid)
+        instance.pool = ProcessPoolExecutor()
+
+    @classmethod
+    def tearDownClass(cls):
+        instance = Standalone.get_instance()
+        instance.pool.shutdown()
+        standalone_eggroll._release_shared_memory(instance.shared_memory_dir, instance.pid)
+        standalone_eggroll._leased_namespaces.clear()
+        instance.shared_memory_dir, instance.pool = cls.default_shared_memory_dir, cls.default_pool
+
+    def setUp(self):
+        self.shared_memory_dir = Standalone.get_instance().shared_memory_dir
+        self.data_dir = Standalone.get_instance().data_dir
+
+    def table_dir(self, base_dir, table):
+        return os.sep.join([base_dir, table._type, table._namespace, table._name])
+
+    def test_in_shared_memory(self):
+        table = eggroll.parallelize(range(100), partition=4)
+        result = table.mapValues(lambda v: v + 1)
+        for t in [table, result]:
+            self.assertTrue(os.path.isdir(self.table_dir(self.shared_memory_dir, t)))
+            self.assertFalse(os.path.isdir(self.table_dir(self.data_dir, t)))
+        self.assertEqual(dict(result.collect()), {k: k + 1 for k in range(100)})
+
+        persistent_table = eggroll.parallelize(range(10), partition=2, persistent=True)
+        self.assertFalse(os.path.isdir(self.table_dir(self.shared_memory_dir, persistent_table)))
+        persistent_table.destroy()
+
+        result.destroy()
+        self.assertFalse(os.path.isdir(self.table_dir(self.shared_memory_dir, result)))
+
+    def test_spill(self):
+        min_free = standalone_eggroll.SHARED_MEMORY_MIN_FREE
+        standalone_eggroll.SHARED_MEMORY_MIN_FREE = float('inf')
+        try:
+            table = eggroll.parallelize(range(100), partition=4)
+        finally:
+            standalone_eggroll.SHARED_MEMORY_MIN_FREE = min_free
+        self.assertTrue(os.path.isdir(self.table_dir(self.data_dir, table)))
+        self.assertFalse(os.path.isdir(self.table_dir(self.shared_memory_dir, table)))
+        self.assertEqual(table.count(), 100)
+
+        eggroll.cleanup(table._name, table._namespace)
+        self.assertFalse(os.path.isdir(self.table_dir(self.data_dir, table)))
+
+    def run_job(self, job_id, how):
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path), FATE_SHARED_MEMORY_DIR=SHARED_MEMORY_DIR)
+        subprocess.check_call([sys.executable, "-c", JOB_SCRIPT, job_id, how], env=env)
+
+    def namespace_dir(self, namespace):
+        return os.sep.join([self.shared_memory_dir, StoreType.IN_MEMORY.value, namespace])
+
+    def test_release_at_exit(self):
+        job_id = "test_eggroll_in_memory_exit_{}".format(time.time())
+        self.run_job(job_id, "exit")
+        self.assertFalse(os.path.isdir(self.namespace_dir(job_id)))
+        self.assertFalse(os.path.isdir(self.namespace_dir(job_id + "_other")))
+
+    def test_sweep_after_crash(self):
+        job_id = "test_eggroll_in_memory_crash_{}".format(time.time())
+        self.run_job(job_id, "crash")
+        self.assertTrue(os.path.isdir(self.namespace_dir(job_id)))
+        self.assertTrue(os.path.isdir(self.namespace_dir(job_id + "_other")))
+
+        # tables of the running job are kept
+        table = eggroll.parallelize(range(10), partition=2)
+        standalone_eggroll._sweep_shared_memory(self.shared_memory_dir)
+        self.assertFalse(os.path.isdir(self.namespace_dir(job_id)))
+        self.assertFalse(os.path.isdir(self.namespace_dir(job_id + "_other")))
+        self.assertTrue(os.path.isdir(self.table_dir(self.shared_memory_dir, table)))
+        self.assertEqual(table.count(), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
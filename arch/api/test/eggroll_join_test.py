@@ -0,0 +1,52 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import unittest
+
+from arch.api import eggroll
+
+eggroll.init("test_eggroll_join")
+
+
+class TestJoin(unittest.TestCase):
+    def setUp(self):
+        self.table = eggroll.parallelize([("k" + str(i), i) for i in range(1000)], include_key=True, partition=4)
+
+    def check_join(self, other_keys, partition=4):
+        other = eggroll.parallelize([(k, -1) for k in other_keys], include_key=True, partition=partition)
+        expected = {k: int(k[1:]) for k in other_keys if k in dict(self.table.collect())}
+        self.assertEqual(dict(self.table.join(other, lambda v1, v2: v1 + v2).collect()),
+                         {k: v - 1 for k, v in expected.items()})
+        self.assertEqual(dict(other.join(self.table, lambda v1, v2: v1 - v2).collect()),
+                         {k: -1 - v for k, v in expected.items()})
+        self.assertEqual(dict(self.table.filterByKeys(other).collect()), expected)
+        self.assertEqual(dict(other.filterByKeys(self.table).collect()), {k: -1 for k in expected})
+
+    def test_merge_join(self):
+        self.check_join(["k" + str(i) for i in range(0, 2000, 3)])
+
+    def test_skewed_join(self):
+        self.check_join(["k" + str(i) for i in range(0, 1000, 100)] + ["other"])
+
+    def test_partitions_mismatch(self):
+        self.check_join(["k" + str(i) for i in range(0, 1000, 2)], partition=3)
+
+    def test_empty(self):
+        self.check_join([])
+
+
+if __name__ == '__main__':
+    unittest.main()
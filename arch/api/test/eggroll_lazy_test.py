@@ -0,0 +1,75 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import pickle
+import unittest
+
+from arch.api import eggroll
+
+eggroll.init("test_eggroll_lazy")
+
+
+class TestLazyDTable(unittest.TestCase):
+    def setUp(self):
+        self.table = eggroll.parallelize(range(100), partition=4)
+        self.other = eggroll.parallelize([(k, -k) for k in range(0, 100, 3)], include_key=True, partition=4)
+
+    def pipeline(self, table):
+        return table.mapValues(lambda v: v * 2) \
+            .filter(lambda k, v: k % 2 == 0) \
+            .join(self.other, lambda v1, v2: (v1, v2)) \
+            .flatMap(lambda k, v: [(k, v), (k + 1000, v[0])])
+
+    def test_same_result_as_eager(self):
+        eager = dict(self.pipeline(self.table).collect())
+        lazy = self.pipeline(self.table.lazy())
+        self.assertEqual(lazy._steps[-1][0], 'flatMap')
+        self.assertEqual(dict(lazy.collect()), eager)
+        self.assertEqual(lazy.count(), len(eager))
+
+    def test_plan_runs_once(self):
+        lazy = self.table.lazy().mapValues(lambda v: v + 1)
+        table = lazy.materialize()
+        self.assertTrue(lazy.materialize() is table)
+        self.assertEqual(lazy.reduce(lambda a, b: a + b), sum(range(1, 101)))
+
+        # steps after materialization start a new plan on its table
+        lazy = lazy.filter(lambda k, v: v > 50)
+        self.assertEqual(len(lazy._steps), 1)
+        self.assertEqual(lazy.count(), 50)
+
+    def test_map_partitions_ends_plan(self):
+        def sum_partition(kvs):
+            return sum(v1 * v2 for _, (v1, v2) in kvs)
+
+        plan = self.table.lazy().filter(lambda k, v: k % 2 == 0).join(self.other, lambda v1, v2: (v1, v2))
+        eager = self.table.filter(lambda k, v: k % 2 == 0).join(self.other, lambda v1, v2: (v1, v2))
+        lazy_sums = plan.mapPartitions(sum_partition)
+        self.assertTrue(plan._table is None)
+        self.assertEqual(dict(lazy_sums.collect()), dict(eager.mapPartitions(sum_partition).collect()))
+        self.assertEqual(lazy_sums.reduce(lambda a, b: a + b), sum(-k * k for k in range(0, 100, 6)))
+
+    def test_used_as_table(self):
+        lazy = self.table.lazy().mapValues(lambda v: -v)
+        joined = dict(self.other.join(lazy, lambda v1, v2: v1 == v2).collect())
+        self.assertTrue(all(joined.values()))
+
+        restored = pickle.loads(pickle.dumps(lazy))
+        self.assertEqual(dict(restored.collect()), dict(lazy.collect()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import gc
+import os
+import pickle
+import unittest
+
+from arch.api import eggroll
+
+eggroll.init("test_eggroll_lifecycle")
+
+from arch.api.standalone.eggroll import Standalone, _get_db_paths
+
+
+def table_exists(table_key):
+    return any(os.path.isdir(_path) for _path in _get_db_paths(*table_key))
+
+
+def get_table_key(table):
+    return table._type, table._namespace, table._name
+
+
+class TestLifecycle(unittest.TestCase):
+    def setUp(self):
+        self.table = eggroll.parallelize(range(100), partition=4)
+
+    def test_release(self):
+        result = self.table.mapValues(lambda v: v + 1)
+        table_key = get_table_key(result)
+        self.assertTrue(table_exists(table_key))
+
+        del result
+        gc.collect()
+        self.assertFalse(table_exists(table_key))
+        self.assertEqual(self.table.count(), 100)
+
+    def test_references(self):
+        result = self.table.mapValues(lambda v: v + 1)
+        table_key = get_table_key(result)
+        same_result = eggroll.table(result._name, result._namespace, partition=4, persistent=False)
+        del same_result
+        gc.collect()
+        self.assertTrue(table_exists(table_key))
+
+        iterator = result.collect()
+        del result
+        gc.collect()
+        self.assertEqual(dict(iterator), {k: k + 1 for k in range(100)})
+        del iterator
+        gc.collect()
+        self.assertFalse(table_exists(table_key))
+
+    def test_lazy_holds_joined_table(self):
+        plan = self.table.lazy().join(eggroll.parallelize(range(50), partition=4), lambda v1, v2: v1 + v2)
+        gc.collect()
+        self.assertEqual(dict(plan.collect()), {k: 2 * k for k in range(50)})
+
+    def test_not_destroyed(self):
+        named_table = eggroll.parallelize(range(10), name="test_named_table", partition=2)
+        table_key = get_table_key(named_table)
+        del named_table
+        gc.collect()
+        self.assertTrue(table_exists(table_key))
+        eggroll.cleanup("test_named_table", Standalone.get_instance().job_id, persistent=False)
+
+    def test_release_captured(self):
+        # a table captured by a mapped function is pickled with it, and still destroyed once released
+        weights = self.table.mapValues(lambda v: v + 1)
+        table_key = get_table_key(weights)
+        result = self.table.mapValues(lambda v: weights.get(v) + v)
+        self.assertEqual(dict(result.collect()), {k: 2 * k + 1 for k in range(100)})
+        pickle.dumps(weights)
+
+        del weights
+        gc.collect()
+        self.assertFalse(table_exists(table_key))
+
+    def test_disk_usage(self):
+        usage = Standalone.get_instance().disk_usage()
+        result = self.table.mapValues(lambda v: v + 1)
+        new_usage = Standalone.get_instance().disk_usage()
+        self.assertEqual(new_usage["tables"], usage["tables"] + 1)
+        self.assertEqual(new_usage["owned_tables"], usage["owned_tables"] + 1)
+        self.assertTrue(new_usage["bytes"] > usage["bytes"])
+
+        del result
+        gc.collect()
+        self.assertEqual(Standalone.get_instance().disk_usage()["tables"], usage["tables"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import pickle
+import unittest
+
+import numpy as np
+
+from arch.api.standalone import eggroll as standalone_eggroll
+from arch.api.utils import eggroll_serdes
+from arch.api.utils.eggroll_serdes import BufferSerdes
+from federatedml.feature.instance import Instance
+from federatedml.feature.sparse_vector import SparseVector
+
+
+class TestBufferSerdes(unittest.TestCase):
+    def test_array(self):
+        for arr in [np.random.rand(30), np.arange(12, dtype=np.int32).reshape(3, 4), np.zeros(0),
+                    np.asfortranarray(np.random.rand(3, 5)), np.array(3.0)]:
+            res = BufferSerdes.deserialize(BufferSerdes.serialize(arr))
+            self.assertEqual(res.dtype, arr.dtype)
+            self.assertEqual(res.shape, arr.shape)
+            self.assertTrue((res == arr).all())
+
+    def test_instance(self):
+        inst = Instance(inst_id=3, weight=0.5, features=np.random.rand(20), label=1)
+        res = BufferSerdes.deserialize(BufferSerdes.serialize(inst))
+        self.assertTrue(isinstance(res, Instance))
+        self.assertEqual((res.inst_id, res.weight, res.label), (3, 0.5, 1))
+        self.assertTrue((res.features == inst.features).all())
+
+        inst = Instance(features=SparseVector([1, 5], [2.0, 3.0], shape=10), label=0)
+        res = BufferSerdes.deserialize(BufferSerdes.serialize(inst))
+        self.assertEqual(res.features.sparse_vec, {1: 2.0, 5: 3.0})
+        self.assertEqual(res.features.get_shape(), 10)
+
+    def test_pickle_fallback(self):
+        structured = np.array([(1, 2.0)], dtype=[("id", "i4"), ("value", "f8")])
+        for value in ["id1", 1, (1, 2.0), {"a": [1]}, None, np.array(["a", None], dtype=object), structured,
+                      np.array([0], dtype="M8[25ms]")]:
+            _bytes = BufferSerdes.serialize(value)
+            self.assertEqual(_bytes, pickle.dumps(value))
+            self.assertEqual(pickle.dumps(BufferSerdes.deserialize(_bytes)), _bytes)
+
+    def test_structured_attribute(self):
+        features = np.array([(1, 2.0), (3, 4.0)], dtype=[("id", "i4"), ("value", "f8")])
+        res = BufferSerdes.deserialize(BufferSerdes.serialize(Instance(features=features)))
+        self.assertEqual(res.features.dtype, features.dtype)
+        self.assertEqual(res.features["value"].tolist(), [2.0, 4.0])
+
+    def test_writable(self):
+        inst = BufferSerdes.deserialize(BufferSerdes.serialize(Instance(features=np.ones(5))))
+        inst.features[0] = 2
+        self.assertEqual(inst.features[0], 2)
+
+        buf = bytearray(BufferSerdes.serialize(np.ones(5)))
+        arr = BufferSerdes.deserialize(buf)
+        arr[1] = 3
+        self.assertTrue((BufferSerdes.deserialize(buf) == arr).all())
+
+    def test_default(self):
+        # tables stay pickled, the buffer format is chosen by id
+        self.assertIs(eggroll_serdes.get_serdes(), eggroll_serdes.PickleSerdes)
+        self.assertIs(standalone_eggroll._serdes, eggroll_serdes.PickleSerdes)
+        self.assertIs(eggroll_serdes.get_serdes("arch.api.utils.eggroll_serdes.BufferSerdes"), BufferSerdes)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import concurrent.futures
+import os
+import random
+import threading
+import time
+import unittest
+from unittest import mock
+
+from arch.api import eggroll
+
+eggroll.init("test_federation_get")
+
+from arch.api.standalone import federation
+
+NAME = "RsaIntersectTransferVariable.rsa_pubkey"
+
+
+class TestFederationGet(unittest.TestCase):
+    def setUp(self):
+        # both parties run in this process, host remotes to guest
+        self.job_id = "test_federation_get_{}".format(time.time())
+        role_conf = {"guest": [10000], "host": [9999]}
+        self.host = federation.init(self.job_id, {"local": {"role": "host", "party_id": 9999}, "role": role_conf})
+        self.guest = federation.init(self.job_id, {"local": {"role": "guest", "party_id": 10000}, "role": role_conf})
+
+    def tearDown(self):
+        self.host._notifier.close()
+        self.guest._notifier.close()
+        # status and object tables of the job
+        eggroll.cleanup("*", self.job_id, persistent=True)
+
+    def remote(self, obj, tag):
+        self.host.remote(obj, name=NAME, tag=tag, role="guest", idx=0)
+
+    def assertNoWatch(self):
+        self.assertEqual(self.guest._notifier._events, {})
+
+    def test_notify_before_get(self):
+        self.remote({"e": 1}, "tag")
+        table = eggroll.parallelize(range(10), partition=2)
+        self.remote(table, "table_tag")
+
+        self.assertEqual(self.guest.get(NAME, "tag", idx=0), {"e": 1})
+        future = self.guest.async_get(NAME, "table_tag", idx=0)
+        self.assertTrue(future.done())
+        self.assertEqual(sorted(future.result().collect()), list(enumerate(range(10))))
+        self.assertNoWatch()
+        # a remoted table is pinned, it is left to the receiver to destroy
+        table.destroy()
+
+    def test_get_before_notify(self):
+        future = self.guest.async_get(NAME, "tag", idx=0)
+        results = []
+        thread = threading.Thread(target=lambda: results.append(self.guest.get(NAME, "sync_tag", idx=0)))
+        thread.start()
+        time.sleep(0.2)
+        self.assertFalse(future.done())
+
+        self.remote({"e": 1}, "tag")
+        self.remote({"e": 2}, "sync_tag")
+        self.assertEqual(future.result(timeout=5), {"e": 1})
+        thread.join(5)
+        self.assertEqual(results, [{"e": 2}])
+        self.assertNoWatch()
+
+    def test_timeout(self):
+        future = self.guest.async_get(NAME, "tag", idx=0)
+        with self.assertRaises(concurrent.futures.TimeoutError):
+            future.result(timeout=0.2)
+        done, not_done = concurrent.futures.wait([future], timeout=0.2)
+        self.assertEqual(not_done, {future})
+
+        self.remote({"e": 1}, "tag")
+        self.assertEqual(future.result(timeout=5), {"e": 1})
+
+    def test_lost_notification(self):
+        # the waiting thread finds the status after a timeout when the datagram never arrives
+        future = self.guest.async_get(NAME, "tag", idx=0)
+        with mock.patch.object(self.host._notifier, "notify"):
+            self.remote({"e": 1}, "tag")
+        done, not_done = concurrent.futures.wait([future], timeout=federation.NOTIFY_WAIT_TIMEOUT * 5)
+        self.assertEqual(done, {future})
+        self.assertEqual(future.result(), {"e": 1})
+        self.assertNoWatch()
+
+    def test_concurrent_async_get(self):
+        # objects are read in the thread calling result, not in the pool waiting for them
+        read_threads = set()
+        get = self.guest.get
+
+        def recording_get(*args, **kwargs):
+            read_threads.add(threading.get_ident())
+            return get(*args, **kwargs)
+
+        self.guest.get = recording_get
+        tags = ["tag_{}".format(i) for i in range(50)]
+        futures = dict((tag, self.guest.async_get(NAME, tag, idx=0)) for tag in tags)
+
+        remote_tags = list(tags)
+        random.shuffle(remote_tags)
+        sender = threading.Thread(target=lambda: [self.remote(tag + "_value", tag) for tag in remote_tags])
+        sender.start()
+        done, not_done = concurrent.futures.wait(futures.values(), timeout=10)
+        sender.join()
+        self.assertEqual(len(not_done), 0)
+        for tag, future in futures.items():
+            self.assertEqual(future.result(), tag + "_value")
+        self.assertEqual(read_threads, {threading.get_ident()})
+        self.assertNoWatch()
+
+    def test_same_party_runtimes(self):
+        # a second runtime of guest takes over the notifications, and closing it leaves the first one's socket
+        role_conf = {"guest": [10000], "host": [9999]}
+        other_guest = federation.init(self.job_id, {"local": {"role": "guest", "party_id": 10000}, "role": role_conf})
+        self.assertNotEqual(other_guest._notifier._address, self.guest._notifier._address)
+        future = other_guest.async_get(NAME, "tag", idx=0)
+        self.remote({"e": 1}, "tag")
+        self.assertEqual(future.result(timeout=federation.NOTIFY_WAIT_TIMEOUT / 2), {"e": 1})
+
+        other_guest._notifier.close()
+        self.assertTrue(os.path.exists(self.guest._notifier._address))
+
+    def test_notification_without_get(self):
+        for i in range(20):
+            self.remote(i, "tag_{}".format(i))
+        time.sleep(0.2)
+        self.assertNoWatch()
+
+
+if __name__ == '__main__':
+    unittest.main()
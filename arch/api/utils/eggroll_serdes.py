@@ -19,6 +19,9 @@ from abc import ABCMeta
 from abc import abstractmethod
 from pickle import loads as p_loads
 from pickle import dumps as p_dumps
+import importlib
+import struct
+import numpy as np
 
 
 class ABCSerdes:
@@ -57,6 +60,153 @@ class PickleSerdes(ABCSerdes):
         return p_loads(_bytes)
 
 
+BUFFER_MAGIC = b'\x00'
+_BUFFER_MAGIC_BYTE = BUFFER_MAGIC[0]
+_BUFFER_ARRAY = 0
+_BUFFER_OBJECT = 1
+_BUFFER_ALIGN = 8
+
+_buffer_types = {}
+# ndarray and the registered types, any other value is pickled directly
+_buffer_type_set = {np.ndarray}
+_buffer_type_cache = {}
+_dtype_cache = {}
+_array_structs = {}
+_object_struct = struct.Struct("<BHIB")
+
+
+def register_buffer_type(cls):
+    """
+    Register a class whose ndarray attributes are written as raw buffers by BufferSerdes,
+    its other attributes are pickled. Can be used as a class decorator.
+    """
+    path = ".".join([cls.__module__, cls.__qualname__]).encode("utf-8")
+    _buffer_types[cls] = path
+    _buffer_type_set.add(cls)
+    _buffer_type_cache[path] = cls
+    return cls
+
+
+def _load_buffer_type(path):
+    try:
+        return _buffer_type_cache[path]
+    except KeyError:
+        module_name, _, qualname = path.decode("utf-8").rpartition(".")
+        cls = getattr(importlib.import_module(module_name), qualname)
+        _buffer_type_cache[path] = cls
+        return cls
+
+
+def _is_buffer_array(value):
+    """
+    arrays of a simple dtype, whose dtype string fits the header, structured and object arrays are pickled
+    """
+    if type(value) is not np.ndarray:
+        return False
+    dtype = value.dtype
+    return not dtype.hasobject and dtype.fields is None and len(dtype.str) <= 8
+
+
+def _array_struct(ndim):
+    """
+    header of an array: ndim, dtype string padded to 8 bytes, shape
+    """
+    try:
+        return _array_structs[ndim]
+    except KeyError:
+        _array_structs[ndim] = struct.Struct("<B8s%dq" % ndim)
+        return _array_structs[ndim]
+
+
+def _write_array(chunks, offset, arr):
+    header = _array_struct(arr.ndim).pack(arr.ndim, arr.dtype.str.encode("ascii"), *arr.shape)
+    offset += len(header)
+    padding = -offset % _BUFFER_ALIGN
+    chunks.append(header + b'\x00' * padding)
+    data = np.ascontiguousarray(arr).data
+    chunks.append(data)
+    return offset + padding + data.nbytes
+
+
+def _read_array(buf, offset):
+    header = _array_struct(buf[offset])
+    _, dtype_str, *shape = header.unpack_from(buf, offset)
+    offset += header.size
+    offset += -offset % _BUFFER_ALIGN
+
+    try:
+        dtype = _dtype_cache[dtype_str]
+    except KeyError:
+        dtype = _dtype_cache[dtype_str] = np.dtype(dtype_str.rstrip(b'\x00').decode("ascii"))
+    arr = np.ndarray(shape, dtype, buf, offset)
+    return arr, offset + arr.nbytes
+
+
+class BufferSerdes(ABCSerdes):
+    """
+    Writes ndarray values, and objects of types registered by register_buffer_type, as a header plus
+    the raw array buffers, any other value is pickled.
+    Arrays are deserialized as views over the input if it is a bytearray, otherwise over one copy of it,
+    since values read from lmdb are read-only but may be modified in place by algorithms.
+    """
+
+    @staticmethod
+    def serialize(_obj):
+        # most table values are small python objects, they are pickled before any other check
+        _type = type(_obj)
+        if _type not in _buffer_type_set:
+            return p_dumps(_obj)
+
+        if _is_buffer_array(_obj):
+            chunks = [BUFFER_MAGIC + bytes([_BUFFER_ARRAY])]
+            _write_array(chunks, 2, _obj)
+        elif _type in _buffer_types:
+            path = _buffer_types[_type]
+            arrays = []
+            attrs = {}
+            for name, value in _obj.__dict__.items():
+                if _is_buffer_array(value):
+                    arrays.append((name.encode("utf-8"), value))
+                else:
+                    attrs[name] = value
+            pickled_attrs = p_dumps(attrs)
+            header = BUFFER_MAGIC + _object_struct.pack(_BUFFER_OBJECT, len(path), len(pickled_attrs), len(arrays)) \
+                     + path + pickled_attrs
+            chunks = [header]
+            offset = len(header)
+            for name, value in arrays:
+                chunks.append(bytes([len(name)]) + name)
+                offset = _write_array(chunks, offset + 1 + len(name), value)
+        else:
+            return p_dumps(_obj)
+
+        return b''.join(chunks)
+
+    @staticmethod
+    def deserialize(_bytes):
+        if _bytes[0] != _BUFFER_MAGIC_BYTE:
+            return p_loads(_bytes)
+
+        buf = _bytes if isinstance(_bytes, bytearray) else bytearray(_bytes)
+        if buf[1] == _BUFFER_ARRAY:
+            return _read_array(buf, 2)[0]
+
+        _, path_len, attrs_len, array_num = _object_struct.unpack_from(buf, 1)
+        offset = 1 + _object_struct.size
+        cls = _load_buffer_type(bytes(buf[offset: offset + path_len]))
+        offset += path_len
+        attrs = p_loads(buf[offset: offset + attrs_len])
+        offset += attrs_len
+        for _ in range(array_num):
+            name_len = buf[offset]
+            name = buf[offset + 1: offset + 1 + name_len].decode("utf-8")
+            attrs[name], offset = _read_array(buf, offset + 1 + name_len)
+
+        obj = cls.__new__(cls)
+        obj.__dict__.update(attrs)
+        return obj
+
+
 serdes_cache = {}
 for cls in ABCSerdes.__subclasses__():
     cls_name = ".".join([cls.__module__, cls.__qualname__])
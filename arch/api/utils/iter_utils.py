@@ -15,6 +15,9 @@
 from typing import Iterable, Sequence
 from itertools import islice, chain
 
+# partitions are merge joined unless one has this many times the entries of the other
+MERGE_JOIN_MAX_RATIO = 8
+
 
 def split_every(original: Iterable, chunk_size):
     if not chunk_size:
@@ -31,3 +34,48 @@ def split_every(original: Iterable, chunk_size):
                 yield chain([peek], slice_iter)
         except StopIteration as e:
             return
+
+
+def merge_join(left: Iterable, right: Iterable):
+    """
+    Yield (k, left_v, right_v) of the keys in both left and right, which are iterables of (k, v) sorted by k,
+    e.g. lmdb cursors, by walking them in lockstep instead of looking up every key
+    """
+    left_iter = iter(left)
+    right_iter = iter(right)
+    try:
+        left_k, left_v = next(left_iter)
+        right_k, right_v = next(right_iter)
+        while True:
+            if left_k == right_k:
+                yield left_k, left_v, right_v
+                left_k, left_v = next(left_iter)
+                right_k, right_v = next(right_iter)
+            elif left_k < right_k:
+                left_k, left_v = next(left_iter)
+            else:
+                right_k, right_v = next(right_iter)
+    except StopIteration as e:
+        return
+
+
+def join_txns(left_txn, right_txn):
+    """
+    Yield (k_bytes, left_v_bytes, right_v_bytes) of the keys in both partitions, in key order, read by lmdb
+    transactions. Partitions of similar sizes are merge joined, otherwise the smaller one is iterated and its keys
+    are looked up in the other.
+    """
+    left_entries = left_txn.stat()['entries']
+    right_entries = right_txn.stat()['entries']
+    if left_entries > right_entries * MERGE_JOIN_MAX_RATIO:
+        for k_bytes, right_v_bytes in right_txn.cursor():
+            left_v_bytes = left_txn.get(k_bytes)
+            if left_v_bytes is not None:
+                yield k_bytes, left_v_bytes, right_v_bytes
+    elif right_entries > left_entries * MERGE_JOIN_MAX_RATIO:
+        for k_bytes, left_v_bytes in left_txn.cursor():
+            right_v_bytes = right_txn.get(k_bytes)
+            if right_v_bytes is not None:
+                yield k_bytes, left_v_bytes, right_v_bytes
+    else:
+        yield from merge_join(left_txn.cursor(), right_txn.cursor())
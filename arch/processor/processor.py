@@ -24,6 +24,7 @@ import lmdb
 from cachetools import cached
 from grpc._cython import cygrpc
 from arch.api.utils import eggroll_serdes
+from arch.api.utils.iter_utils import join_txns
 from cachetools import LRUCache
 from arch.api.proto import kv_pb2, processor_pb2, processor_pb2_grpc, storage_basic_pb2
 import os
@@ -147,6 +148,15 @@ class Processor(processor_pb2_grpc.ProcessServiceServicer):
         with MDBEnv(Processor.get_path(left_op), create_if_missing=True) as left_env, \
                 MDBEnv(Processor.get_path(right_op), create_if_missing=True) as right_env, \
                 MDBEnv(Processor.get_path(rtn), create_if_missing=True) as dst_env:
+            if not is_in_place_computing:
+                with left_env.begin(db=Processor.get_default_db(left_env)) as left_txn, \
+                        right_env.begin(db=Processor.get_default_db(right_env)) as right_txn, \
+                        dst_env.begin(db=Processor.get_default_db(dst_env), write=True) as dst_txn:
+                    for k_bytes, v1_bytes, v2_bytes in join_txns(left_txn, right_txn):
+                        v3 = _joiner(_serdes.deserialize(v1_bytes), _serdes.deserialize(v2_bytes))
+                        dst_txn.put(k_bytes, _serdes.serialize(v3))
+                LOGGER.debug(PROCESS_DONE_FORMAT.format('join', rtn))
+                return rtn
             small_env, big_env, is_swapped = self._rearrage_binary_envs(left_env, right_env)
             with small_env.begin(db=Processor.get_default_db(small_env)) as left_txn, \
                     big_env.begin(db=Processor.get_default_db(big_env)) as right_txn, \
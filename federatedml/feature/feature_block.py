@@ -0,0 +1,125 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import functools
+
+import numpy as np
+from scipy import sparse
+
+from arch.api.utils.eggroll_serdes import register_buffer_type
+from federatedml.feature.instance import Instance
+from federatedml.feature.sparse_vector import SparseVector
+
+
+@register_buffer_type
+class FeatureBlock(object):
+    """
+    Columnar block of instances, stored as contiguous arrays so that a whole block can be computed at once
+
+    Parameters
+    ----------
+    keys : list, ids of the instances
+
+    labels : ndarray, labels of the instances
+
+    weights : ndarray, weights of the instances
+
+    dense : ndarray of shape (n, feature_num), features if they are ndarray, otherwise None
+
+    indptr, indices, data : ndarray, csr arrays of the features if they are SparseVector, otherwise None
+
+    feature_num : int, number of features
+    """
+
+    def __init__(self, keys, labels, weights, feature_num, dense=None, indptr=None, indices=None, data=None):
+        self.keys = keys
+        self.labels = labels
+        self.weights = weights
+        self.feature_num = feature_num
+        self.dense = dense
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+
+    @staticmethod
+    def from_instances(kv_list, dtype=np.float64):
+        """
+        Build a block from a list of (key, Instance), features are all ndarray or all SparseVector
+        """
+        keys = [k for k, _ in kv_list]
+        instances = [inst for _, inst in kv_list]
+        labels = np.array([inst.label for inst in instances])
+        weights = np.array([inst.weight for inst in instances], dtype=np.float64)
+
+        if not instances or not isinstance(instances[0].features, SparseVector):
+            dense = np.array([inst.features for inst in instances], dtype=dtype).reshape(len(instances), -1)
+            return FeatureBlock(keys, labels, weights, dense.shape[1], dense=dense)
+
+        indptr = np.zeros(len(instances) + 1, dtype=np.int64)
+        indices = []
+        data = []
+        for i, inst in enumerate(instances):
+            for idx, value in sorted(inst.features.get_all_data()):
+                indices.append(idx)
+                data.append(value)
+            indptr[i + 1] = len(indices)
+
+        return FeatureBlock(keys, labels, weights, instances[0].features.get_shape(),
+                            indptr=indptr, indices=np.array(indices, dtype=np.int64), data=np.array(data, dtype=dtype))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def is_sparse(self):
+        return self.dense is None
+
+    @property
+    def features(self):
+        """
+        return ndarray or scipy.sparse.csr_matrix, features of the block, sharing memory with the block
+        """
+        if self.is_sparse():
+            return sparse.csr_matrix((self.data, self.indices, self.indptr), shape=(len(self), self.feature_num))
+        return self.dense
+
+    def weighted_features(self):
+        """
+        return features scaled by weights of the instances, which are the features themselves if all weights are 1
+        """
+        if (self.weights == 1).all():
+            return self.features
+        if self.is_sparse():
+            return sparse.diags(self.weights).dot(self.features).tocsr()
+        return self.dense * self.weights[:, np.newaxis]
+
+    def to_instances(self):
+        """
+        return generator of (key, Instance), to compute a block by the row-wise functions
+        """
+        for i, key in enumerate(self.keys):
+            if self.is_sparse():
+                start, end = self.indptr[i], self.indptr[i + 1]
+                features = SparseVector(self.indices[start: end], self.data[start: end], self.feature_num)
+            else:
+                features = self.dense[i]
+            yield key, Instance(weight=self.weights[i], features=features, label=self.labels[i])
+
+
+def to_feature_blocks(data_instances, dtype=np.float64):
+    """
+    Convert a table of Instance to a table of FeatureBlock, which is computed block by block by mapBlocks
+    """
+    return data_instances.toBlocks(functools.partial(FeatureBlock.from_instances, dtype=dtype))
@@ -21,7 +21,10 @@
 #
 ################################################################################
 
+from arch.api.utils.eggroll_serdes import register_buffer_type
 
+
+@register_buffer_type
 class Instance(object):
     """
     Instance object use in all algorithm module
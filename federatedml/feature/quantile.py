@@ -450,7 +450,7 @@ class Quantile(object):
             data_keys = [data_key_none_value_tuple[idx] for idx in sample_idxs]
 
         data_key_table = eggroll.parallelize(data_keys, include_key=True)
-        sample_data = list(data_key_table.join(data_instance, lambda x, y: y).collect())
+        sample_data = list(data_instance.filterByKeys(data_key_table).collect())
         return sample_data
 
     @staticmethod
@@ -114,7 +114,7 @@ class RandomSampler(object):
             sample_dtable = eggroll.parallelize(zip(sample_ids, range(len(sample_ids))),
                                                 include_key=True,
                                                 partition=data_inst._partitions)
-            new_data_inst = data_inst.join(sample_dtable, lambda v1, v2: v1)
+            new_data_inst = data_inst.filterByKeys(sample_dtable)
 
             if return_sample_ids:
                 return new_data_inst, sample_ids
@@ -267,7 +267,7 @@ class StratifiedSampler(object):
             sample_dtable = eggroll.parallelize(zip(sample_ids, range(len(sample_ids))),
                                                 include_key=True,
                                                 partition=data_inst._partitions)
-            new_data_inst = data_inst.join(sample_dtable, lambda v1, v2: v1)
+            new_data_inst = data_inst.filterByKeys(sample_dtable)
 
             if return_sample_ids:
                 return new_data_inst, sample_ids
@@ -0,0 +1,72 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import unittest
+
+import numpy as np
+
+from arch.api import eggroll
+
+eggroll.init("test_feature_block")
+
+from federatedml.feature.feature_block import FeatureBlock, to_feature_blocks
+from federatedml.feature.instance import Instance
+from federatedml.feature.sparse_vector import SparseVector
+
+
+class TestFeatureBlock(unittest.TestCase):
+    def setUp(self):
+        self.features = np.random.rand(100, 5)
+        self.data = [("id" + str(i), Instance(weight=1 + i % 2, features=self.features[i], label=i % 2))
+                     for i in range(100)]
+        self.table = eggroll.parallelize(self.data, include_key=True, partition=3)
+
+    def test_dense_block(self):
+        block = FeatureBlock.from_instances(self.data)
+        self.assertFalse(block.is_sparse())
+        self.assertTrue((block.features == self.features).all())
+        self.assertTrue((block.weighted_features() == self.features * block.weights[:, np.newaxis]).all())
+        for (key, inst), (block_key, block_inst) in zip(self.data, block.to_instances()):
+            self.assertEqual(key, block_key)
+            self.assertTrue((inst.features == block_inst.features).all())
+            self.assertEqual((inst.label, inst.weight), (block_inst.label, block_inst.weight))
+
+    def test_sparse_block(self):
+        data = [(i, Instance(features=SparseVector([i % 4, 4], [1.0, 2.0], shape=6), label=1)) for i in range(10)]
+        block = FeatureBlock.from_instances(data)
+        self.assertTrue(block.is_sparse())
+        dense = block.features.toarray()
+        for i, (_, inst) in enumerate(data):
+            self.assertEqual(dense[i][i % 4], 1.0)
+            self.assertEqual(dense[i][4], 2.0)
+            self.assertEqual(dense[i].sum(), 3.0)
+
+        for (_, inst), (_, block_inst) in zip(data, block.to_instances()):
+            self.assertEqual(dict(block_inst.features.get_all_data()), inst.features.sparse_vec)
+
+    def test_block_table(self):
+        blocks = self.table.toBlocks(FeatureBlock.from_instances, block_size=16)
+        block_list = [block for _, block in blocks.collect()]
+        self.assertTrue(all(len(block) <= 16 for block in block_list))
+        self.assertEqual(sum(len(block) for block in block_list), 100)
+
+        feature_sum = to_feature_blocks(self.table).mapBlocks(lambda block: block.features.sum(axis=0)).reduce(
+            lambda a, b: a + b)
+        self.assertTrue(np.allclose(feature_sum, self.features.sum(axis=0)))
+
+
+if __name__ == '__main__':
+    unittest.main()
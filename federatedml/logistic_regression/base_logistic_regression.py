@@ -97,6 +97,14 @@ class BaseLogisticRegression(object):
     def compute_wx(self, data_instances, coef_, intercept_=0):
         return data_instances.mapValues(lambda v: fate_operator.dot(v.features, coef_) + intercept_)
 
+    @staticmethod
+    def compute_wx_and_square(instance, coef_, intercept_=0):
+        """
+        return ndarray: [W * X + b, (W * X + b)^2] of an instance, the row encrypted by forward computation
+        """
+        wx = fate_operator.dot(instance.features, coef_) + intercept_
+        return np.array([wx, np.square(wx)])
+
     def set_flowid(self, flowid=0):
         if self.transfer_variable is not None:
             self.transfer_variable.set_flowid(flowid)
@@ -124,8 +124,7 @@ class HeteroLRArbiter(BaseLogisticRegression):
                 host_gradient, guest_gradient = np.array(host_gradient), np.array(guest_gradient)
                 gradient = np.hstack((host_gradient, guest_gradient))
                 # decrypt gradient
-                for i in range(gradient.shape[0]):
-                    gradient[i] = self.encrypt_operator.decrypt(gradient[i])
+                gradient = self.encrypt_operator.decrypt_batch(gradient)
 
                 # optimization
                 optim_gradient = self.optimizer.apply_gradients(gradient)
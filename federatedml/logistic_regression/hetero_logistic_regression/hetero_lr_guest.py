@@ -14,7 +14,7 @@
 #  limitations under the License.
 #
 
-import numpy as np
+import functools
 
 from arch.api import federation
 from arch.api.utils import log_utils
@@ -50,18 +50,10 @@ class HeteroLRGuest(BaseLogisticRegression):
         coef_: list, coefficient of lr
         intercept_: float, the interception of lr
         """
-        wx = self.compute_wx(data_instances, coef_, intercept_)
-
-        en_wx = self.encrypted_calculator[batch_index].encrypt(wx)
-        wx_square = wx.mapValues(lambda v: np.square(v))
-        en_wx_square = self.encrypted_calculator[batch_index].encrypt(wx_square)
-
-        en_wx_join_en_wx_square = en_wx.join(en_wx_square, lambda wx, wx_square: (wx, wx_square))
-        self.guest_forward = en_wx_join_en_wx_square.join(wx, lambda e, wx: (e[0], e[1], wx))
-
-        # temporary resource recovery and will be removed in the future
-        rubbish_list = [wx, en_wx, wx_square, en_wx_square, en_wx_join_en_wx_square]
-        rubbish_clear(rubbish_list)
+        self.guest_forward = self.encrypted_calculator[batch_index].map_encrypt(
+            data_instances,
+            functools.partial(self.compute_wx_and_square, coef_=coef_, intercept_=intercept_),
+            lambda wx_row, en_wx_row: (en_wx_row[0], en_wx_row[1], wx_row[0]))
 
     def aggregate_forward(self, host_forward):
         """
@@ -178,7 +170,7 @@ class HeteroLRGuest(BaseLogisticRegression):
 
                 # Get mini-batch train data
                 if len(index_data_inst_map) < batch_num:
-                    batch_data_inst = data_instances.join(batch_data_index, lambda data_inst, index: data_inst)
+                    batch_data_inst = data_instances.filterByKeys(batch_data_index)
                     index_data_inst_map[batch_index] = batch_data_inst
                 else:
                     batch_data_inst = index_data_inst_map[batch_index]
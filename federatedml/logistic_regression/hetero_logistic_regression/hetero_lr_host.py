@@ -14,7 +14,7 @@
 #  limitations under the License.
 #
 
-import numpy as np
+import functools
 
 from arch.api import federation
 from arch.api.utils import log_utils
@@ -46,20 +46,10 @@ class HeteroLRHost(BaseLogisticRegression):
         coef_: list, coefficient of lr
         intercept_: float, the interception of lr
         """
-        wx = self.compute_wx(data_instances, coef_, intercept_)
-        en_wx = self.encrypted_calculator[batch_index].encrypt(wx)
-        wx_square = wx.mapValues(lambda v: np.square(v))
-        en_wx_square = self.encrypted_calculator[batch_index].encrypt(wx_square)
-
-        host_forward = en_wx.join(en_wx_square, lambda wx, wx_square: (wx, wx_square))
-
-        # temporary resource recovery and will be removed in the future
-        rubbish_list = [wx,
-                        en_wx,
-                        wx_square,
-                        en_wx_square
-                        ]
-        rubbish_clear(rubbish_list)
+        host_forward = self.encrypted_calculator[batch_index].map_encrypt(
+            data_instances,
+            functools.partial(self.compute_wx_and_square, coef_=coef_, intercept_=intercept_),
+            lambda wx_row, en_wx_row: (en_wx_row[0], en_wx_row[1]))
 
         return host_forward
 
@@ -132,7 +122,7 @@ class HeteroLRHost(BaseLogisticRegression):
 
                 # Get mini-batch train data
                 if len(index_data_inst_map) < self.batch_num:
-                    batch_data_inst = batch_data_index.join(data_instances, lambda g, d: d)
+                    batch_data_inst = data_instances.filterByKeys(batch_data_index)
                     index_data_inst_map[batch_index] = batch_data_inst
                 else:
                     batch_data_inst = index_data_inst_map[batch_index]
@@ -254,7 +254,7 @@ class HomoLRArbiter(BaseLogisticRegression):
                     idx=idx
                 )
                 encrypter = self.host_encrypter[idx]
-                decrypt_model = encrypter.decrypt_list(re_encrypt_model)
+                decrypt_model = encrypter.decrypt_batch(re_encrypt_model)
                 re_encrypt_model = encrypter.encrypt_list(decrypt_model)
                 federation.remote(re_encrypt_model, name=self.transfer_variable.re_encrypted_model.name,
                                   tag=re_encrypted_model_id, role=consts.HOST, idx=idx)
@@ -21,6 +21,7 @@ import numpy as np
 from arch.api import federation
 from arch.api.utils import log_utils
 from federatedml.evaluation import Evaluation
+from federatedml.feature.feature_block import to_feature_blocks
 from federatedml.logistic_regression.base_logistic_regression import BaseLogisticRegression
 from federatedml.model_selection import MiniBatch
 from federatedml.optim import Initializer
@@ -65,21 +66,21 @@ class HomoLRGuest(BaseLogisticRegression):
         self.__init_model(data_instances)
 
         mini_batch_obj = MiniBatch(data_inst=data_instances, batch_size=self.batch_size)
+        # batches are fixed over iterations, convert them to feature blocks once
+        batch_blocks = [(to_feature_blocks(batch_data), batch_data.count())
+                        for batch_data in mini_batch_obj.mini_batch_data_generator()]
 
         for iter_num in range(self.max_iter):
             # mini-batch
-            batch_data_generator = mini_batch_obj.mini_batch_data_generator()
             total_loss = 0
             batch_num = 0
 
-            for batch_data in batch_data_generator:
-                n = batch_data.count()
-
-                f = functools.partial(self.gradient_operator.compute,
+            for batch_block, n in batch_blocks:
+                f = functools.partial(self.gradient_operator.compute_block,
                                       coef=self.coef_,
                                       intercept=self.intercept_,
                                       fit_intercept=self.fit_intercept)
-                grad_loss = batch_data.mapPartitions(f)
+                grad_loss = batch_block.mapBlocks(f)
 
                 grad, loss = grad_loss.reduce(self.aggregator.aggregate_grad_loss)
 
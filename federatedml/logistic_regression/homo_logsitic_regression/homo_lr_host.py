@@ -20,6 +20,7 @@ import numpy as np
 
 from arch.api import federation
 from arch.api.utils import log_utils
+from federatedml.feature.feature_block import to_feature_blocks
 from federatedml.logistic_regression.base_logistic_regression import BaseLogisticRegression
 from federatedml.model_selection import MiniBatch
 from federatedml.optim import Initializer
@@ -74,22 +75,24 @@ class HomoLRHost(BaseLogisticRegression):
 
         w = self.__init_model(data_instances)
 
+        # batches are fixed over iterations, convert them to feature blocks once
+        batch_blocks = [(to_feature_blocks(batch_data), batch_data.count())
+                        for batch_data in self.mini_batch_obj.mini_batch_data_generator()]
+
         for iter_num in range(self.max_iter):
             # mini-batch
             LOGGER.debug("In iter: {}".format(iter_num))
-            batch_data_generator = self.mini_batch_obj.mini_batch_data_generator()
             batch_num = 0
             total_loss = 0
 
-            for batch_data in batch_data_generator:
-                f = functools.partial(self.gradient_operator.compute,
+            for batch_block, n in batch_blocks:
+                f = functools.partial(self.gradient_operator.compute_block,
                                       coef=self.coef_,
                                       intercept=self.intercept_,
                                       fit_intercept=self.fit_intercept)
 
-                grad_loss = batch_data.mapPartitions(f)
+                grad_loss = batch_block.mapBlocks(f)
 
-                n = batch_data.count()
                 if not self.use_encrypt:
                     grad, loss = grad_loss.reduce(self.aggregator.aggregate_grad_loss)
                     grad = np.array(grad)
@@ -54,11 +54,11 @@ class KFold(BaseCrossValidator):
             train_table = eggroll.parallelize(train_sids_table,
                                               include_key=True,
                                               partition=data_inst._partitions)
-            train_data = data_inst.join(train_table, lambda x, y: x)
+            train_data = data_inst.filterByKeys(train_table)
             test_table = eggroll.parallelize(test_sids_table,
                                              include_key=True,
                                              partition=data_inst._partitions)
-            test_data = data_inst.join(test_table, lambda x, y: x)
+            test_data = data_inst.filterByKeys(test_table)
             train_data.schema['header'] = header
             test_data.schema['header'] = header
             yield train_data, test_data
@@ -89,7 +89,7 @@ class MiniBatch:
         for index_data in batch_data_sids:
             # LOGGER.debug('in generator, index_data is {}'.format(index_data))
             index_table = eggroll.parallelize(index_data, include_key=True, partition=data_insts._partitions)
-            batch_data = index_table.join(data_insts, lambda x, y: y)
+            batch_data = data_insts.filterByKeys(index_table)
 
             # yield batch_data
             all_batch_data.append(batch_data)
@@ -45,8 +45,7 @@ class HomoFederatedAggregator:
 
         for idx, host_model in enumerate(host_models):
             encrypter = host_encrypter[idx]
-            host_model = encrypter.decrypt_list(host_model)
-            host_model = np.array(host_model)
+            host_model = encrypter.decrypt_batch(host_model)
             final_model = final_model + party_weights[idx + 1] * host_model
         # LOGGER.debug("Finish aggregate model, final model shape: {}".format(
         #     np.shape(final_model)))
@@ -26,6 +26,12 @@ class Gradient:
     def compute(self, values, coef, intercept, fit_intercept):
         raise NotImplementedError("Method not implemented")
 
+    def compute_block(self, block, coef, intercept, fit_intercept):
+        """
+        Compute gradient and loss of a FeatureBlock, row by row by compute unless a vectorized version is given
+        """
+        return self.compute(block.to_instances(), coef, intercept, fit_intercept)
+
     def compute_loss(self, X, Y, coef, intercept):
         raise NotImplementedError("Method not implemented")
 
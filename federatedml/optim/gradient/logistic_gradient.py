@@ -20,6 +20,7 @@ import numpy as np
 
 from arch.api.utils import log_utils
 from federatedml.optim.gradient.base_gradient import Gradient
+from federatedml.secureprotol.encrypted_vector import EncryptedVector
 from federatedml.secureprotol.fate_paillier import PaillierEncryptedNumber
 from federatedml.statistic.data_overview import rubbish_clear
 from federatedml.util import fate_operator
@@ -57,6 +58,18 @@ class LogisticGradient(Gradient):
         loss = self.compute_loss(X, Y, coef, intercept)
         return grad, loss
 
+    def compute_block(self, block, coef, intercept, fit_intercept):
+        X = block.weighted_features()
+        Y = np.where(block.labels == 1, 1, -1).reshape(-1)
+
+        ywx = Y * (X.dot(coef) + intercept)
+        d = (1.0 / (1 + np.exp(-ywx)) - 1) * Y
+        grad = X.T.dot(d)
+        if fit_intercept:
+            grad = np.append(grad, np.sum(d))
+        loss = np.log(1 + np.exp(-ywx)).sum()
+        return grad, loss
+
 
 class TaylorLogisticGradient(Gradient):
     def compute_loss(self, X, Y, w, intercept):
@@ -121,14 +134,21 @@ class HeteroLogisticGradient(object):
         gradient = []
         if feature.shape[0] <= 0:
             return 0
-        for j in range(feature.shape[1]):
-            feature_col = feature[:, j]
-            gradient_j = fate_operator.dot(feature_col, fore_gradient)
-            gradient.append(gradient_j)
 
-        if fit_intercept:
-            bias_grad = np.sum(fore_gradient)
-            gradient.append(bias_grad)
+        if EncryptedVector.can_hold(fore_gradient) and feature.ndim == 2:
+            encrypted_fore_gradient = EncryptedVector.from_encrypted_numbers(fore_gradient)
+            gradient.extend(encrypted_fore_gradient.transposed_dot(feature))
+            if fit_intercept:
+                gradient.append(encrypted_fore_gradient.sum())
+        else:
+            for j in range(feature.shape[1]):
+                feature_col = feature[:, j]
+                gradient_j = fate_operator.dot(feature_col, fore_gradient)
+                gradient.append(gradient_j)
+
+            if fit_intercept:
+                bias_grad = np.sum(fore_gradient)
+                gradient.append(bias_grad)
         gradient.append(feature.shape[0])
         return np.array(gradient)
 
@@ -18,6 +18,7 @@ import unittest
 
 import numpy as np
 
+from federatedml.feature.feature_block import FeatureBlock
 from federatedml.feature.instance import Instance
 from federatedml.optim.gradient import LogisticGradient, TaylorLogisticGradient
 from federatedml.secureprotol import PaillierEncrypt
@@ -66,6 +67,18 @@ class TestHomoLRGradient(unittest.TestCase):
 
         self.assertTrue(np.sum(grad - taylor_grad) < 0.0001)
 
+    def test_compute_block(self):
+        block = FeatureBlock.from_instances(self.values)
+        for fit_intercept in [False, True]:
+            grad, loss = self.gradient_operator.compute(self.values, self.coef, 0.1, fit_intercept)
+            block_grad, block_loss = self.gradient_operator.compute_block(block, self.coef, 0.1, fit_intercept)
+            self.assertTrue(np.allclose(grad, block_grad))
+            self.assertAlmostEqual(loss, block_loss)
+
+            taylor_grad, _ = self.taylor_operator.compute(self.values, self.coef, 0.1, fit_intercept)
+            block_taylor_grad, _ = self.taylor_operator.compute_block(block, self.coef, 0.1, fit_intercept)
+            self.assertTrue(np.allclose(taylor_grad, block_taylor_grad))
+
 
 if __name__ == '__main__':
     unittest.main()
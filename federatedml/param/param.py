@@ -420,11 +420,24 @@ class IntersectParam(object):
     
     only_output_key: bool, if true, the results of intersection will include key and value which from input data; if false, it will just include key from input
                     data and the value will be empty or some useless character like "intersect_id"
+
+    sign_cache_name: str or None, effective only for rsa and host. If set, host keeps its signed ids in a persistent cache of this name and its rsa key
+                    in the model table of WorkFlowParam, later intersections with the same name and model table reuse them and only sign the ids
+                    added since. The cache keeps no private key. Default by None, means no cache
+
+    transfer_mode: str, it supports "table" and "bloom_filter" and effective only for raw. If it is "table", the role sending ids sends all of its ids;
+                if it is "bloom_filter", it sends a bloom filter of its ids, the role of "join_role" sends back the ids passing the filter, and the
+                sending role returns the exact intersection. The sending role knows the intersection, so "bloom_filter" is only used if
+                is_send_intersect_ids is True, otherwise "table" is used. Ids are encoded, by sha256 if with_encode is False, but the ids
+                of "join_role" passing the filter by false positive still reach the sending role in encoded form, about bloom_filter_fpr of
+                the ids not in the intersection, and low entropy ids may be recovered from their encodings. Default by "table"
+
+    bloom_filter_fpr: float, false positive rate of the bloom filter, between 0 and 1, effective only for transfer_mode is "bloom_filter". Default by 0.01
     """
 
     def __init__(self, intersect_method=consts.RAW, random_bit=128, is_send_intersect_ids=True,
                  is_get_intersect_ids=True, join_role="guest", with_encode=False, encode_params=EncodeParam(),
-                 only_output_key=False):
+                 only_output_key=False, sign_cache_name=None, transfer_mode=consts.TABLE, bloom_filter_fpr=0.01):
         self.intersect_method = intersect_method
         self.random_bit = random_bit
         self.is_send_intersect_ids = is_send_intersect_ids
@@ -433,6 +446,9 @@ class IntersectParam(object):
         self.with_encode = with_encode
         self.encode_params = copy.deepcopy(encode_params)
         self.only_output_key = only_output_key
+        self.sign_cache_name = sign_cache_name
+        self.transfer_mode = transfer_mode
+        self.bloom_filter_fpr = bloom_filter_fpr
 
 
 class LogisticParam(object):
@@ -590,6 +606,32 @@ class BoostingTreeParam(object):
     
     encrypted_mode_calculator_param: EncryptedModeCalculatorParam object, the calculation mode use in secureboost,
                                      default: EncryptedModeCalculatorParam()
+
+    pack_grad_and_hess: bool, if True, guest packs gradient and hessian of each instance into one ciphertext,
+                        which halves encryptions, host additions and decryptions. default: False
+
+    use_goss: bool, if True, each tree is built on a gradient-based one-side sample of instances,
+              only the sampled instances are encrypted, sent to host and added into histograms.
+              Host learns which instances are sampled in each tree, and the top_rate of them with the largest
+              gradients are always sampled, which tells host the instances the model fits worst, a signal on
+              labels and residuals that plain secureboost does not leak. Only use it if that is acceptable.
+              default: False
+
+    top_rate: float, a float-number in (0, 1], rate of instances with the largest absolute gradients kept by goss.
+              default: 0.2
+
+    other_rate: float, a float-number in [0, 1 - top_rate], rate of instances randomly kept by goss from the rest,
+                whose gradients and hessians are amplified by (1 - top_rate) / other_rate. default: 0.1
+
+    lockstep_multi_class: bool, if True, the trees of all classes in a round of a multi-class task grow in lockstep,
+                          sharing one encryption pass, one host histogram pass per depth and the split info exchange,
+                          should be the same on guest and host. default: False
+
+    use_bitmap_predict: bool, if True, each host sends the decisions of all of its split nodes of all trees for each
+                        instance to guest at once as a bitmap, and guest traverses the trees locally, instead of one
+                        exchange per tree and depth. Guest then learns the decisions of host split nodes that are not
+                        on the path of an instance, which narrows down its host feature values more than the per-tree
+                        protocol does. Should be the same on guest and host. default: False
     """
 
     def __init__(self, tree_param=DecisionTreeParam(), task_type=consts.CLASSIFICATION,
@@ -597,7 +639,8 @@ class BoostingTreeParam(object):
                  learning_rate=0.3, num_trees=5, subsample_feature_rate=0.8, n_iter_no_change=True,
                  tol=0.0001, encrypt_param=EncryptParam(), quantile_method="bin_by_sample_data",
                  bin_num=32, bin_gap=1e-3, bin_sample_num=10000,
-                 encrypted_mode_calculator_param=EncryptedModeCalculatorParam()):
+                 encrypted_mode_calculator_param=EncryptedModeCalculatorParam(), pack_grad_and_hess=False,
+                 use_goss=False, top_rate=0.2, other_rate=0.1, lockstep_multi_class=False, use_bitmap_predict=False):
         self.tree_param = copy.deepcopy(tree_param)
         self.task_type = task_type
         self.objective_param = copy.deepcopy(objective_param)
@@ -612,6 +655,12 @@ class BoostingTreeParam(object):
         self.bin_gap = bin_gap
         self.bin_sample_num = bin_sample_num
         self.encrypted_mode_calculator_param = copy.deepcopy(EncryptedModeCalculatorParam())
+        self.pack_grad_and_hess = pack_grad_and_hess
+        self.use_goss = use_goss
+        self.top_rate = top_rate
+        self.other_rate = other_rate
+        self.lockstep_multi_class = lockstep_multi_class
+        self.use_bitmap_predict = use_bitmap_predict
 
 
 class FTLModelParam(object):
@@ -60,12 +60,56 @@ class Encrypt(object):
         result = [self.decrypt(msg) for msg in values]
         return result
 
+    def encrypt_batch(self, values, partitions=1):
+        """
+        Encrypt a batch of values
+
+        Parameters
+        ----------
+        values: ndarray of any shape, or a flat iterable of numbers
+
+        partitions: int, number of tasks encrypting batches at the same time, such as the partitions of a mapValues
+
+        Returns
+        -------
+        ndarray of dtype object with the shape of values
+        """
+        if not isinstance(values, np.ndarray):
+            values = list(values)
+        flat_values = np.asarray(values, dtype=object).ravel()
+        result = np.empty(flat_values.shape[0], dtype=object)
+        for i, value in enumerate(flat_values):
+            result[i] = self.encrypt(value)
+        return result.reshape(np.shape(values))
+
+    def decrypt_batch(self, values, partitions=1):
+        """
+        Decrypt a batch of values
+
+        Parameters
+        ----------
+        values: ndarray of any shape, or a flat iterable of encrypted numbers
+
+        partitions: int, number of tasks decrypting batches at the same time, such as the partitions of a mapValues
+
+        Returns
+        -------
+        ndarray with the shape of values
+        """
+        if not isinstance(values, np.ndarray):
+            values = list(values)
+        flat_values = np.asarray(values, dtype=object).ravel()
+        result = np.array([self.decrypt(value) for value in flat_values])
+        return result.reshape(np.shape(values))
+
     def distribute_decrypt(self, X):
         decrypt_table = X.mapValues(lambda x: self.decrypt(x))
         return decrypt_table
 
     def distribute_encrypt(self, X):
-        encrypt_table = X.mapValues(lambda x: self.encrypt(x))
+        partitions = X._partitions
+        encrypt_table = X.mapValues(
+            lambda x: self.encrypt_batch(x, partitions) if isinstance(x, np.ndarray) else self.encrypt(x))
         return encrypt_table
 
         # decrypt a np.array with arbitrary dimension
@@ -120,6 +164,11 @@ class RsaEncrypt(Encrypt):
         self.e = None
         self.d = None
         self.n = None
+        self.p = None
+        self.q = None
+        self.dp = None
+        self.dq = None
+        self.q_inverse = None
 
     def generate_key(self, rsa_bit=1024):
         random_generator = Random.new().read
@@ -127,6 +176,18 @@ class RsaEncrypt(Encrypt):
         self.e = rsa.e
         self.d = rsa.d
         self.n = rsa.n
+        self.set_crt_params(rsa.p, rsa.q)
+
+    def set_crt_params(self, p, q):
+        """
+        Keep the prime factors of n, so that decrypt can work modulo p and q separately
+        and combine the results by the chinese remainder theorem, which is about 3-4 times faster
+        """
+        self.p = p
+        self.q = q
+        self.dp = self.d % (p - 1)
+        self.dq = self.d % (q - 1)
+        self.q_inverse = gmpy_math.invert(q, p)
 
     def get_key_pair(self):
         return self.e, self.d, self.n
@@ -141,6 +202,10 @@ class RsaEncrypt(Encrypt):
     def set_privacy_key(self, privacy_key):
         self.d = privacy_key["d"]
         self.n = privacy_key["n"]
+        if "p" in privacy_key and "q" in privacy_key:
+            self.set_crt_params(privacy_key["p"], privacy_key["q"])
+        else:
+            self.p = self.q = self.dp = self.dq = self.q_inverse = None
 
     def get_privacy_key(self):
         return self.d, self.n
@@ -152,11 +217,23 @@ class RsaEncrypt(Encrypt):
             return None
 
     def decrypt(self, value):
-        if self.d is not None and self.n is not None:
+        if self.p is not None and self.q is not None:
+            return self.crt_decrypt(value)
+        elif self.d is not None and self.n is not None:
             return gmpy_math.powmod(value, self.d, self.n)
         else:
             return None
 
+    def crt_decrypt(self, value):
+        """
+        return int: value ** d mod n, computed with exponents dp, dq modulo the prime factors p, q
+        """
+        mp = gmpy_math.powmod(value % self.p, self.dp, self.p)
+        mq = gmpy_math.powmod(value % self.q, self.dq, self.q)
+        h = (self.q_inverse * (mp - mq)) % self.p
+
+        return mq + h * self.q
+
 
 class PaillierEncrypt(Encrypt):
     def __init__(self):
@@ -193,6 +270,57 @@ class PaillierEncrypt(Encrypt):
         else:
             return None
 
+    def encrypt_batch(self, values, partitions=1):
+        """
+        Encrypt a batch of values, with the obfuscators r ** n of large batches computed by a persistent pool,
+        partly ahead of time while the previous batch was encrypted if prefetching is set. No obfuscator is used twice
+
+        Parameters
+        ----------
+        values: ndarray of any shape, or a flat iterable of numbers
+
+        partitions: int, number of tasks encrypting batches at the same time, such as the partitions of a mapValues,
+                    each of them gets its share of the pool processes
+
+        Returns
+        -------
+        ndarray of dtype object with the shape of values, None if public key is not set
+        """
+        if self.public_key is None:
+            return None
+
+        if not isinstance(values, np.ndarray):
+            values = list(values)
+        flat_values = np.asarray(values, dtype=object).ravel()
+        result = np.empty(flat_values.shape[0], dtype=object)
+        result[:] = self.public_key.encrypt_batch(flat_values, partitions=partitions)
+        return result.reshape(np.shape(values))
+
+    def decrypt_batch(self, values, partitions=1):
+        """
+        Decrypt a batch of values in the worker processes of a persistent pool, with CRT decryption per value.
+        Use it instead of a loop of decrypt for gradients and models, which are decrypted by the arbiter alone
+
+        Parameters
+        ----------
+        values: ndarray of any shape, or a flat iterable of encrypted numbers
+
+        partitions: int, number of tasks decrypting batches at the same time, such as the partitions of a mapValues,
+                    each of them gets its share of the pool processes
+
+        Returns
+        -------
+        ndarray with the shape of values, None if privacy key is not set
+        """
+        if self.privacy_key is None:
+            return None
+
+        if not isinstance(values, np.ndarray):
+            values = list(values)
+        flat_values = np.asarray(values, dtype=object).ravel()
+        result = np.array(self.privacy_key.decrypt_batch(flat_values, partitions=partitions))
+        return result.reshape(np.shape(values))
+
 
 class FakeEncrypt(Encrypt):
     def encrypt(self, value):
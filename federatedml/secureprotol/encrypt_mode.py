@@ -43,18 +43,41 @@ class EncryptModeCalculator(object):
         self.re_encrypted_rate = re_encrypted_rate
         self.prev_data = None
         self.prev_encrypted_data = None
+        self.prev_mapped_data = None
 
-    def encrypt_row(self, row):
+    def encrypt_row(self, row, partitions=1):
         if type(row).__name__ == "ndarray":
-            return np.array([self.encrypter.encrypt(val) for val in row]) 
+            encrypted_row = self.encrypt_numeric_row(row, partitions)
+            if encrypted_row is not None:
+                return encrypted_row
+            return np.array([self.encrypter.encrypt(val) for val in row])
         elif isinstance(row, Iterable):
+            encrypted_row = self.encrypt_numeric_row(row, partitions)
+            if encrypted_row is not None:
+                return type(row)(encrypted_row)
             return type(row)(self.encrypter.encrypt(val) for val in row)
         else:
             return self.encrypter.encrypt(row)
 
+    def encrypt_numeric_row(self, row, partitions=1):
+        """
+        Encrypt a row of numbers in one batch, None if row has other elements, e.g. nested rows,
+        or if the batch is not encrypted, which leaves them to be encrypted one by one
+        """
+        if type(row).__name__ == "ndarray":
+            if not np.issubdtype(row.dtype, np.number):
+                return None
+        elif not all(isinstance(val, (int, float, np.number)) for val in row):
+            return None
+        return self.encrypter.encrypt_batch(row, partitions)
+
     def gen_random_number(self):
         return random.random()
 
+    def need_re_encrypt(self, prev_data):
+        return prev_data is None or self.mode == "strict" \
+            or (self.mode == "balance" and self.gen_random_number() <= self.re_encrypted_rate + consts.FLOAT_ZERO)
+
     def encrypt(self, input_data):
         """
         Encrypt data according to different mode
@@ -69,9 +92,9 @@ class EncryptModeCalculator(object):
 
         """
         
-        if self.prev_data is None or self.mode == "strict" \
-                or (self.mode == "balance" and self.gen_random_number() <= self.re_encrypted_rate + consts.FLOAT_ZERO):
-            new_data = input_data.mapValues(self.encrypt_row)
+        if self.need_re_encrypt(self.prev_data):
+            partitions = input_data._partitions
+            new_data = input_data.mapValues(lambda row: self.encrypt_row(row, partitions))
         else:
             diff_data = input_data.join(self.prev_data, self.get_differance) 
             new_data = diff_data.join(self.prev_encrypted_data, self.add_differance)
@@ -93,6 +116,55 @@ class EncryptModeCalculator(object):
 
         return new_data
 
+    def map_encrypt(self, input_data, map_func, merge_func=None):
+        """
+        Map every value of input_data and encrypt the mapped row in a single pass, instead of
+        a mapValues, an encrypt and a join of their results. Mapped rows of the last call are reused
+        according to mode, the same way as encrypt
+
+        Parameters
+        ----------
+        input_data: DTable
+
+        map_func: function, value of input_data -> row to encrypt, ndarray or single element or iterable python object
+
+        merge_func: function, (row, encrypted row) -> value of the result, default returns (row, encrypted row)
+
+        Returns
+        -------
+        new_data: DTable, merge_func of the mapped row and its encrypted result
+        """
+        if merge_func is None:
+            merge_func = lambda row, encrypted_row: (row, encrypted_row)
+        partitions = input_data._partitions
+
+        if self.mode == "strict":
+            # nothing is reused in strict mode, so no mapped data is kept and everything is done in one mapValues
+            return input_data.mapValues(lambda val: merge_func(*self.map_encrypt_row(map_func(val), partitions)))
+
+        if self.need_re_encrypt(self.prev_mapped_data):
+            mapped_data = input_data.mapValues(lambda val: self.map_encrypt_row(map_func(val), partitions))
+        else:
+            mapped_data = input_data.join(self.prev_mapped_data,
+                                          lambda val, prev: self.map_add_differance(map_func(val), prev))
+
+        if self.prev_mapped_data is not None:
+            # standalone tables are destroyed once released, cluster ones are not
+            self.prev_mapped_data.destroy()
+        self.prev_mapped_data = mapped_data
+
+        return mapped_data.mapValues(lambda val: merge_func(*val))
+
+    def map_encrypt_row(self, row, partitions=1):
+        return row, self.encrypt_row(row, partitions)
+
+    def map_add_differance(self, new_row, prev_mapped_row):
+        """
+        Get (new_row, encrypted new_row) from prev_mapped_row, which is (old_row, encrypted old_row)
+        """
+        old_row, encrypted_data = prev_mapped_row
+        return new_row, self.add_differance(self.get_differance(new_row, old_row), encrypted_data)
+
     def get_differance(self, new_row, old_row):
         """
         Get difference of new_row and old row
@@ -0,0 +1,436 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import math
+
+import gmpy2
+import numpy as np
+from scipy import sparse
+
+from federatedml.secureprotol import gmpy_math
+from federatedml.secureprotol.fate_paillier import PaillierEncryptedNumber
+from federatedml.secureprotol.fixedpoint import FixedPointNumber
+
+
+MULTI_POWMOD_MIN_SIZE = 16
+
+
+def _to_python(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def multi_powmod(bases, exps, modulus):
+    """
+    return int: product of base ** exp over all pairs, mod modulus, exps should be non negative.
+    Simultaneous exponentiation by the bucket method: for each window of exponent bits from the top,
+    bases are multiplied into the bucket of their digit, and buckets are combined with two multiplications each,
+    so that the squarings are shared by all bases.
+    """
+    if len(bases) < MULTI_POWMOD_MIN_SIZE:
+        result = 1
+        for base, exp in zip(bases, exps):
+            result = result * gmpy_math.powmod(base, exp, modulus) % modulus
+        return result
+
+    modulus = gmpy2.mpz(modulus)
+    bases = [gmpy2.mpz(base) for base in bases]
+    window = max(2, min(10, int(math.log2(len(bases))) - 2))
+    mask = (1 << window) - 1
+    bits = max(exp.bit_length() for exp in exps)
+
+    result = gmpy2.mpz(1)
+    for shift in range((bits - 1) // window * window, -1, -window):
+        for _ in range(window):
+            result = result * result % modulus
+
+        buckets = [None] * (mask + 1)
+        for base, exp in zip(bases, exps):
+            digit = (exp >> shift) & mask
+            if digit:
+                buckets[digit] = base if buckets[digit] is None else buckets[digit] * base % modulus
+
+        # sum of digit * bucket[digit] in the exponent, by running products from the highest digit
+        running = gmpy2.mpz(1)
+        window_product = gmpy2.mpz(1)
+        for digit in range(mask, 0, -1):
+            if buckets[digit] is not None:
+                running = running * buckets[digit] % modulus
+            window_product = window_product * running % modulus
+        result = result * window_product % modulus
+
+    return int(result)
+
+
+def shared_exponent(values, max_int):
+    """
+    return int: one fixed point exponent for all values, which keeps the float precision of the largest of them.
+    Smaller values are encoded to the same absolute precision, and rounded to 0 below it, so that a near zero value
+    does not widen every encoding
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in "biu" or values.shape[0] == 0:
+        return 0
+
+    max_value = float(np.max(np.abs(values)))
+    if max_value < 1e-200:
+        return 0
+
+    exponent = math.floor((FixedPointNumber.FLOAT_MANTISSA_BITS - math.frexp(max_value)[1])
+                          / FixedPointNumber.LOG2_BASE)
+    while max_value * pow(FixedPointNumber.BASE, exponent) > max_int:
+        exponent -= 1
+    return exponent
+
+
+class EncryptedVector(object):
+    """
+    Vector of Paillier encrypted numbers sharing one public key,
+    kept as a list of int ciphertexts and an exponent array instead of PaillierEncryptedNumber objects.
+    It is pickled with the public key once and the ciphertexts as fixed-width big-endian bytes.
+
+    Parameters
+    ----------
+    public_key : PaillierPublicKey
+
+    ciphertexts : list of int
+
+    exponents : ndarray of int, exponents of the fixed point encodings
+    """
+
+    # let numpy operands defer to the reflected operators of this class instead of broadcasting over it
+    __array_ufunc__ = None
+
+    def __init__(self, public_key, ciphertexts, exponents):
+        self.public_key = public_key
+        self.ciphertexts = list(ciphertexts)
+        self.exponents = np.asarray(exponents, dtype=np.int64).reshape(-1)
+
+        if len(self.ciphertexts) != self.exponents.shape[0]:
+            raise ValueError("got {} ciphertexts but {} exponents".format(len(self.ciphertexts),
+                                                                          self.exponents.shape[0]))
+
+    @classmethod
+    def from_encrypted_numbers(cls, encrypted_numbers):
+        encrypted_numbers = list(encrypted_numbers)
+        if not encrypted_numbers:
+            raise ValueError("can not build an encrypted vector of no number")
+
+        public_key = encrypted_numbers[0].public_key
+        for encrypted_number in encrypted_numbers:
+            if encrypted_number.public_key != public_key:
+                raise ValueError("encrypted numbers have different public keys")
+
+        return cls(public_key,
+                   [encrypted_number.ciphertext(False) for encrypted_number in encrypted_numbers],
+                   [encrypted_number.exponent for encrypted_number in encrypted_numbers])
+
+    @staticmethod
+    def can_hold(values):
+        """
+        return bool: whether values, flattened, are all PaillierEncryptedNumber
+        """
+        values = np.asarray(values, dtype=object).reshape(-1)
+        return values.shape[0] > 0 and all(isinstance(value, PaillierEncryptedNumber) for value in values)
+
+    def _new(self, ciphertexts, exponents):
+        return EncryptedVector(self.public_key, ciphertexts, exponents)
+
+    def to_encrypted_numbers(self):
+        """
+        return ndarray of PaillierEncryptedNumber
+        """
+        encrypted_numbers = np.empty(len(self.ciphertexts), dtype=object)
+        for i, (ciphertext, exponent) in enumerate(zip(self.ciphertexts, self.exponents)):
+            encrypted_numbers[i] = PaillierEncryptedNumber(self.public_key, ciphertext, int(exponent))
+        return encrypted_numbers
+
+    def __len__(self):
+        return len(self.ciphertexts)
+
+    def __iter__(self):
+        for ciphertext, exponent in zip(self.ciphertexts, self.exponents):
+            yield PaillierEncryptedNumber(self.public_key, ciphertext, int(exponent))
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return EncryptedVector(self.public_key, self.ciphertexts[idx], self.exponents[idx])
+        return PaillierEncryptedNumber(self.public_key, self.ciphertexts[idx], int(self.exponents[idx]))
+
+    def __getstate__(self):
+        width = (self.public_key.nsquare.bit_length() + 7) // 8
+        ciphertexts = b''.join(int(ciphertext).to_bytes(width, 'big') for ciphertext in self.ciphertexts)
+        state = dict(self.__dict__)
+        state["ciphertexts"] = ciphertexts
+        state["width"] = width
+        return state
+
+    def __setstate__(self, state):
+        width = state.pop("width")
+        ciphertexts = state["ciphertexts"]
+        state["ciphertexts"] = [int.from_bytes(ciphertexts[i: i + width], 'big')
+                                for i in range(0, len(ciphertexts), width)]
+        self.__dict__.update(state)
+
+    def _raise_exponent(self, ciphertext, exponent, new_exponent):
+        if new_exponent == exponent:
+            return ciphertext
+        return gmpy_math.powmod(ciphertext, pow(FixedPointNumber.BASE, int(new_exponent - exponent)),
+                                self.public_key.nsquare)
+
+    def _check_length(self, other):
+        if len(other) != len(self):
+            raise ValueError("operands have different lengths {} and {}".format(len(self), len(other)))
+
+    def __add__(self, other):
+        nsquare = self.public_key.nsquare
+        if isinstance(other, EncryptedVector):
+            if self.public_key != other.public_key:
+                raise ValueError("add two vectors have different public key!")
+            self._check_length(other)
+            other_ciphertexts = other.ciphertexts
+            other_exponents = other.exponents
+        elif isinstance(other, PaillierEncryptedNumber):
+            if self.public_key != other.public_key:
+                raise ValueError("add two numbers have different public key!")
+            other_ciphertexts = [other.ciphertext(False)] * len(self.ciphertexts)
+            other_exponents = np.full(len(self.ciphertexts), other.exponent, dtype=np.int64)
+        else:
+            scalars = np.broadcast_to(np.asarray(other), (len(self.ciphertexts),))
+            other_ciphertexts = []
+            other_exponents = np.empty(len(self.ciphertexts), dtype=np.int64)
+            for i, (scalar, exponent) in enumerate(zip(scalars, self.exponents)):
+                encoded = FixedPointNumber.encode(_to_python(scalar), self.public_key.n, self.public_key.max_int,
+                                                  max_exponent=int(exponent))
+                other_ciphertexts.append(self.public_key.raw_encrypt(encoded.encoding, 1))
+                other_exponents[i] = encoded.exponent
+
+        exponents = np.maximum(self.exponents, other_exponents)
+        ciphertexts = []
+        for c_x, e_x, c_y, e_y, exponent in zip(self.ciphertexts, self.exponents,
+                                                other_ciphertexts, other_exponents, exponents):
+            c_x = self._raise_exponent(c_x, e_x, exponent)
+            c_y = self._raise_exponent(c_y, e_y, exponent)
+            ciphertexts.append(c_x * c_y % nsquare)
+
+        return self._new(ciphertexts, exponents)
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        return self + (other * -1)
+
+    def __rsub__(self, other):
+        return other + (self * -1)
+
+    def __neg__(self):
+        return self * -1
+
+    def __rmul__(self, scalar):
+        return self.__mul__(scalar)
+
+    def __truediv__(self, scalar):
+        return self.__mul__(1 / np.asarray(scalar, dtype=np.float64))
+
+    def __mul__(self, scalar):
+        """
+        return vector multiplied elementwise by a scalar or an array of scalars, encoding each distinct scalar once
+        """
+        n = self.public_key.n
+        nsquare = self.public_key.nsquare
+        scalars = np.broadcast_to(np.asarray(scalar), (len(self.ciphertexts),))
+
+        encodings = {}
+        ciphertexts = []
+        exponents = np.empty(len(self.ciphertexts), dtype=np.int64)
+        for i, (ciphertext, exponent, value) in enumerate(zip(self.ciphertexts, self.exponents, scalars)):
+            value = _to_python(value)
+            if value not in encodings:
+                encodings[value] = FixedPointNumber.encode(value, n, self.public_key.max_int)
+            encode = encodings[value]
+            plaintext = encode.encoding
+
+            if plaintext >= n - self.public_key.max_int:
+                # Very large plaintext, play a sneaky trick using inverses
+                ciphertexts.append(gmpy_math.powmod(gmpy_math.invert(ciphertext, nsquare), n - plaintext, nsquare))
+            else:
+                ciphertexts.append(gmpy_math.powmod(ciphertext, plaintext, nsquare))
+            exponents[i] = exponent + encode.exponent
+
+        return self._new(ciphertexts, exponents)
+
+    def _sum(self, ciphertexts, exponents):
+        """
+        return PaillierEncryptedNumber: sum of ciphertexts, which are multiplied per distinct exponent first
+        so that only one exponent alignment is done for each of them
+        """
+        nsquare = self.public_key.nsquare
+        products = {}
+        for ciphertext, exponent in zip(ciphertexts, exponents):
+            exponent = int(exponent)
+            products[exponent] = products[exponent] * ciphertext % nsquare if exponent in products else ciphertext
+
+        if not products:
+            return 0
+
+        max_exponent = max(products)
+        result = 1
+        for exponent, product in products.items():
+            result = result * self._raise_exponent(product, exponent, max_exponent) % nsquare
+        return PaillierEncryptedNumber(self.public_key, result, max_exponent)
+
+    def sum(self):
+        return self._sum(self.ciphertexts, self.exponents)
+
+    def transposed_dot(self, matrix):
+        """
+        return EncryptedVector: matrix.T dot self, for a plain matrix of shape (len(self), m),
+        dense ndarray or scipy sparse.
+        Zero entries are skipped, each column is fixed point encoded with one exponent of its own, and computed by one
+        simultaneous exponentiation over its non zero rows, with one inversion for negative entries.
+        """
+        nsquare = self.public_key.nsquare
+        max_int = self.public_key.max_int
+        if len(self.ciphertexts) == 0:
+            raise ValueError("can not dot an empty encrypted vector")
+
+        exponent = int(np.max(self.exponents))
+        ciphertexts = [self._raise_exponent(c, e, exponent) for c, e in zip(self.ciphertexts, self.exponents)]
+
+        matrix = sparse.csc_matrix(matrix)
+        if matrix.shape[0] != len(ciphertexts):
+            raise ValueError("matrix of shape {} can not dot encrypted vector of length {}".format(matrix.shape,
+                                                                                               len(ciphertexts)))
+
+        results = []
+        result_exponents = np.empty(matrix.shape[1], dtype=np.int64)
+        for j in range(matrix.shape[1]):
+            start, end = matrix.indptr[j], matrix.indptr[j + 1]
+            column = matrix.data[start: end]
+            column_exponent = shared_exponent(column, max_int)
+            if matrix.dtype.kind in "biu":
+                encodings = [int(value) for value in column]
+            else:
+                encodings = [int(value) for value in np.round(column * float(pow(FixedPointNumber.BASE,
+                                                                                  column_exponent)))]
+            if encodings and max(abs(encoding) for encoding in encodings) > max_int:
+                raise ValueError("matrix entries out of bounds")
+
+            pos_bases, pos_exps, neg_bases, neg_exps = [], [], [], []
+            for row, encoding in zip(matrix.indices[start: end], encodings):
+                if encoding > 0:
+                    pos_bases.append(ciphertexts[row])
+                    pos_exps.append(encoding)
+                elif encoding < 0:
+                    neg_bases.append(ciphertexts[row])
+                    neg_exps.append(-encoding)
+
+            result = multi_powmod(pos_bases, pos_exps, nsquare)
+            if neg_bases:
+                result = result * gmpy_math.invert(multi_powmod(neg_bases, neg_exps, nsquare), nsquare) % nsquare
+            results.append(result)
+            result_exponents[j] = exponent + column_exponent
+
+        return EncryptedVector(self.public_key, results, result_exponents)
+
+
+class EncryptedMatrix(EncryptedVector):
+    """
+    Row-major matrix of Paillier encrypted numbers sharing one public key,
+    row i is an EncryptedVector, so a matrix of (sum_grad, sum_hess) pairs unpacks like a list of tuples.
+
+    Parameters
+    ----------
+    shape : tuple of int, (row_num, col_num)
+    """
+
+    def __init__(self, public_key, ciphertexts, exponents, shape):
+        super(EncryptedMatrix, self).__init__(public_key, ciphertexts, exponents)
+        self.shape = tuple(shape)
+
+        if self.shape[0] * self.shape[1] != len(self.ciphertexts):
+            raise ValueError("shape {} does not match {} ciphertexts".format(self.shape, len(self.ciphertexts)))
+
+    @classmethod
+    def from_encrypted_numbers(cls, encrypted_numbers):
+        rows = [list(row) for row in encrypted_numbers]
+        vector = EncryptedVector.from_encrypted_numbers([value for row in rows for value in row])
+        col_num = len(rows[0])
+        if any(len(row) != col_num for row in rows):
+            raise ValueError("rows of an encrypted matrix should have the same length")
+
+        return cls(vector.public_key, vector.ciphertexts, vector.exponents, (len(rows), col_num))
+
+    def _new(self, ciphertexts, exponents):
+        return EncryptedMatrix(self.public_key, ciphertexts, exponents, self.shape)
+
+    def to_encrypted_numbers(self):
+        return super(EncryptedMatrix, self).to_encrypted_numbers().reshape(self.shape)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def row(self, idx):
+        start = idx * self.shape[1]
+        end = start + self.shape[1]
+        return EncryptedVector(self.public_key, self.ciphertexts[start: end], self.exponents[start: end])
+
+    def __iter__(self):
+        for idx in range(self.shape[0]):
+            yield self.row(idx)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            rows = range(self.shape[0])[idx]
+            ciphertexts = [c for i in rows for c in self.row(i).ciphertexts]
+            exponents = [e for i in rows for e in self.row(i).exponents]
+            return EncryptedMatrix(self.public_key, ciphertexts, exponents, (len(rows), self.shape[1]))
+        if idx < 0:
+            idx += self.shape[0]
+        if not 0 <= idx < self.shape[0]:
+            raise IndexError("row index {} out of range".format(idx))
+        return self.row(idx)
+
+    def _check_length(self, other):
+        if not isinstance(other, EncryptedMatrix) or other.shape != self.shape:
+            raise ValueError("operands have different shapes {} and {}".format(self.shape,
+                                                                             getattr(other, "shape", len(other))))
+
+    def __add__(self, other):
+        if not isinstance(other, (EncryptedVector, PaillierEncryptedNumber)):
+            other = np.broadcast_to(np.asarray(other), self.shape).reshape(-1)
+        return super(EncryptedMatrix, self).__add__(other)
+
+    def __mul__(self, scalar):
+        return super(EncryptedMatrix, self).__mul__(np.broadcast_to(np.asarray(scalar), self.shape).reshape(-1))
+
+    def sum(self, axis=None):
+        """
+        return PaillierEncryptedNumber if axis is None, otherwise EncryptedVector of sums along axis
+        """
+        if axis is None:
+            return super(EncryptedMatrix, self).sum()
+
+        row_num, col_num = self.shape
+        if axis == 0:
+            lines = [range(j, row_num * col_num, col_num) for j in range(col_num)]
+        elif axis == 1:
+            lines = [range(i * col_num, (i + 1) * col_num) for i in range(row_num)]
+        else:
+            raise ValueError("axis should be None, 0 or 1, but got {}".format(axis))
+
+        sums = [self._sum([self.ciphertexts[k] for k in line], self.exponents[list(line)]) for line in lines]
+        return EncryptedVector.from_encrypted_numbers(sums)
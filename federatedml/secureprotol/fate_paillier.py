@@ -16,11 +16,30 @@
 #  limitations under the License.
 #
 
+from collections import OrderedDict
 from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 from federatedml.secureprotol.fixedpoint import FixedPointNumber
 from federatedml.secureprotol import gmpy_math
+import multiprocessing
+import multiprocessing.util
+import atexit
+import os
 import random
 
+ENCRYPT_PARALLEL_MIN_SIZE = 256
+DECRYPT_PARALLEL_MIN_SIZE = 256
+POOL_CHUNKS_PER_WORKER = 4
+# obfuscators of a key computed ahead of time for its next batch, at most as many as the last batch took.
+# the pool cannot know whether another batch comes, so prefetching is off unless FATE_PAILLIER_PREFETCH_SIZE is set
+OBFUSCATOR_PREFETCH_MAX_SIZE = int(os.environ.get("FATE_PAILLIER_PREFETCH_SIZE", 0))
+OBFUSCATOR_PREFETCH_MAX_KEYS = 2
+# pool processes all batched encryptions and decryptions of a party may use together, shared by the partitions
+# that run them at the same time
+PAILLIER_CPU_BUDGET = int(os.environ.get("FATE_PAILLIER_CPU_BUDGET", 0)) or os.cpu_count() or 1
+
+_system_random = random.SystemRandom()
+
 
 class PaillierKeypair(object):
     def __init__(self):
@@ -69,7 +88,7 @@ class PaillierPublicKey(object):
     def apply_obfuscator(self, ciphertext, random_value=None):
         """ 
         """
-        r = random_value or random.SystemRandom().randrange(1, self.n)
+        r = random_value or _system_random.randrange(1, self.n)
         obfuscator = gmpy_math.powmod(r, self.n, self.nsquare)
 
         return (ciphertext * obfuscator) % self.nsquare
@@ -104,8 +123,157 @@ class PaillierPublicKey(object):
             encryptednumber.apply_obfuscator()
             
         return encryptednumber
+
+    def encrypt_batch(self, values, precision=None, partitions=1):
+        """return list of PaillierEncryptedNumber of values, the same as encrypt per value.
+           large batches get their obfuscators r ** n from the persistent process pool, partly computed
+           ahead of time while the previous batch was encrypted if OBFUSCATOR_PREFETCH_MAX_SIZE is set,
+           each of them used exactly once.
+           partitions is the number of tasks encrypting at the same time, e.g. in a mapValues, which share the pool budget
+        """
+        values = list(values)
+        n_jobs = _pool_jobs(len(values), ENCRYPT_PARALLEL_MIN_SIZE, partitions)
+        if n_jobs <= 1:
+            return [self.encrypt(value, precision) for value in values]
+
+        obfuscators = _get_obfuscator_prefetch(self).take(len(values), n_jobs)
+        encrypted_numbers = []
+        for value, obfuscator in zip(values, obfuscators):
+            encoding = FixedPointNumber.encode(value, self.n, self.max_int, precision)
+            ciphertext = self.raw_encrypt(encoding.encoding, random_value=1) * obfuscator % self.nsquare
+            encrypted_numbers.append(PaillierEncryptedNumber(self, ciphertext, encoding.exponent, is_obfuscator=True))
+
+        return encrypted_numbers
    
 
+def _raw_obfuscators(n, nsquare, size):
+    return [gmpy_math.powmod(_system_random.randrange(1, n), n, nsquare) for _ in range(size)]
+
+
+def _decrypt_raw_batch(private_key, ciphertexts, exponents):
+    return [private_key.decode(private_key.raw_decrypt(ciphertext), exponent)
+            for ciphertext, exponent in zip(ciphertexts, exponents)]
+
+
+_executor = None
+_executor_pid = None
+_obfuscator_prefetches = OrderedDict()
+
+
+def pool_jobs(partitions=1):
+    """return the number of pool processes of each of partitions tasks that encrypt or decrypt at the same time,
+       so that together they keep within PAILLIER_CPU_BUDGET
+    """
+    return max(PAILLIER_CPU_BUDGET // max(partitions, 1), 1)
+
+
+def _get_executor(n_jobs):
+    """return the process pool shared by all batched encryptions and decryptions of this process, started on first use
+       and kept until the process exits, so that each batch only pays for sending its work
+    """
+    global _executor
+    _forget_parent_pool()
+    if _executor is None or _executor._max_workers < n_jobs:
+        if _executor is None:
+            # worker processes join their children on exit, shut the pool down before they do,
+            # and before the finalizers of its queues close them
+            multiprocessing.util.Finalize(None, _shutdown_executor, exitpriority=100)
+            atexit.register(_shutdown_executor)
+        else:
+            _shutdown_executor()
+        _executor = ProcessPoolExecutor(max_workers=n_jobs)
+    return _executor
+
+
+def _forget_parent_pool():
+    """a forked child, such as an eggroll worker, starts its own pool and prefetches instead of using the ones of its parent
+    """
+    global _executor, _executor_pid
+    if _executor_pid != os.getpid():
+        _executor = None
+        _executor_pid = os.getpid()
+        _obfuscator_prefetches.clear()
+
+
+def _shutdown_executor():
+    global _executor
+    if _executor is not None and _executor_pid == os.getpid():
+        # prefetches not taken yet are of no use any more, they are not waited for
+        for prefetch in _obfuscator_prefetches.values():
+            prefetch.discard()
+        _obfuscator_prefetches.clear()
+        _executor.shutdown(wait=True)
+    _executor = None
+
+
+def _pool_jobs(size, min_size, partitions=1):
+    """return the number of processes to spread a batch of size values over, 1 to stay in-process.
+       small batches stay, and so do daemonic processes, which are not allowed to have children
+    """
+    if size < min_size or multiprocessing.current_process().daemon:
+        return 1
+    return pool_jobs(partitions)
+
+
+class _ObfuscatorPrefetch(object):
+    """Obfuscators r ** n mod n ** 2 of one public key, computed by the process pool ahead of time.
+       every r is drawn independently by SystemRandom in a pool worker, and every obfuscator is handed out once
+    """
+    def __init__(self, public_key):
+        self.n = public_key.n
+        self.nsquare = public_key.nsquare
+        self.ready = []
+        self.pending = []
+        self.pending_size = 0
+
+    def submit(self, size, n_jobs):
+        if size <= 0:
+            return []
+        chunk_size = -(-size // (n_jobs * POOL_CHUNKS_PER_WORKER))
+        executor = _get_executor(n_jobs)
+        return [executor.submit(_raw_obfuscators, self.n, self.nsquare, min(chunk_size, size - start))
+                for start in range(0, size, chunk_size)]
+
+    def take(self, size, n_jobs):
+        """return size obfuscators, the prefetched ones first and the rest computed by the pool now,
+           and start prefetching as many for the next batch
+        """
+        while self.pending and len(self.ready) < size:
+            result = self.pending.pop(0).result()
+            self.pending_size -= len(result)
+            self.ready.extend(result)
+        obfuscators, self.ready = self.ready[:size], self.ready[size:]
+
+        missing = self.submit(size - len(obfuscators), n_jobs)
+        prefetch_size = min(size, OBFUSCATOR_PREFETCH_MAX_SIZE) - len(self.ready) - self.pending_size
+        self.pending.extend(self.submit(prefetch_size, n_jobs))
+        self.pending_size += max(prefetch_size, 0)
+
+        obfuscators.extend(obfuscator for future in missing for obfuscator in future.result())
+        return obfuscators
+
+    def discard(self):
+        for future in self.pending:
+            future.cancel()
+        self.ready = []
+        self.pending = []
+        self.pending_size = 0
+
+
+def _get_obfuscator_prefetch(public_key):
+    """return the prefetch of public_key, only the ones of the OBFUSCATOR_PREFETCH_MAX_KEYS keys used last are kept,
+       so that a long-lived worker seeing a new key every job does not keep the obfuscators of all of them
+    """
+    _forget_parent_pool()
+    if public_key.n in _obfuscator_prefetches:
+        _obfuscator_prefetches.move_to_end(public_key.n)
+    else:
+        _obfuscator_prefetches[public_key.n] = _ObfuscatorPrefetch(public_key)
+        while len(_obfuscator_prefetches) > OBFUSCATOR_PREFETCH_MAX_KEYS:
+            _obfuscator_prefetches.popitem(last=False)[1].discard()
+    return _obfuscator_prefetches[public_key.n]
+
+
 class PaillierPrivateKey(object):
     """Contains a private key and associated decryption method.
     """
@@ -187,23 +355,56 @@ class PaillierPrivateKey(object):
             raise ValueError("encrypted_number was encrypted against a different key!")
 
         encoded = self.raw_decrypt(encrypted_number.ciphertext(be_secure=False))
+
+        return self.decode(encoded, encrypted_number.exponent)
+
+    def decode(self, encoded, exponent):
+        """return the plaintext of raw plaintext encoded with exponent.
+        """
         encoded = FixedPointNumber(encoded,
-                             encrypted_number.exponent,
+                             exponent,
                              self.public_key.n, 
                              self.public_key.max_int)
         decrypt_value = encoded.decode()
         
         return decrypt_value
+
+    def decrypt_batch(self, encrypted_numbers, partitions=1):
+        """return list of the decrypted & decoded plaintexts of encrypted_numbers.
+           large batches are split into chunks and decrypted by a persistent process pool,
+           shared by partitions tasks decrypting at the same time
+        """
+        for encrypted_number in encrypted_numbers:
+            if not isinstance(encrypted_number, PaillierEncryptedNumber):
+                raise TypeError("encrypted_number should be an PaillierEncryptedNumber, \
+                                 not: %s" % type(encrypted_number))
+            if self.public_key != encrypted_number.public_key:
+                raise ValueError("encrypted_number was encrypted against a different key!")
+
+        ciphertexts = [encrypted_number.ciphertext(be_secure=False) for encrypted_number in encrypted_numbers]
+        exponents = [encrypted_number.exponent for encrypted_number in encrypted_numbers]
+
+        n_jobs = _pool_jobs(len(ciphertexts), DECRYPT_PARALLEL_MIN_SIZE, partitions)
+        if n_jobs <= 1:
+            return _decrypt_raw_batch(self, ciphertexts, exponents)
+
+        chunk_size = -(-len(ciphertexts) // (n_jobs * POOL_CHUNKS_PER_WORKER))
+        starts = range(0, len(ciphertexts), chunk_size)
+        results = _get_executor(n_jobs).map(_decrypt_raw_batch,
+                                      [self] * len(starts),
+                                      [ciphertexts[start: start + chunk_size] for start in starts],
+                                      [exponents[start: start + chunk_size] for start in starts])
+        return [value for result in results for value in result]
     
 
 class PaillierEncryptedNumber(object):
     """Represents the Paillier encryption of a float or int.
     """
-    def __init__(self, public_key, ciphertext, exponent=0):
+    def __init__(self, public_key, ciphertext, exponent=0, is_obfuscator=False):
         self.public_key = public_key
         self.__ciphertext = ciphertext
         self.exponent = exponent
-        self.__is_obfuscator = False
+        self.__is_obfuscator = is_obfuscator
        
         if not isinstance(self.__ciphertext, int):
             raise TypeError("ciphertext should be an int, not: %s" % type(self.__ciphertext))
@@ -0,0 +1,88 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+PACKING_PRECISION_BITS = 64
+
+
+class FixedPointPacker(object):
+    """
+    Pack several real numbers into one integer plaintext, so that a single Paillier ciphertext carries all of them.
+
+    Value i is fixed-point encoded as round(value * 2 ** precision_bits) and placed in bits
+    [i * slot_bits, (i + 1) * slot_bits) of the packed integer. Negative values borrow from the next slot,
+    which unpack gives back, so packed integers can be added, subtracted and multiplied by integers
+    (homomorphically as well) as long as every slot sum stays below 2 ** (slot_bits - 1) in magnitude.
+
+    Parameters
+    ----------
+    slot_num: int, number of values packed together
+
+    slot_bits: int, bits of each slot, the headroom of a slot is slot_bits - precision_bits - 1 bits
+
+    precision_bits: int, fractional bits of the fixed-point encoding, default: 64
+    """
+
+    def __init__(self, slot_num=2, slot_bits=128, precision_bits=PACKING_PRECISION_BITS):
+        if slot_bits <= precision_bits + 1:
+            raise ValueError("slot_bits {} should be greater than precision_bits {} + 1".format(slot_bits,
+                                                                                            precision_bits))
+        self.slot_num = slot_num
+        self.slot_bits = slot_bits
+        self.precision_bits = precision_bits
+        self.scale = 1 << precision_bits
+        self.slot_mod = 1 << slot_bits
+        self.slot_bound = 1 << (slot_bits - 1)
+
+    @classmethod
+    def from_public_key(cls, public_key, slot_num=2, precision_bits=PACKING_PRECISION_BITS):
+        """
+        packer using the whole plaintext space of a paillier public key,
+        packed integers stay below n // 3, the bound of signed plaintexts
+        """
+        slot_bits = (public_key.n.bit_length() - 3) // slot_num
+        return cls(slot_num, slot_bits, precision_bits)
+
+    def pack(self, values):
+        """
+        return int: values packed into one integer, lowest slot first
+        """
+        if len(values) != self.slot_num:
+            raise ValueError("expect {} values to pack, but got {}".format(self.slot_num, len(values)))
+
+        packed = 0
+        for i in range(self.slot_num - 1, -1, -1):
+            encoding = int(round(values[i] * self.scale))
+            if abs(encoding) >= self.slot_bound:
+                raise OverflowError("value {} is too large to pack into {} bits".format(values[i], self.slot_bits))
+            packed = (packed << self.slot_bits) + encoding
+
+        return packed
+
+    def unpack(self, packed):
+        """
+        return list: the values packed in packed, which may be a sum of packed integers
+        """
+        values = []
+        for i in range(self.slot_num - 1):
+            encoding = packed % self.slot_mod
+            if encoding >= self.slot_bound:
+                encoding -= self.slot_mod
+            values.append(encoding / self.scale)
+            packed = (packed - encoding) >> self.slot_bits
+
+        values.append(packed / self.scale)
+
+        return values
@@ -81,6 +81,73 @@ class TestEncryptModeCalculator(unittest.TestCase):
             for j in range(30):
                 self.assertTrue(np.fabs(self.numpy_data[j] - decrypt_data_i[j] + i).all() < 1e-5)
            
+    def test_map_encrypt(self, round=5, mode="strict", re_encrypted_rate=0.2):
+        encrypter = PaillierEncrypt()
+        encrypter.generate_key(1024)
+        encrypted_calculator = EncryptModeCalculator(encrypter, mode, re_encrypted_rate)
+
+        for i in range(round):
+            data_i = encrypted_calculator.map_encrypt(self.data_numpy, lambda v: v[:2] * (i + 1),
+                                                      lambda row, encrypted_row: (encrypted_row, row[0]))
+            decrypt_data_i = dict(data_i.mapValues(
+                lambda v: (np.array([encrypter.decrypt(val) for val in v[0]]), v[1])).collect())
+            for j in range(30):
+                self.assertTrue(np.max(np.fabs(decrypt_data_i[j][0] - self.numpy_data[j][:2] * (i + 1))) < 1e-5)
+                self.assertTrue(decrypt_data_i[j][1] == self.numpy_data[j][0] * (i + 1))
+
+    def test_map_encrypt_with_diff_mode(self):
+        self.test_map_encrypt(mode="fast")
+        self.test_map_encrypt(mode="balance")
+
+    def test_encrypt_batch(self):
+        encrypter = PaillierEncrypt()
+        encrypter.generate_key(1024)
+
+        values = np.random.uniform(-10, 10, (3, 5))
+        encrypted_values = encrypter.encrypt_batch(values)
+        self.assertTrue(encrypted_values.shape == values.shape)
+        decrypted_values = np.array([[encrypter.decrypt(val) for val in row] for row in encrypted_values])
+        self.assertTrue(np.max(np.fabs(decrypted_values - values)) < 1e-5)
+
+        encrypted_values = encrypter.encrypt_batch((1, 2.5, -3))
+        self.assertTrue([encrypter.decrypt(val) for val in encrypted_values] == [1, 2.5, -3])
+
+    def test_encrypt_row(self):
+        encrypter = PaillierEncrypt()
+        encrypter.generate_key(1024)
+        encrypted_calculator = EncryptModeCalculator(encrypter)
+
+        # rows of numbers are encrypted in one batch, other rows element by element
+        encrypted_row = encrypted_calculator.encrypt_row([1, 2.5, np.float64(-3)])
+        self.assertTrue(isinstance(encrypted_row, list))
+        self.assertEqual([encrypter.decrypt(val) for val in encrypted_row], [1, 2.5, -3])
+        self.assertEqual(encrypted_calculator.encrypt_numeric_row([(1, 2), (3, 4)]), None)
+
+        # without a public key nothing is encrypted, the same as encrypting one by one
+        encrypted_calculator = EncryptModeCalculator(PaillierEncrypt())
+        self.assertEqual(encrypted_calculator.encrypt_row([1, 2]), [None, None])
+        self.assertEqual(encrypted_calculator.encrypt_row((1, 2)), (None, None))
+        self.assertEqual(encrypted_calculator.encrypt_row(np.array([1, 2])).tolist(), [None, None])
+
+    def test_obfuscators_not_shared(self):
+        encrypter = PaillierEncrypt()
+        encrypter.generate_key(1024)
+        encrypted_calculator = EncryptModeCalculator(encrypter, "strict")
+        n = encrypter.get_public_key().n
+
+        # c mod n is r ** n mod n, equal obfuscators across partitions or calls would show up as repeats
+        obfuscators = []
+        for i in range(2):
+            encrypted_data = encrypted_calculator.encrypt(self.data_numpy)
+            obfuscators.extend(val.ciphertext(be_secure=False) % n for _, arr in encrypted_data.collect() for val in arr)
+        self.assertEqual(len(obfuscators), 2 * 30 * 20)
+        self.assertEqual(len(set(obfuscators)), len(obfuscators))
+
+        # nor may one obfuscator be the product of two others
+        obfuscators = obfuscators[:200]
+        products = set(o1 * o2 % n for i, o1 in enumerate(obfuscators) for o2 in obfuscators[i + 1:])
+        self.assertFalse(products & set(obfuscators))
+
     def test_balance_mode(self):
         self.test_diff_mode(mode="strict")
         self.test_diff_mode(mode="fast")
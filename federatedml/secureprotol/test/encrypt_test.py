@@ -0,0 +1,153 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import multiprocessing
+import os
+import random
+import unittest
+from unittest import mock
+import numpy as np
+from arch.api import eggroll
+from federatedml.secureprotol import fate_paillier
+from federatedml.secureprotol import gmpy_math
+from federatedml.secureprotol.encrypt import PaillierEncrypt
+from federatedml.secureprotol.encrypt import RsaEncrypt
+from federatedml.secureprotol.fate_paillier import DECRYPT_PARALLEL_MIN_SIZE
+from federatedml.secureprotol.fate_paillier import ENCRYPT_PARALLEL_MIN_SIZE
+
+
+class TestRsaEncrypt(unittest.TestCase):
+    def setUp(self):
+        self.rsa_encrypt = RsaEncrypt()
+        self.rsa_encrypt.generate_key(1024)
+        self.e, self.d, self.n = self.rsa_encrypt.get_key_pair()
+
+    def test_crt_decrypt(self):
+        for i in range(100):
+            value = random.SystemRandom().randrange(1, self.n)
+            self.assertEqual(self.rsa_encrypt.decrypt(value), gmpy_math.powmod(value, self.d, self.n))
+            self.assertEqual(self.rsa_encrypt.decrypt(self.rsa_encrypt.encrypt(value)), value)
+
+    def test_decrypt_without_factors(self):
+        rsa_encrypt = RsaEncrypt()
+        rsa_encrypt.set_public_key({"e": self.e, "n": self.n})
+        rsa_encrypt.set_privacy_key({"d": self.d, "n": self.n})
+        value = random.SystemRandom().randrange(1, self.n)
+        self.assertEqual(rsa_encrypt.decrypt(value), self.rsa_encrypt.decrypt(value))
+
+
+class TestPaillierEncrypt(unittest.TestCase):
+    def setUp(self):
+        self.paillier_encrypt = PaillierEncrypt()
+        self.paillier_encrypt.generate_key(1024)
+
+    def test_decrypt_batch(self):
+        for size in [3, DECRYPT_PARALLEL_MIN_SIZE + 1]:
+            values = np.random.uniform(-10, 10, (size, 2))
+            encrypted_values = self.paillier_encrypt.encrypt_batch(values)
+            decrypted_values = self.paillier_encrypt.decrypt_batch(encrypted_values)
+            self.assertTrue(decrypted_values.shape == values.shape)
+            self.assertTrue(np.max(np.fabs(decrypted_values - values)) < 1e-5)
+
+        encrypted_values = self.paillier_encrypt.encrypt_list([1, 2.5, -3])
+        self.assertTrue(self.paillier_encrypt.decrypt_batch(encrypted_values).tolist() == [1, 2.5, -3])
+
+    def obfuscators(self, encrypted_values):
+        n = self.paillier_encrypt.get_public_key().n
+        return [value.ciphertext(be_secure=False) % n for value in encrypted_values.ravel()]
+
+    @mock.patch.object(fate_paillier, "PAILLIER_CPU_BUDGET", 2)
+    @mock.patch.object(fate_paillier, "OBFUSCATOR_PREFETCH_MAX_SIZE", 1 << 16)
+    def test_encrypt_batch_in_pool(self):
+        # the second batch takes the obfuscators prefetched during the first one
+        obfuscators = []
+        for i in range(3):
+            values = np.random.uniform(-10, 10, ENCRYPT_PARALLEL_MIN_SIZE + 1)
+            encrypted_values = self.paillier_encrypt.encrypt_batch(values)
+            self.assertTrue(np.max(np.fabs(self.paillier_encrypt.decrypt_batch(encrypted_values) - values)) < 1e-5)
+            obfuscators.extend(self.obfuscators(encrypted_values))
+        self.assertEqual(len(set(obfuscators)), 3 * (ENCRYPT_PARALLEL_MIN_SIZE + 1))
+
+    @mock.patch.object(fate_paillier, "PAILLIER_CPU_BUDGET", 2)
+    @mock.patch.object(fate_paillier, "OBFUSCATOR_PREFETCH_MAX_SIZE", 1 << 16)
+    def test_encrypt_batch_in_child(self):
+        # a child starts a pool of its own, it does not take the obfuscators prefetched by its parent,
+        # and shuts its pool down before it exits
+        values = np.random.uniform(-10, 10, ENCRYPT_PARALLEL_MIN_SIZE + 1)
+        self.paillier_encrypt.encrypt_batch(values)
+
+        queue = multiprocessing.Queue()
+        child = multiprocessing.Process(target=lambda: queue.put(self.obfuscators(
+            self.paillier_encrypt.encrypt_batch(values))))
+        child.start()
+        child_obfuscators = queue.get(timeout=60)
+        child.join(timeout=60)
+        self.assertEqual(child.exitcode, 0)
+
+        obfuscators = self.obfuscators(self.paillier_encrypt.encrypt_batch(values))
+        self.assertFalse(set(child_obfuscators) & set(obfuscators))
+
+    @mock.patch.object(fate_paillier, "PAILLIER_CPU_BUDGET", 2)
+    @mock.patch.object(fate_paillier, "OBFUSCATOR_PREFETCH_MAX_SIZE", 1 << 16)
+    def test_obfuscator_prefetch_keys(self):
+        # only the prefetches of the last keys are kept
+        values = np.random.uniform(-10, 10, ENCRYPT_PARALLEL_MIN_SIZE + 1)
+        public_keys = []
+        for i in range(fate_paillier.OBFUSCATOR_PREFETCH_MAX_KEYS + 1):
+            paillier_encrypt = PaillierEncrypt()
+            paillier_encrypt.generate_key(1024)
+            paillier_encrypt.encrypt_batch(values)
+            public_keys.append(paillier_encrypt.get_public_key().n)
+        self.assertEqual(list(fate_paillier._obfuscator_prefetches.keys()),
+                         public_keys[-fate_paillier.OBFUSCATOR_PREFETCH_MAX_KEYS:])
+
+    @mock.patch.object(fate_paillier, "PAILLIER_CPU_BUDGET", 2)
+    def test_no_prefetch_by_default(self):
+        values = np.random.uniform(-10, 10, ENCRYPT_PARALLEL_MIN_SIZE + 1)
+        encrypted_values = self.paillier_encrypt.encrypt_batch(values)
+        self.assertTrue(np.max(np.fabs(self.paillier_encrypt.decrypt_batch(encrypted_values) - values)) < 1e-5)
+        prefetch = fate_paillier._get_obfuscator_prefetch(self.paillier_encrypt.get_public_key())
+        self.assertEqual((prefetch.ready, prefetch.pending), ([], []))
+
+    def test_encrypt_batch_in_map_values(self):
+        # each partition encrypts with its share of the cpu budget in a pool started by the eggroll worker
+        eggroll.init("test_encrypt_batch_in_map_values")
+        partitions = 2
+        values = np.random.uniform(-10, 10, ENCRYPT_PARALLEL_MIN_SIZE + 1)
+        table = eggroll.parallelize([values] * partitions, include_key=False, partition=partitions)
+        paillier_encrypt = self.paillier_encrypt
+        result = table.mapValues(lambda x: encrypt_in_worker(paillier_encrypt, x, partitions)).collect()
+
+        for _, (encrypted_values, pool_pid, pool_workers) in result:
+            self.assertTrue(np.max(np.fabs(self.paillier_encrypt.decrypt_batch(encrypted_values) - values)) < 1e-5)
+            self.assertNotEqual(pool_pid, os.getpid())
+            self.assertEqual(pool_workers, 2)
+
+    def test_decrypt_batch_with_other_key(self):
+        other_encrypt = PaillierEncrypt()
+        other_encrypt.generate_key(1024)
+        with self.assertRaises(ValueError):
+            self.paillier_encrypt.decrypt_batch([other_encrypt.encrypt(1)])
+
+
+def encrypt_in_worker(paillier_encrypt, values, partitions):
+    with mock.patch.object(fate_paillier, "PAILLIER_CPU_BUDGET", 2 * partitions):
+        encrypted_values = paillier_encrypt.encrypt_batch(values, partitions)
+    return encrypted_values, fate_paillier._executor_pid, fate_paillier._executor._max_workers
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import pickle
+import random
+import unittest
+
+import numpy as np
+from scipy import sparse
+
+from federatedml.secureprotol.encrypted_vector import EncryptedVector, EncryptedMatrix, multi_powmod, shared_exponent
+from federatedml.secureprotol.fate_paillier import PaillierKeypair
+
+
+class TestEncryptedVector(unittest.TestCase):
+    def setUp(self):
+        self.public_key, self.private_key = PaillierKeypair.generate_keypair()
+        self.x = np.random.uniform(-10, 10, 20)
+        self.y = np.append(np.random.randint(-100, 100, 10), np.random.uniform(-1, 1, 10))
+        self.vector_x = EncryptedVector.from_encrypted_numbers([self.public_key.encrypt(v) for v in self.x])
+        self.vector_y = EncryptedVector.from_encrypted_numbers([self.public_key.encrypt(v.item()) for v in self.y])
+
+    def decrypt(self, values):
+        return np.array([self.private_key.decrypt(v) for v in values])
+
+    def assertArrayAlmostEqual(self, x, y):
+        self.assertTrue(np.allclose(x, y), "{} != {}".format(x, y))
+
+    def test_arithmetic(self):
+        self.assertArrayAlmostEqual(self.decrypt(self.vector_x), self.x)
+        self.assertArrayAlmostEqual(self.decrypt(self.vector_x + self.vector_y), self.x + self.y)
+        self.assertArrayAlmostEqual(self.decrypt(self.vector_x - self.vector_y), self.x - self.y)
+        self.assertArrayAlmostEqual(self.decrypt(self.vector_x + self.y), self.x + self.y)
+        self.assertArrayAlmostEqual(self.decrypt(1.5 - self.vector_x), 1.5 - self.x)
+        self.assertArrayAlmostEqual(self.decrypt(self.vector_x + self.public_key.encrypt(2)), self.x + 2)
+        self.assertArrayAlmostEqual(self.decrypt(self.vector_x * -0.3), self.x * -0.3)
+        self.assertArrayAlmostEqual(self.decrypt(np.float64(2.5) * self.vector_x), self.x * 2.5)
+        self.assertArrayAlmostEqual(self.decrypt(self.vector_x * self.y), self.x * self.y)
+        self.assertArrayAlmostEqual(self.decrypt(self.vector_x / 4), self.x / 4)
+        self.assertAlmostEqual(self.private_key.decrypt(self.vector_y.sum()), np.sum(self.y))
+        self.assertAlmostEqual(self.private_key.decrypt(self.vector_x[3]), self.x[3])
+        self.assertArrayAlmostEqual(self.decrypt(self.vector_x[2:5]), self.x[2:5])
+
+    def test_pickle(self):
+        vector = pickle.loads(pickle.dumps(self.vector_y))
+        self.assertArrayAlmostEqual(self.decrypt(vector), self.y)
+
+        numbers_size = len(pickle.dumps(self.vector_y.to_encrypted_numbers()))
+        self.assertLess(len(pickle.dumps(self.vector_y)), numbers_size)
+
+    def test_matrix(self):
+        pairs = [(self.public_key.encrypt(g), self.public_key.encrypt(h)) for g, h in zip(self.x, self.y)]
+        matrix = EncryptedMatrix.from_encrypted_numbers(pairs)
+        self.assertEqual(matrix.shape, (20, 2))
+        self.assertEqual(len(matrix), 20)
+
+        for (g, h), (enc_g, enc_h) in zip(zip(self.x, self.y), matrix):
+            self.assertAlmostEqual(self.private_key.decrypt(enc_g), g)
+            self.assertAlmostEqual(self.private_key.decrypt(enc_h), h)
+
+        matrix = pickle.loads(pickle.dumps(matrix * 2))
+        sum_grad, sum_hess = matrix.sum(axis=0)
+        self.assertAlmostEqual(self.private_key.decrypt(sum_grad), 2 * np.sum(self.x))
+        self.assertAlmostEqual(self.private_key.decrypt(sum_hess), 2 * np.sum(self.y))
+        self.assertArrayAlmostEqual(self.decrypt(matrix.sum(axis=1)), 2 * (self.x + self.y))
+        self.assertArrayAlmostEqual(self.decrypt(matrix[-1]), [2 * self.x[-1], 2 * self.y[-1]])
+
+        self.assertTrue(EncryptedMatrix.can_hold(pairs))
+        self.assertFalse(EncryptedMatrix.can_hold([(pair[0], 0) for pair in pairs]))
+
+    def test_multi_powmod(self):
+        modulus = self.public_key.nsquare
+        for size in [3, 100]:
+            bases = [random.randrange(1, modulus) for _ in range(size)]
+            exps = [random.getrandbits(64) for _ in range(size)]
+            expect = 1
+            for base, exp in zip(bases, exps):
+                expect = expect * pow(base, exp, modulus) % modulus
+            self.assertEqual(multi_powmod(bases, exps, modulus), expect)
+
+    def test_transposed_dot(self):
+        features = np.random.uniform(-5, 5, (20, 6))
+        features[np.random.rand(20, 6) < 0.4] = 0
+        features[:, 2] = 0
+        features[3, 4] = 1e-9
+        expect = features.T.dot(self.y)
+        self.assertArrayAlmostEqual(self.decrypt(self.vector_y.transposed_dot(features)), expect)
+        self.assertArrayAlmostEqual(self.decrypt(self.vector_y.transposed_dot(sparse.csr_matrix(features))), expect)
+
+        int_features = np.random.randint(-3, 3, (20, 4))
+        self.assertArrayAlmostEqual(self.decrypt(self.vector_x.transposed_dot(int_features)), int_features.T.dot(self.x))
+
+    def test_transposed_dot_wide_range(self):
+        # each column keeps the precision of its own scale, a near zero entry does not widen the encodings
+        features = np.random.uniform(0.5, 1, (20, 4)) * np.array([1e-12, 1e-6, 1, 1e6])
+        features[0, 3] = 1e-12
+        result = self.vector_y.transposed_dot(features)
+        error = np.abs(self.decrypt(result) - features.T.dot(self.y))
+        self.assertTrue(np.all(error <= 1e-9 * np.abs(features).T.dot(np.abs(self.y))), error)
+
+        exponent = np.max(self.vector_y.exponents)
+        self.assertEqual(result.exponents[3], exponent + shared_exponent(features[1:, 3], self.public_key.max_int))
+        self.assertEqual(shared_exponent(np.array([1e6, 1e-12]), self.public_key.max_int),
+                         shared_exponent(np.array([1e6]), self.public_key.max_int))
+
+
+if __name__ == '__main__':
+    unittest.main()
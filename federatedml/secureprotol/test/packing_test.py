@@ -0,0 +1,62 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import numpy as np
+import unittest
+from federatedml.secureprotol.fate_paillier import PaillierKeypair
+from federatedml.secureprotol.packing import FixedPointPacker
+
+
+class TestFixedPointPacker(unittest.TestCase):
+    def setUp(self):
+        self.public_key, self.private_key = PaillierKeypair.generate_keypair()
+        self.packer = FixedPointPacker.from_public_key(self.public_key, slot_num=2)
+
+    def test_pack_and_unpack(self):
+        for g, h in [(0.5, 0.25), (-0.75, 0.1), (-1e-8, -3), (0, 0), (123456.789, -0.001)]:
+            res_g, res_h = self.packer.unpack(self.packer.pack((g, h)))
+            self.assertAlmostEqual(res_g, g)
+            self.assertAlmostEqual(res_h, h)
+
+    def test_sum_of_packed(self):
+        grad = np.random.uniform(-1, 1, 100)
+        hess = np.random.uniform(0, 0.25, 100)
+        packed_sum = sum(self.packer.pack((g, h)) for g, h in zip(grad, hess))
+        packed_sum -= self.packer.pack((grad[0], hess[0])) * 2
+
+        sum_grad, sum_hess = self.packer.unpack(packed_sum)
+        self.assertAlmostEqual(sum_grad, np.sum(grad) - 2 * grad[0])
+        self.assertAlmostEqual(sum_hess, np.sum(hess) - 2 * hess[0])
+
+    def test_encrypted_sum_of_packed(self):
+        values = np.random.uniform(-10, 10, (20, 3))
+        packer = FixedPointPacker.from_public_key(self.public_key, slot_num=3)
+        encrypted_sum = 0
+        for row in values:
+            encrypted_sum = encrypted_sum + self.public_key.encrypt(packer.pack(row))
+
+        sums = packer.unpack(self.private_key.decrypt(encrypted_sum))
+        for i in range(3):
+            self.assertAlmostEqual(sums[i], np.sum(values[:, i]))
+
+    def test_overflow(self):
+        packer = FixedPointPacker(slot_num=2, slot_bits=80, precision_bits=64)
+        with self.assertRaises(OverflowError):
+            packer.pack((2 ** 16, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
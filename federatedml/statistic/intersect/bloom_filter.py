@@ -0,0 +1,111 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import hashlib
+import math
+import numpy as np
+from arch.api import eggroll
+from federatedml.util import consts
+
+
+class BloomFilter(object):
+    """
+    Partitioned bloom filter: the bit array is split into hash_num slices of slice_bits bits,
+    and the i-th hash function of a key sets one bit in the i-th slice.
+
+    Parameters
+    ----------
+    slice_bits: int, bits of each slice
+
+    hash_num: int, number of hash functions, which is also the number of slices
+    """
+
+    def __init__(self, slice_bits, hash_num, bits=None):
+        self.slice_bits = slice_bits
+        self.hash_num = hash_num
+        if bits is None:
+            bits = np.zeros((slice_bits * hash_num + 7) // 8, dtype=np.uint8)
+        self.bits = bits
+
+    @classmethod
+    def with_capacity(cls, capacity, fpr=0.01):
+        """
+        return BloomFilter: empty filter holding capacity keys with false positive rate about fpr
+        """
+        hash_num = max(1, int(math.ceil(-math.log(fpr, 2))))
+        bit_num = int(math.ceil(-max(capacity, 1) * math.log(fpr) / (math.log(2) ** 2)))
+        slice_bits = max(8, (bit_num + hash_num - 1) // hash_num)
+        return cls(slice_bits, hash_num)
+
+    def empty_copy(self):
+        return BloomFilter(self.slice_bits, self.hash_num)
+
+    def positions(self, key):
+        """
+        return list: bit positions of key, one in each slice, by double hashing a sha256 digest
+        """
+        digest = hashlib.sha256(bytes(str(key), encoding='utf-8')).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:16], 'little') | 1
+        return [i * self.slice_bits + (h1 + i * h2) % self.slice_bits for i in range(self.hash_num)]
+
+    def add(self, key):
+        for pos in self.positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key):
+        for pos in self.positions(key):
+            if not self.bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def merge(self, other):
+        if self.slice_bits != other.slice_bits or self.hash_num != other.hash_num:
+            raise ValueError("can not merge bloom filters of different shapes")
+        np.bitwise_or(self.bits, other.bits, out=self.bits)
+        return self
+
+    @staticmethod
+    def build(data_sid, fpr=0.01):
+        """
+        return BloomFilter: filter of the keys of DTable data_sid, built partition by partition and merged
+        """
+        empty_filter = BloomFilter.with_capacity(data_sid.count(), fpr)
+
+        def build_partition(kv_iterator):
+            bloom_filter = empty_filter.empty_copy()
+            for k, _ in kv_iterator:
+                bloom_filter.add(k)
+            return bloom_filter
+
+        bloom_filter = data_sid.mapPartitions(build_partition).reduce(lambda a, b: a.merge(b))
+        return bloom_filter if bloom_filter is not None else empty_filter
+
+    def to_table(self, partition=1, chunk_size=consts.BLOOM_FILTER_CHUNK_SIZE):
+        """
+        return DTable: table(chunk_idx, bytes chunk) and ("shape", (slice_bits, hash_num)), to be sent by federation
+        """
+        chunks = [("shape", (self.slice_bits, self.hash_num))]
+        for chunk_idx, start in enumerate(range(0, self.bits.shape[0], chunk_size)):
+            chunks.append((chunk_idx, self.bits[start: start + chunk_size]))
+        return eggroll.parallelize(chunks, include_key=True, partition=partition)
+
+    @staticmethod
+    def from_table(table):
+        chunks = dict(table.collect())
+        slice_bits, hash_num = chunks.pop("shape")
+        bits = np.concatenate([chunks[chunk_idx] for chunk_idx in range(len(chunks))]) if chunks else None
+        return BloomFilter(slice_bits, hash_num, bits)
@@ -17,6 +17,7 @@
 from arch.api.federation import remote, get
 from arch.api.utils import log_utils
 from federatedml.secureprotol.encode import Encode
+from federatedml.statistic.intersect.bloom_filter import BloomFilter
 from federatedml.util import consts
 from federatedml.util import IntersectParamChecker
 from federatedml.util.transfer_variable import RawIntersectTransferVariable
@@ -44,7 +45,7 @@ class Intersect(object):
         return self.schema
 
     def _get_value_from_data(self, intersect_ids, data_instances):
-        intersect_ids = intersect_ids.join(data_instances, lambda i, d: d)
+        intersect_ids = data_instances.filterByKeys(intersect_ids)
         LOGGER.info("get intersect data_instances!")
         intersect_ids.schema['header'] = data_instances.schema.get("header")
         return intersect_ids
@@ -63,8 +64,30 @@ class RawIntersect(Intersect):
         self.with_encode = intersect_params.with_encode
         self.transfer_variable = RawIntersectTransferVariable()
         self.encode_params = intersect_params.encode_params
-
-    def intersect_send_id(self, data_instances):
+        self.transfer_mode = intersect_params.transfer_mode
+        self.bloom_filter_fpr = intersect_params.bloom_filter_fpr
+
+    def use_bloom_filter(self):
+        """
+        The role sending ids learns the intersection in the bloom filter mode, so it is only used if
+        is_send_intersect_ids allows that role to get the intersection, otherwise ids are sent as a table
+        """
+        if self.transfer_mode != consts.BLOOM_FILTER:
+            return False
+
+        if not self.send_intersect_id_flag:
+            LOGGER.warning("Transfer mode bloom_filter lets role-send know the intersection, "
+                           "use transfer mode table as is_send_intersect_ids is False")
+            return False
+
+        return True
+
+    def encode_ids(self, data_instances):
+        """
+        return data_sid, the ids to intersect with value 1, and sid_encode_pair, the (encoded id, id) pairs
+        or None if ids are not encoded. Ids are always encoded in the bloom filter mode, by sha256 if with_encode
+        is not set, because ids of role-join passing the filter by false positive are sent to role-send
+        """
         sid_encode_pair = None
         if self.with_encode and self.encode_params.encode_method != "none":
             if Encode.is_support(self.encode_params.encode_method):
@@ -74,9 +97,21 @@ class RawIntersect(Intersect):
                 data_sid = sid_encode_pair.mapValues(lambda v: 1)
             else:
                 raise ValueError("Unknown encode_method, please check the configure of encode_param")
+        elif self.use_bloom_filter():
+            encode_operator = Encode("sha256")
+            sid_encode_pair = data_instances.map(lambda k, v: (encode_operator.compute(k), k))
+            data_sid = sid_encode_pair.mapValues(lambda v: 1)
         else:
             data_sid = data_instances.mapValues(lambda v: 1)
 
+        return data_sid, sid_encode_pair
+
+    def intersect_send_id(self, data_instances):
+        data_sid, sid_encode_pair = self.encode_ids(data_instances)
+
+        if self.use_bloom_filter():
+            return self.bloom_filter_send_id(data_instances, data_sid, sid_encode_pair)
+
         LOGGER.info("Send id role is {}".format(self.role))
 
         if self.role == consts.GUEST:
@@ -115,7 +150,7 @@ class RawIntersect(Intersect):
                                      idx=0)
 
             if sid_encode_pair:
-                encode_intersect_ids = recv_intersect_ids.join(sid_encode_pair, lambda r, s: s)
+                encode_intersect_ids = sid_encode_pair.filterByKeys(recv_intersect_ids)
                 intersect_ids = encode_intersect_ids.map(lambda k, v: (v, 'intersect_id'))
             else:
                 intersect_ids = recv_intersect_ids
@@ -132,17 +167,10 @@ class RawIntersect(Intersect):
     def intersect_join_id(self, data_instances):
         LOGGER.info("Join id role is {}".format(self.role))
 
-        sid_encode_pair = None
-        if self.with_encode and self.encode_params.encode_method != "none":
-            if Encode.is_support(self.encode_params.encode_method):
-                encode_operator = Encode(self.encode_params.encode_method, self.encode_params.base64)
-                sid_encode_pair = data_instances.map(
-                    lambda k, v: (encode_operator.compute(k, postfit_salt=self.encode_params.salt), k))
-                data_sid = sid_encode_pair.mapValues(lambda v: 1)
-            else:
-                raise ValueError("Unknown encode_method, please check the configure of encode_param")
-        else:
-            data_sid = data_instances.mapValues(lambda v: 1)
+        data_sid, sid_encode_pair = self.encode_ids(data_instances)
+
+        if self.use_bloom_filter():
+            return self.bloom_filter_join_id(data_instances, data_sid, sid_encode_pair)
 
         if self.role == consts.HOST:
             send_ids_name = self.transfer_variable.send_ids_guest.name
@@ -183,7 +211,7 @@ class RawIntersect(Intersect):
             LOGGER.info("Remote intersect ids to role-send")
 
         if sid_encode_pair:
-            encode_intersect_ids = send_intersect_ids.join(sid_encode_pair, lambda r, s: s)
+            encode_intersect_ids = sid_encode_pair.filterByKeys(send_intersect_ids)
             intersect_ids = encode_intersect_ids.map(lambda k, v: (v, 'intersect_id'))
         else:
             intersect_ids = send_intersect_ids
@@ -192,3 +220,90 @@ class RawIntersect(Intersect):
             intersect_ids = self._get_value_from_data(intersect_ids, data_instances)
 
         return intersect_ids
+
+    def bloom_filter_send_id(self, data_instances, data_sid, sid_encode_pair):
+        LOGGER.info("Send bloom filter of ids, role is {}".format(self.role))
+
+        if self.role == consts.GUEST:
+            send_filter = self.transfer_variable.send_filter_guest
+            candidate_ids = self.transfer_variable.candidate_ids_host
+            intersect_ids = self.transfer_variable.intersect_ids_guest
+            recv_role = consts.HOST
+        elif self.role == consts.HOST:
+            send_filter = self.transfer_variable.send_filter_host
+            candidate_ids = self.transfer_variable.candidate_ids_guest
+            intersect_ids = self.transfer_variable.intersect_ids_host
+            recv_role = consts.GUEST
+        else:
+            raise ValueError("Unknown intersect role, please check the code")
+
+        bloom_filter = BloomFilter.build(data_sid, self.bloom_filter_fpr)
+        remote(bloom_filter.to_table(partition=data_sid._partitions),
+               name=send_filter.name,
+               tag=self.transfer_variable.generate_transferid(send_filter),
+               role=recv_role,
+               idx=0)
+        LOGGER.info("Remote bloom filter to role-join, slice_bits is {}, hash_num is {}".format(bloom_filter.slice_bits,
+                                                                                                bloom_filter.hash_num))
+
+        recv_candidate_ids = get(name=candidate_ids.name,
+                                 tag=self.transfer_variable.generate_transferid(candidate_ids),
+                                 idx=0)
+        LOGGER.info("Get candidate ids from role-join")
+
+        send_intersect_ids = recv_candidate_ids.join(data_sid, lambda c, d: "intersect_id")
+        remote(send_intersect_ids,
+               name=intersect_ids.name,
+               tag=self.transfer_variable.generate_transferid(intersect_ids),
+               role=recv_role,
+               idx=0)
+        LOGGER.info("Remote intersect ids to role-join")
+
+        return self._get_intersect_ids(send_intersect_ids, data_instances, sid_encode_pair)
+
+    def bloom_filter_join_id(self, data_instances, data_sid, sid_encode_pair):
+        LOGGER.info("Probe bloom filter of ids, role is {}".format(self.role))
+
+        if self.role == consts.HOST:
+            send_filter = self.transfer_variable.send_filter_guest
+            candidate_ids = self.transfer_variable.candidate_ids_host
+            intersect_ids = self.transfer_variable.intersect_ids_guest
+            recv_role = consts.GUEST
+        elif self.role == consts.GUEST:
+            send_filter = self.transfer_variable.send_filter_host
+            candidate_ids = self.transfer_variable.candidate_ids_guest
+            intersect_ids = self.transfer_variable.intersect_ids_host
+            recv_role = consts.HOST
+        else:
+            raise ValueError("Unknown intersect role, please check the code")
+
+        bloom_filter = BloomFilter.from_table(get(name=send_filter.name,
+                                                  tag=self.transfer_variable.generate_transferid(send_filter),
+                                                  idx=0))
+        LOGGER.info("Get bloom filter from role-send")
+
+        # encoded ids, the false positives among them are not in the intersection but reach role-send
+        send_candidate_ids = data_sid.filter(lambda k, v: k in bloom_filter)
+        remote(send_candidate_ids,
+               name=candidate_ids.name,
+               tag=self.transfer_variable.generate_transferid(candidate_ids),
+               role=recv_role,
+               idx=0)
+        LOGGER.info("Remote candidate ids to role-send")
+
+        recv_intersect_ids = get(name=intersect_ids.name,
+                                 tag=self.transfer_variable.generate_transferid(intersect_ids),
+                                 idx=0)
+        LOGGER.info("Get intersect ids from role-send")
+
+        return self._get_intersect_ids(recv_intersect_ids, data_instances, sid_encode_pair)
+
+    def _get_intersect_ids(self, intersect_ids, data_instances, sid_encode_pair):
+        if sid_encode_pair:
+            encode_intersect_ids = sid_encode_pair.filterByKeys(intersect_ids)
+            intersect_ids = encode_intersect_ids.map(lambda k, v: (v, 'intersect_id'))
+
+        if not self.only_output_key:
+            intersect_ids = self._get_value_from_data(intersect_ids, data_instances)
+
+        return intersect_ids
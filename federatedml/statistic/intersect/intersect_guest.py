@@ -115,7 +115,7 @@ class RsaIntersectionGuest(RsaIntersect):
             lambda k, v: (v, k))
 
         # intersect table(hash(guest_ids_process/r), sid)
-        table_encrypt_intersect_ids = table_guest_ids_process_final_sid.join(table_host_ids_process, lambda sid, h: sid)
+        table_encrypt_intersect_ids = table_guest_ids_process_final_sid.filterByKeys(table_host_ids_process)
 
         # intersect table(hash(guest_ids_process/r), 1)
         table_send_intersect_ids = table_encrypt_intersect_ids.mapValues(lambda v: 1)
@@ -16,11 +16,13 @@
 
 import hashlib
 from arch.api.federation import remote, get
+from arch.api.model_manager import manager
+from arch.api.proto.rsa_intersect_key_pb2 import RsaIntersectKey
 from arch.api.utils import log_utils
-from federatedml.secureprotol import gmpy_math
 from federatedml.secureprotol.encrypt import RsaEncrypt
 from federatedml.statistic.intersect import RawIntersect
 from federatedml.statistic.intersect import RsaIntersect
+from federatedml.statistic.intersect.rsa_sign_cache import RsaSignCache
 from federatedml.util import consts
 from federatedml.util.transfer_variable import RsaIntersectTransferVariable
 
@@ -32,23 +34,63 @@ class RsaIntersectionHost(RsaIntersect):
         super().__init__(intersect_params)
 
         self.get_intersect_ids_flag = intersect_params.is_get_intersect_ids
+        self.sign_cache_name = intersect_params.sign_cache_name
         self.transfer_variable = RsaIntersectTransferVariable()
 
         self.e = None
         self.d = None
         self.n = None
+        self.rsa_bit = 1024
+        self.encrypt_operator = None
 
     @staticmethod
     def hash(value):
         return hashlib.sha256(bytes(str(value), encoding='utf-8')).hexdigest()
 
+    def save_model(self, model_table, model_namespace):
+        """
+        save the rsa key to the model table, so that a later intersection with sign_cache_name reuses it
+        """
+        LOGGER.info("save rsa key")
+        encrypt_operator = self.encrypt_operator
+        rsa_key = RsaIntersectKey(e=str(encrypt_operator.e), d=str(encrypt_operator.d), n=str(encrypt_operator.n),
+                                  p=str(encrypt_operator.p), q=str(encrypt_operator.q), rsa_bit=self.rsa_bit)
+        buffer_type = "RsaIntersectionHost.key"
+        manager.save_model(buffer_type=buffer_type,
+                           proto_buffer=rsa_key,
+                           name=model_table,
+                           namespace=model_namespace)
+
+        return buffer_type
+
+    def load_model(self, model_table, model_namespace):
+        """
+        load the rsa key saved by save_model, a new key is generated by run if it is missing
+        """
+        rsa_key = RsaIntersectKey()
+        if manager.read_model(buffer_type="RsaIntersectionHost.key",
+                              proto_buffer=rsa_key,
+                              name=model_table,
+                              namespace=model_namespace) != 0 or rsa_key.rsa_bit != self.rsa_bit:
+            LOGGER.info("No rsa key of {} bits in model table".format(self.rsa_bit))
+            return
+
+        LOGGER.info("load rsa key")
+        encrypt_operator = RsaEncrypt()
+        encrypt_operator.set_public_key({"e": int(rsa_key.e), "n": int(rsa_key.n)})
+        encrypt_operator.set_privacy_key({"d": int(rsa_key.d), "n": int(rsa_key.n),
+                                          "p": int(rsa_key.p), "q": int(rsa_key.q)})
+        self.encrypt_operator = encrypt_operator
+
     def run(self, data_instances):
         LOGGER.info("Start rsa intersection")
 
-        encrypt_operator = RsaEncrypt()
-        encrypt_operator.generate_key(rsa_bit=1024)
+        if self.encrypt_operator is None:
+            self.encrypt_operator = RsaEncrypt()
+            self.encrypt_operator.generate_key(rsa_bit=self.rsa_bit)
+            LOGGER.info("Generate rsa keys.")
+        encrypt_operator = self.encrypt_operator
         self.e, self.d, self.n = encrypt_operator.get_key_pair()
-        LOGGER.info("Generate rsa keys.")
         public_key = {"e": self.e, "n": self.n}
         remote(public_key,
                name=self.transfer_variable.rsa_pubkey.name,
@@ -58,10 +100,13 @@ class RsaIntersectionHost(RsaIntersect):
         LOGGER.info("Remote public key to Guest.")
 
         # (host_id_process, 1)
-        host_ids_process_pair = data_instances.map(
-            lambda k, v: (
-                RsaIntersectionHost.hash(gmpy_math.powmod(int(RsaIntersectionHost.hash(k), 16), self.d, self.n)), k)
-        )
+        sign_func = lambda k: RsaIntersectionHost.hash(encrypt_operator.decrypt(int(RsaIntersectionHost.hash(k), 16)))
+        if self.sign_cache_name is not None:
+            sign_cache = RsaSignCache(self.sign_cache_name)
+            host_ids_process_pair = sign_cache.get_signed_ids(data_instances, public_key, sign_func).map(
+                lambda k, v: (v, k))
+        else:
+            host_ids_process_pair = data_instances.map(lambda k, v: (sign_func(k), k))
 
         host_ids_process = host_ids_process_pair.mapValues(lambda v: 1)
         remote(host_ids_process,
@@ -78,7 +123,7 @@ class RsaIntersectionHost(RsaIntersect):
         LOGGER.info("Get guest_ids from guest")
 
         # Process guest ids and return to guest
-        guest_ids_process = guest_ids.map(lambda k, v: (k, gmpy_math.powmod(int(k), self.d, self.n)))
+        guest_ids_process = guest_ids.map(lambda k, v: (k, encrypt_operator.decrypt(int(k))))
         remote(guest_ids_process,
                name=self.transfer_variable.intersect_guest_ids_process.name,
                tag=self.transfer_variable.generate_transferid(self.transfer_variable.intersect_guest_ids_process),
@@ -94,7 +139,7 @@ class RsaIntersectionHost(RsaIntersect):
                                             self.transfer_variable.intersect_ids),
                                         idx=0)
 
-            intersect_ids_pair = encrypt_intersect_ids.join(host_ids_process_pair, lambda e, h: h)
+            intersect_ids_pair = host_ids_process_pair.filterByKeys(encrypt_intersect_ids)
             intersect_ids = intersect_ids_pair.map(lambda k, v: (v, "intersect_id"))
             LOGGER.info("Get intersect ids from Guest")
 
@@ -0,0 +1,137 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import hashlib
+from arch.api import eggroll
+from arch.api.utils import log_utils
+from federatedml.util import consts
+
+LOGGER = log_utils.getLogger()
+
+FINGERPRINT_MOD = 1 << 256
+
+
+class RsaSignCache(object):
+    """
+    Persistent cache of the host's signed ids, shared by rsa intersections of the same cache name.
+
+    Eggroll tables are kept in namespace consts.RSA_SIGN_CACHE_NAMESPACE:
+        {cache_name}_meta: key id, fingerprint of the id set signed last time and the name of its sign table
+        {cache_name}_{key_id}_{fingerprint}: table(id, hash(sign(hash(id)))) under that key
+    The key id is a hash of the public key only, the private key is not kept here but in the model
+    table by RsaIntersectionHost. An unchanged id set reuses the signatures as they are, otherwise a
+    new sign table is built of the kept signatures and the signatures of the added ids.
+    """
+
+    def __init__(self, cache_name):
+        self.cache_name = cache_name
+        self.meta_table = eggroll.table(self.cache_name + "_meta", consts.RSA_SIGN_CACHE_NAMESPACE,
+                                        partition=1, persistent=True)
+
+    @staticmethod
+    def hash(value):
+        return hashlib.sha256(bytes(str(value), encoding='utf-8')).hexdigest()
+
+    @staticmethod
+    def fingerprint(data_instances):
+        """
+        return str: order independent fingerprint of the keys of data_instances
+        """
+        def partition_fingerprint(kv_iterator):
+            count = 0
+            digest_sum = 0
+            for k, _ in kv_iterator:
+                count += 1
+                digest_sum += int(RsaSignCache.hash(k), 16)
+            return count, digest_sum % FINGERPRINT_MOD
+
+        result = data_instances.mapPartitions(partition_fingerprint).reduce(
+            lambda a, b: (a[0] + b[0], (a[1] + b[1]) % FINGERPRINT_MOD))
+        if result is None:
+            result = (0, 0)
+
+        return "{}_{:064x}".format(*result)
+
+    @staticmethod
+    def key_id(public_key):
+        return RsaSignCache.hash("{}_{}".format(public_key["e"], public_key["n"]))[:16]
+
+    def _load_sign_table(self, key_id, partitions):
+        """
+        return (DTable, str): sign table of the last run under key_id and its id fingerprint, (None, None) if missing
+        """
+        meta = self.meta_table.get("sign_table")
+        if meta is None:
+            return None, None
+
+        last_key_id, last_fingerprint, table_name = meta
+        sign_table = eggroll.table(table_name, consts.RSA_SIGN_CACHE_NAMESPACE, partition=partitions,
+                                   persistent=True)
+        if last_key_id != key_id or sign_table._partitions != partitions:
+            LOGGER.info("Key or partitions of sign cache {} changed, drop it".format(self.cache_name))
+            self.meta_table.delete("sign_table")
+            sign_table.destroy()
+            return None, None
+
+        # a missing sign table is opened empty, it is rebuilt instead of taken as the signatures of no id
+        if sign_table.count() != int(last_fingerprint.split("_")[0]):
+            LOGGER.warning("Sign table of sign cache {} is missing or incomplete, drop it".format(self.cache_name))
+            self.meta_table.delete("sign_table")
+            sign_table.destroy()
+            return None, None
+
+        return sign_table, last_fingerprint
+
+    def get_signed_ids(self, data_instances, public_key, sign_func):
+        """
+        Parameters
+        ----------
+        data_instances: DTable, host ids to sign
+
+        public_key: dict, {"e": e, "n": n} of the key signing the ids
+
+        sign_func: function, id -> hash(sign(hash(id)))
+
+        Returns
+        -------
+        DTable, table(id, hash(sign(hash(id)))) of ids in data_instances
+        """
+        partitions = data_instances._partitions
+        fingerprint = self.fingerprint(data_instances)
+        key_id = self.key_id(public_key)
+        sign_table, last_fingerprint = self._load_sign_table(key_id, partitions)
+
+        if sign_table is not None and last_fingerprint == fingerprint:
+            LOGGER.info("Host ids unchanged, reuse sign cache {}".format(self.cache_name))
+            return sign_table
+
+        if sign_table is not None:
+            # signatures of removed ids are left out by the join
+            kept_ids = sign_table.join(data_instances, lambda sign, v: sign)
+            signed_added_ids = data_instances.subtractByKey(sign_table).map(lambda k, v: (k, sign_func(k)))
+            signed_ids = kept_ids.union(signed_added_ids)
+            LOGGER.info("Update sign cache {}".format(self.cache_name))
+        else:
+            signed_ids = data_instances.map(lambda k, v: (k, sign_func(k)))
+            LOGGER.info("Build sign cache {}".format(self.cache_name))
+
+        table_name = "{}_{}_{}".format(self.cache_name, key_id, fingerprint)
+        new_sign_table = signed_ids.save_as(table_name, consts.RSA_SIGN_CACHE_NAMESPACE, partition=partitions)
+        self.meta_table.put("sign_table", (key_id, fingerprint, table_name))
+        if sign_table is not None:
+            sign_table.destroy()
+
+        return new_sign_table
@@ -0,0 +1,37 @@
+import unittest
+
+from arch.api import eggroll
+
+eggroll.init("test_bloom_filter")
+
+from federatedml.statistic.intersect.bloom_filter import BloomFilter
+
+
+class TestBloomFilter(unittest.TestCase):
+    def setUp(self):
+        self.ids = ["id" + str(i) for i in range(2000)]
+        self.table = eggroll.parallelize([(i, 1) for i in self.ids], include_key=True, partition=4)
+
+    def test_no_false_negative(self):
+        bloom_filter = BloomFilter.build(self.table, fpr=0.01)
+        for i in self.ids:
+            self.assertTrue(i in bloom_filter)
+
+    def test_false_positive_rate(self):
+        bloom_filter = BloomFilter.build(self.table, fpr=0.01)
+        false_positive = sum(1 for i in range(10000) if ("other" + str(i)) in bloom_filter)
+        self.assertTrue(false_positive < 300)
+
+    def test_table_round_trip(self):
+        bloom_filter = BloomFilter.build(self.table, fpr=0.001)
+        recv_filter = BloomFilter.from_table(bloom_filter.to_table(partition=2, chunk_size=100))
+        self.assertEqual(recv_filter.slice_bits, bloom_filter.slice_bits)
+        self.assertEqual(recv_filter.hash_num, bloom_filter.hash_num)
+        self.assertTrue((recv_filter.bits == bloom_filter.bits).all())
+
+        candidates = self.table.filter(lambda k, v: k in recv_filter)
+        self.assertEqual(candidates.count(), len(self.ids))
+
+
+if __name__ == '__main__':
+    unittest.main()
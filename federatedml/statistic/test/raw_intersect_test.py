@@ -0,0 +1,135 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import hashlib
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from arch.api import eggroll
+from arch.api import federation
+from federatedml.param.param import EncodeParam
+from federatedml.param.param import IntersectParam
+from federatedml.statistic.intersect import RawIntersectionGuest
+from federatedml.statistic.intersect import RawIntersectionHost
+from federatedml.statistic.intersect import intersect
+from federatedml.util import consts
+
+GUEST_IDS = ["id" + str(i) for i in range(100)]
+HOST_IDS = ["id" + str(i) for i in range(50, 200)]
+
+
+def run_intersect(role, job_id, param_kwargs, result_path):
+    """
+    run raw intersection as role, in a process of its own like a party does, and pickle the result to result_path
+    """
+    eggroll.init(job_id)
+    federation.init(job_id, {"local": {"role": role, "party_id": 10000 if role == consts.GUEST else 9999},
+                             "role": {"guest": [10000], "host": [9999]}})
+
+    # record the candidate ids received by role-send
+    candidate_ids = []
+    federation_get = intersect.get
+
+    def get(name, tag, idx=-1):
+        obj = federation_get(name=name, tag=tag, idx=idx)
+        if "candidate_ids" in name:
+            candidate_ids.extend(k for k, _ in obj.collect())
+        return obj
+
+    intersect.get = get
+
+    ids = GUEST_IDS if role == consts.GUEST else HOST_IDS
+    data = eggroll.parallelize([(i, 1) for i in ids], include_key=True, partition=4)
+    param_kwargs = json.loads(param_kwargs)
+    if "encode_params" in param_kwargs:
+        param_kwargs["encode_params"] = EncodeParam(**param_kwargs["encode_params"])
+    param = IntersectParam(only_output_key=True, **param_kwargs)
+    if role == consts.GUEST:
+        intersect_ids = RawIntersectionGuest(param).run(data)
+    else:
+        intersect_ids = RawIntersectionHost(param).run(data)
+
+    result = None if intersect_ids is None else sorted(k for k, _ in intersect_ids.collect())
+    with open(result_path, "wb") as fout:
+        pickle.dump((result, candidate_ids), fout)
+
+
+class TestRawIntersect(unittest.TestCase):
+    def setUp(self):
+        self.intersect_ids = sorted(set(GUEST_IDS) & set(HOST_IDS))
+
+    def run_parties(self, **param_kwargs):
+        # host sends ids, guest is role-join
+        job_id = "test_raw_intersect_{}".format(time.time())
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        results = {}
+        with tempfile.TemporaryDirectory() as result_dir:
+            parties = {}
+            for role in [consts.GUEST, consts.HOST]:
+                command = "from federatedml.statistic.test.raw_intersect_test import run_intersect; " \
+                          "run_intersect(*{})".format(repr((role, job_id, json.dumps(param_kwargs),
+                                                            os.path.join(result_dir, role))))
+                parties[role] = subprocess.Popen([sys.executable, "-c", command], env=env)
+            for role, party in parties.items():
+                self.assertEqual(party.wait(timeout=120), 0)
+                with open(os.path.join(result_dir, role), "rb") as fin:
+                    results[role] = pickle.load(fin)
+        return results
+
+    def test_table(self):
+        results = self.run_parties(transfer_mode=consts.TABLE)
+        self.assertEqual(results[consts.GUEST][0], self.intersect_ids)
+        self.assertEqual(results[consts.HOST][0], self.intersect_ids)
+
+        results = self.run_parties(transfer_mode=consts.TABLE, is_send_intersect_ids=False)
+        self.assertEqual(results[consts.GUEST][0], self.intersect_ids)
+        self.assertIsNone(results[consts.HOST][0])
+
+    def test_bloom_filter(self):
+        results = self.run_parties(transfer_mode=consts.BLOOM_FILTER, bloom_filter_fpr=0.5)
+        self.assertEqual(results[consts.GUEST][0], self.intersect_ids)
+        self.assertEqual(results[consts.HOST][0], self.intersect_ids)
+
+        # candidates are sha256 of ids of guest, the false positives among them are not sent in plaintext
+        candidate_ids = results[consts.HOST][1]
+        encoded_guest_ids = dict((hashlib.sha256(bytes(i, encoding="utf-8")).hexdigest(), i) for i in GUEST_IDS)
+        self.assertTrue(set(candidate_ids) <= set(encoded_guest_ids))
+        self.assertTrue(len(candidate_ids) > len(self.intersect_ids))
+        self.assertEqual(sorted(encoded_guest_ids[i] for i in candidate_ids if encoded_guest_ids[i] in HOST_IDS),
+                         self.intersect_ids)
+
+    def test_bloom_filter_with_encode(self):
+        results = self.run_parties(transfer_mode=consts.BLOOM_FILTER, with_encode=True,
+                                   encode_params={"salt": "12345", "encode_method": "sha256"})
+        self.assertEqual(results[consts.GUEST][0], self.intersect_ids)
+        self.assertEqual(results[consts.HOST][0], self.intersect_ids)
+
+    def test_bloom_filter_not_send_intersect_ids(self):
+        # role-send may not know the intersection, the ids are sent as a table instead
+        results = self.run_parties(transfer_mode=consts.BLOOM_FILTER, is_send_intersect_ids=False)
+        self.assertEqual(results[consts.GUEST][0], self.intersect_ids)
+        self.assertIsNone(results[consts.HOST][0])
+        self.assertEqual(results[consts.HOST][1], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
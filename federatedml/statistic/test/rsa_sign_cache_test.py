@@ -0,0 +1,105 @@
+import time
+import unittest
+
+from arch.api import eggroll
+
+eggroll.init("test_rsa_sign_cache")
+
+from federatedml.param.param import IntersectParam
+from federatedml.secureprotol.encrypt import RsaEncrypt
+from federatedml.statistic.intersect.intersect_host import RsaIntersectionHost
+from federatedml.statistic.intersect.rsa_sign_cache import RsaSignCache
+from federatedml.util import consts
+
+
+class TestRsaSignCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_name = "test_rsa_sign_cache_{}".format(time.time())
+        self.public_key = {"e": 65537, "n": 1234567}
+
+    def tearDown(self):
+        # the meta table and the sign tables of the cache
+        eggroll.cleanup(self.cache_name + "_*", consts.RSA_SIGN_CACHE_NAMESPACE, persistent=True)
+
+    def get_signed_ids(self, ids, public_key, prefix):
+        data = eggroll.parallelize([(i, 1) for i in ids], include_key=True, partition=4)
+        sign_cache = RsaSignCache(self.cache_name)
+        return dict(sign_cache.get_signed_ids(data, public_key, lambda k: prefix + k).collect())
+
+    def cache_tables(self):
+        meta_table = eggroll.table(self.cache_name + "_meta", consts.RSA_SIGN_CACHE_NAMESPACE, partition=1)
+        meta = dict(meta_table.collect())
+        sign_table = eggroll.table(meta["sign_table"][2], consts.RSA_SIGN_CACHE_NAMESPACE, partition=4)
+        return meta, dict(sign_table.collect())
+
+    def test_cache_hit(self):
+        ids = ["id" + str(i) for i in range(100)]
+        self.assertEqual(self.get_signed_ids(ids, self.public_key, "v1_"), dict((i, "v1_" + i) for i in ids))
+        # signatures of an unchanged id set are not computed again
+        self.assertEqual(self.get_signed_ids(ids, self.public_key, "v2_"), dict((i, "v1_" + i) for i in ids))
+
+    def test_added_and_removed_ids(self):
+        ids = ["id" + str(i) for i in range(100)]
+        self.get_signed_ids(ids, self.public_key, "v1_")
+        _, last_sign_table = self.cache_tables()
+
+        new_ids = ["id" + str(i) for i in range(50, 150)]
+        expect = dict((i, ("v1_" if i in ids else "v2_") + i) for i in new_ids)
+        self.assertEqual(self.get_signed_ids(new_ids, self.public_key, "v2_"), expect)
+
+        meta, sign_table = self.cache_tables()
+        self.assertEqual(sign_table, expect)
+        self.assertEqual(len(meta), 1)
+
+        self.assertEqual(self.get_signed_ids(new_ids, self.public_key, "v3_"), expect)
+
+    def test_key_change(self):
+        ids = ["id" + str(i) for i in range(100)]
+        self.get_signed_ids(ids, self.public_key, "v1_")
+
+        # all ids are signed again under a new key
+        new_public_key = {"e": 65537, "n": 7654321}
+        self.assertEqual(self.get_signed_ids(ids, new_public_key, "v2_"), dict((i, "v2_" + i) for i in ids))
+        self.assertEqual(self.get_signed_ids(ids, self.public_key, "v3_"), dict((i, "v3_" + i) for i in ids))
+
+    def test_missing_sign_table(self):
+        ids = ["id" + str(i) for i in range(100)]
+        self.get_signed_ids(ids, self.public_key, "v1_")
+        meta, _ = self.cache_tables()
+        eggroll.cleanup(meta["sign_table"][2], consts.RSA_SIGN_CACHE_NAMESPACE, persistent=True)
+
+        # ids are signed again instead of taking the empty table opened in place of the deleted one
+        self.assertEqual(self.get_signed_ids(ids, self.public_key, "v2_"), dict((i, "v2_" + i) for i in ids))
+        self.assertEqual(self.get_signed_ids(ids, self.public_key, "v3_"), dict((i, "v2_" + i) for i in ids))
+
+    def test_no_private_key_in_cache(self):
+        encrypt_operator = RsaEncrypt()
+        encrypt_operator.generate_key(rsa_bit=1024)
+        e, d, n = encrypt_operator.get_key_pair()
+        ids = ["id" + str(i) for i in range(20)]
+        self.get_signed_ids(ids, {"e": e, "n": n}, "v1_")
+
+        meta, sign_table = self.cache_tables()
+        for secret in [d, encrypt_operator.p, encrypt_operator.q]:
+            self.assertNotIn(str(secret), repr(meta))
+            self.assertNotIn(str(secret), repr(sign_table))
+
+    def test_host_key_round_trip(self):
+        model_table = "test_rsa_key_{}".format(time.time())
+        self.addCleanup(eggroll.cleanup, model_table, "test_rsa_sign_cache", persistent=True)
+        host = RsaIntersectionHost(IntersectParam(sign_cache_name=self.cache_name))
+        host.load_model(model_table, "test_rsa_sign_cache")
+        self.assertIsNone(host.encrypt_operator)
+
+        host.encrypt_operator = RsaEncrypt()
+        host.encrypt_operator.generate_key(rsa_bit=1024)
+        host.save_model(model_table, "test_rsa_sign_cache")
+
+        loaded_host = RsaIntersectionHost(IntersectParam(sign_cache_name=self.cache_name))
+        loaded_host.load_model(model_table, "test_rsa_sign_cache")
+        self.assertEqual(loaded_host.encrypt_operator.get_key_pair(), host.encrypt_operator.get_key_pair())
+        self.assertEqual(loaded_host.encrypt_operator.decrypt(12345), host.encrypt_operator.decrypt(12345))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -19,13 +19,17 @@ from federatedml.tree.node import SplitInfo
 from federatedml.tree.criterion import XgboostCriterion
 from federatedml.tree.splitter import Splitter
 from federatedml.tree.feature_histogram import FeatureHistogram
+from federatedml.tree.compiled_trees import CompiledTrees
 from federatedml.tree.decision_tree import DecisionTree
 from federatedml.tree.hetero_decision_tree_guest import HeteroDecisionTreeGuest
 from federatedml.tree.hetero_decision_tree_host import HeteroDecisionTreeHost
+from federatedml.tree.hetero_lockstep_decision_tree_guest import HeteroLockstepDecisionTreeGuest
+from federatedml.tree.hetero_lockstep_decision_tree_host import HeteroLockstepDecisionTreeHost
 from federatedml.tree.boosting_tree import BoostingTree
 from federatedml.tree.hetero_secureboosting_tree_guest import HeteroSecureBoostingTreeGuest
 from federatedml.tree.hetero_secureboosting_tree_host import HeteroSecureBoostingTreeHost
 
 __all__ = ["Node", "SplitInfo", "HeteroSecureBoostingTreeGuest", "HeteroSecureBoostingTreeHost",
-           "HeteroDecisionTreeHost", "HeteroDecisionTreeGuest", "Splitter",
-           "FeatureHistogram", "XgboostCriterion", "DecisionTree"]
+           "HeteroDecisionTreeHost", "HeteroDecisionTreeGuest", "HeteroLockstepDecisionTreeHost",
+           "HeteroLockstepDecisionTreeGuest", "Splitter",
+           "FeatureHistogram", "XgboostCriterion", "DecisionTree", "CompiledTrees"]
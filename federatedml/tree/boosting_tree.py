@@ -49,6 +49,12 @@ class BoostingTree(object):
         self.bin_sample_num = boostingtree_param.bin_sample_num
         self.calculated_mode = boostingtree_param.encrypted_mode_calculator_param.mode
         self.re_encrypted_rate = boostingtree_param.encrypted_mode_calculator_param.re_encrypted_rate
+        self.pack_grad_and_hess = boostingtree_param.pack_grad_and_hess
+        self.use_goss = boostingtree_param.use_goss
+        self.top_rate = boostingtree_param.top_rate
+        self.other_rate = boostingtree_param.other_rate
+        self.lockstep_multi_class = boostingtree_param.lockstep_multi_class
+        self.use_bitmap_predict = boostingtree_param.use_bitmap_predict
 
     @staticmethod
     def data_format_transform(row):
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+################################################################################
+#
+#
+################################################################################
+
+# =============================================================================
+# CompiledTrees
+# =============================================================================
+
+import numpy as np
+
+
+class CompiledTrees(object):
+    """
+    Trees compiled into flat arrays of shape (tree_num, node_num), indexed by tree and node id,
+    to predict a block of rows on all trees with ndarray operations.
+
+    Parameters
+    ----------
+    trees : list of tree_, list of Node indexed by node id
+
+    split_maskdicts : list of split_maskdict of the trees, real split values of the nodes split by this party
+
+    sitename : str, site of this party, its nodes get fid and bid, other split nodes are decided by their sites
+    """
+
+    def __init__(self, trees, split_maskdicts, sitename):
+        self.tree_num = len(trees)
+        self.node_num = max([len(tree_) for tree_ in trees], default=1)
+        shape = (self.tree_num, self.node_num)
+
+        self.fid = np.full(shape, -1, dtype=np.int64)
+        self.bid = np.full(shape, np.nan)
+        self.left = np.tile(np.arange(self.node_num), (self.tree_num, 1))
+        self.right = self.left.copy()
+        self.weight = np.zeros(shape)
+        self.is_leaf = np.ones(shape, dtype=bool)
+        self.site = np.full(shape, None, dtype=object)
+
+        for tidx, tree_ in enumerate(trees):
+            for node in tree_:
+                nid = node.id
+                self.site[tidx, nid] = node.sitename
+                if node.is_leaf is True:
+                    self.weight[tidx, nid] = node.weight
+                    continue
+
+                self.is_leaf[tidx, nid] = False
+                self.left[tidx, nid] = node.left_nodeid
+                self.right[tidx, nid] = node.right_nodeid
+                if node.sitename == sitename:
+                    self.fid[tidx, nid] = node.fid
+                    self.bid[tidx, nid] = split_maskdicts[tidx][nid]
+
+    def split_nodes(self, sitename):
+        """
+        return (tree indexes, node ids) of the nodes split by sitename, in tree then node order,
+        which is the order of the bits of the split bitmap of the site
+        """
+        return np.nonzero((self.site == sitename) & ~self.is_leaf)
+
+    def split_bitmap(self, features, sitename):
+        """
+        return bytes: packed bits of the nodes split by sitename, 1 if the row goes to the left child,
+        computed by the party of the site for a row of its features
+        """
+        tree_idx, node_idx = self.split_nodes(sitename)
+        fids = self.fid[tree_idx, node_idx]
+        used_fids, fid_cols = np.unique(fids, return_inverse=True)
+        values = np.array([features.get_data(fid, 0) for fid in used_fids], dtype=np.float64)
+        return np.packbits(values[fid_cols] <= self.bid[tree_idx, node_idx]).tobytes()
+
+    def predict_weights(self, features_list, sitename, host_bitmaps_list=None, host_sitenames=()):
+        """
+        Traverse all trees for a block of rows.
+
+        Parameters
+        ----------
+        features_list : list of features of this party, one for each row
+
+        sitename : str, site of this party
+
+        host_bitmaps_list : list of list of split bitmaps, one for each host in host_sitenames, one list for each row
+
+        return ndarray of shape (row_num, tree_num), weights of the leaves reached
+        """
+        row_num = len(features_list)
+        go_left = np.zeros((row_num, self.tree_num, self.node_num), dtype=bool)
+
+        tree_idx, node_idx = self.split_nodes(sitename)
+        used_fids, fid_cols = np.unique(self.fid[tree_idx, node_idx], return_inverse=True)
+        values = np.array([[features.get_data(fid, 0) for fid in used_fids] for features in features_list],
+                          dtype=np.float64).reshape(row_num, len(used_fids))
+        go_left[:, tree_idx, node_idx] = values[:, fid_cols] <= self.bid[tree_idx, node_idx]
+
+        for i, host_sitename in enumerate(host_sitenames):
+            tree_idx, node_idx = self.split_nodes(host_sitename)
+            bitmaps = np.frombuffer(b"".join(host_bitmaps[i] for host_bitmaps in host_bitmaps_list),
+                                    dtype=np.uint8).reshape(row_num, -1)
+            go_left[:, tree_idx, node_idx] = np.unpackbits(bitmaps, axis=1)[:, :len(tree_idx)].astype(bool)
+
+        rows = np.arange(row_num)[:, np.newaxis]
+        trees = np.arange(self.tree_num)
+        nodes = np.zeros((row_num, self.tree_num), dtype=np.int64)
+        for depth in range(self.node_num):
+            if self.is_leaf[trees, nodes].all():
+                break
+            nodes = np.where(go_left[rows, trees, nodes], self.left[trees, nodes], self.right[trees, nodes])
+
+        return self.weight[trees, nodes]
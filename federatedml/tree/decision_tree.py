@@ -24,7 +24,13 @@
 # =============================================================================
 # DecisionTree Base Class
 # =============================================================================
+import copy
+
+from arch.api.utils import log_utils
 from federatedml.util import DecisionTreeParamChecker
+from federatedml.tree import FeatureHistogram
+
+LOGGER = log_utils.getLogger()
 
 
 class DecisionTree(object):
@@ -40,6 +46,98 @@ class DecisionTree(object):
         self.feature_importance_type = tree_param.feature_importance_type
         self.n_iter_no_change = tree_param.n_iter_no_change
         self.tol = tree_param.tol
+        self.parent_histograms = {}
+        self.cur_histograms = {}
+
+    def reset_histogram_cache(self):
+        self.parent_histograms = self.cur_histograms
+        self.cur_histograms = {}
+
+    def is_histogram_derivable(self, node, batch_nodes):
+        if node.parent_nodeid not in self.parent_histograms:
+            return False
+
+        if node.sibling_nodeid in self.cur_histograms:
+            return True
+
+        sibling = batch_nodes.get(node.sibling_nodeid)
+        if sibling is None:
+            return False
+
+        return (sibling.sample_num, sibling.id) < (node.sample_num, node.id)
+
+    def compute_histograms(self, node_map):
+        raise NotImplementedError("compute_histograms method should overload")
+
+    def get_histograms(self, node_map={}):
+        """
+        Histograms of cur_split_nodes, ordered by node_map.
+        Only the smaller child of each node pair is computed from data, its sibling is derived as
+        parent histogram minus child histogram, histograms of this depth are cached for the next one.
+        """
+        batch_nodes = dict((node.id, node) for node in self.cur_split_nodes)
+        direct_node_map = {}
+        derived_nodes = []
+        for node in self.cur_split_nodes:
+            if self.is_histogram_derivable(node, batch_nodes):
+                derived_nodes.append(node)
+            else:
+                direct_node_map[node.id] = len(direct_node_map)
+
+        LOGGER.info("compute histograms of {} nodes, derive histograms of {} nodes by subtraction".format(
+            len(direct_node_map), len(derived_nodes)))
+
+        if direct_node_map:
+            direct_histograms = self.compute_histograms(direct_node_map)
+            for nid, idx in direct_node_map.items():
+                self.cur_histograms[nid] = direct_histograms[idx]
+
+        for node in derived_nodes:
+            self.cur_histograms[node.id] = FeatureHistogram.subtract_histogram(
+                self.parent_histograms[node.parent_nodeid], self.cur_histograms[node.sibling_nodeid])
+
+        histograms = [None for i in range(len(node_map))]
+        for nid, idx in node_map.items():
+            histograms[idx] = self.cur_histograms[nid]
+
+        return histograms
+
+    @staticmethod
+    def split_lockstep_tree(tree_, split_maskdict, tree_num):
+        """
+        Split the nodes of tree_num trees grown in lockstep, whose roots are nodes 0 to tree_num - 1 and whose
+        node ids are shared, into tree_num trees. Nodes of each tree are renumbered in their order from 0,
+        which are the ids the tree gets when it is grown alone.
+
+        return list of (tree_, split_maskdict) of each tree
+        """
+        trees = []
+        for root_id in range(tree_num):
+            nids = []
+            queue = [root_id]
+            while queue:
+                nid = queue.pop()
+                nids.append(nid)
+                if tree_[nid].is_leaf is not True:
+                    queue.extend([tree_[nid].left_nodeid, tree_[nid].right_nodeid])
+
+            nids.sort()
+            new_ids = dict((nid, i) for i, nid in enumerate(nids))
+            new_ids[-1] = -1
+            sub_tree = []
+            for nid in nids:
+                node = copy.copy(tree_[nid])
+                node.id = new_ids[nid]
+                node.left_nodeid = new_ids[node.left_nodeid]
+                node.right_nodeid = new_ids[node.right_nodeid]
+                node.parent_nodeid = new_ids.get(node.parent_nodeid, -1)
+                node.sibling_nodeid = new_ids.get(node.sibling_nodeid, -1)
+                sub_tree.append(node)
+
+            sub_split_maskdict = dict((new_ids[nid], val) for nid, val in split_maskdict.items() if nid in new_ids)
+            trees.append((sub_tree, sub_split_maskdict))
+
+        return trees
 
     def fit(self):
         raise NotImplementedError("fit method should overload")
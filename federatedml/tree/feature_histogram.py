@@ -38,6 +38,9 @@ class FeatureHistogram(object):
 
     @staticmethod
     def accumulate_histogram(histograms):
+        if isinstance(histograms, np.ndarray):
+            return np.cumsum(histograms, axis=2)
+
         for i in range(len(histograms)):
             for j in range(len(histograms[i])):
                 for k in range(1, len(histograms[i][j])):
@@ -61,10 +64,28 @@ class FeatureHistogram(object):
         batch_histogram = data_bin.join(grad_and_hess, \
                                         lambda data_inst, g_h: (data_inst, g_h)).mapPartitions(batch_histogram_cal)
 
-        return batch_histogram.reduce(agg_histogram)
+        histograms = batch_histogram.reduce(agg_histogram)
+        if histograms is None:
+            # no instance falls in the nodes, the zero histograms take the shape gradients of this type take
+            if FeatureHistogram.is_plaintext_grad_and_hess(grad_and_hess):
+                histograms = np.zeros((len(node_map), bin_split_points.shape[0],
+                                       FeatureHistogram.get_bin_num(bin_split_points), 3))
+            else:
+                histograms = FeatureHistogram.zero_histogram(bin_split_points, valid_features, node_map)
+
+        return histograms
 
     @staticmethod
     def aggregate_histogram(batch_histogram1, batch_histogram2, node_map=None):
+        if batch_histogram1 is None:
+            return batch_histogram2
+
+        if batch_histogram2 is None:
+            return batch_histogram1
+
+        if isinstance(batch_histogram1, np.ndarray):
+            return batch_histogram1 + batch_histogram2
+
         for i in range(len(batch_histogram1)):
             for j in range(len(batch_histogram1[i])):
                 for k in range(len(batch_histogram1[i][j])):
@@ -73,6 +94,63 @@ class FeatureHistogram(object):
 
         return batch_histogram1
 
+    @staticmethod
+    def subtract_histogram(parent_histogram, child_histogram):
+        if isinstance(parent_histogram, np.ndarray):
+            return parent_histogram - child_histogram
+
+        histogram = []
+        for j in range(len(parent_histogram)):
+            feature_histogram = []
+            for k in range(len(parent_histogram[j])):
+                feature_histogram.append([parent_histogram[j][k][r] - child_histogram[j][k][r]
+                                          for r in range(len(parent_histogram[j][k]))])
+
+            histogram.append(feature_histogram)
+
+        return histogram
+
+    @staticmethod
+    def get_bin_num(bin_split_points):
+        bin_num = 1
+        for fid in range(bin_split_points.shape[0]):
+            bin_num = max(bin_num, bin_split_points[fid].shape[0] + 1)
+
+        return bin_num
+
+    @staticmethod
+    def is_plaintext(value):
+        return isinstance(value, (int, float, np.number))
+
+    @staticmethod
+    def is_plaintext_grad_and_hess(grad_and_hess):
+        first = grad_and_hess.first()
+        if first is None:
+            return True
+
+        grad = first[1][0]
+        if isinstance(grad, (tuple, list)):
+            # trees grown in lockstep, the value is a (g, h) in each tree
+            grad = grad[0]
+        return FeatureHistogram.is_plaintext(grad)
+
+    @staticmethod
+    def zero_histogram(bin_split_points, valid_features, node_map):
+        node_histograms = []
+        for k in range(len(node_map)):
+            feature_histogram_template = []
+            for fid in range(bin_split_points.shape[0]):
+                if valid_features is not None and valid_features[fid] is False:
+                    feature_histogram_template.append([])
+                    continue
+                else:
+                    feature_histogram_template.append([[0 for i in range(3)]
+                                                       for j in range(bin_split_points[fid].shape[0] + 1)])
+
+            node_histograms.append(feature_histogram_template)
+
+        return node_histograms
+
     @staticmethod
     def batch_calculate_histogram(kv_iterator, bin_split_points=None,
                                   bin_sparse_points=None, valid_features=None,
@@ -86,18 +164,31 @@ class FeatureHistogram(object):
 
         for _, value in kv_iterator:
             data_bin, nodeid_state = value[0]
-            unleaf_state, nodeid = nodeid_state
-            if unleaf_state == 0 or nodeid not in node_map:
-                continue
-            g, h = value[1]
-            data_bins.append(data_bin)
-            node_ids.append(nodeid)
-            grad.append(g)
-            hess.append(h)
+            if isinstance(nodeid_state, list):
+                # trees grown in lockstep, an instance has a node state and a (g, h) in each tree
+                nodeid_states = zip(nodeid_state, value[1])
+            else:
+                nodeid_states = [(nodeid_state, value[1])]
+
+            for (unleaf_state, nodeid), (g, h) in nodeid_states:
+                if unleaf_state == 0 or nodeid not in node_map:
+                    continue
+                data_bins.append(data_bin)
+                node_ids.append(nodeid)
+                grad.append(g)
+                hess.append(h)
 
-            data_record += 1
+                data_record += 1
 
         LOGGER.info("begin batch calculate histogram, data count is {}".format(data_record))
+        if data_record == 0:
+            return None
+
+        if FeatureHistogram.is_plaintext(grad[0]):
+            return FeatureHistogram.batch_calculate_dense_histogram(data_bins, node_ids, grad, hess,
+                                                                    bin_split_points, bin_sparse_points,
+                                                                    valid_features, node_map)
+
         node_num = len(node_map)
         zero_optim = [[[0 for i in range(3)]
                        for j in range(bin_split_points.shape[0])]
@@ -105,20 +196,7 @@ class FeatureHistogram(object):
         zero_opt_node_sum = [[0 for i in range(3)]
                              for j in range(node_num)]
 
-        node_histograms = []
-        for k in range(node_num):
-            feature_histogram_template = []
-            for fid in range(bin_split_points.shape[0]):
-                if valid_features is not None and valid_features[fid] is False:
-                    feature_histogram_template.append([])
-                    continue
-                else:
-                    feature_histogram_template.append([[0 for i in range(3)]
-                                                       for j in range(bin_split_points[fid].shape[0] + 1)])
-
-            node_histograms.append(feature_histogram_template)
-
-        assert len(feature_histogram_template) == bin_split_points.shape[0]
+        node_histograms = FeatureHistogram.zero_histogram(bin_split_points, valid_features, node_map)
 
         for rid in range(data_record):
             nid = node_map.get(node_ids[rid])
@@ -146,3 +224,60 @@ class FeatureHistogram(object):
                     node_histograms[nid][fid][sparse_point][2] += zero_opt_node_sum[nid][2] - zero_optim[nid][fid][2]
 
         return node_histograms
+
+    @staticmethod
+    def batch_calculate_dense_histogram(data_bins, node_ids, grad, hess,
+                                        bin_split_points, bin_sparse_points,
+                                        valid_features, node_map):
+        """
+        Plaintext histogram of one batch, as a dense ndarray of shape (node_num, feature_num, bin_num, 3),
+        the last axis is (sum_grad, sum_hess, count). Features having fewer bins than bin_num are padded
+        with zero bins, which don't change the accumulated histogram.
+        """
+        node_num = len(node_map)
+        feature_num = bin_split_points.shape[0]
+        bin_num = FeatureHistogram.get_bin_num(bin_split_points)
+        hist_size = node_num * feature_num * bin_num
+
+        row_nodes = np.fromiter((node_map[nodeid] for nodeid in node_ids), dtype=np.int64, count=len(node_ids))
+        grad = np.asarray(grad, dtype=np.float64)
+        hess = np.asarray(hess, dtype=np.float64)
+
+        nnz = np.empty(len(data_bins), dtype=np.int64)
+        fids = []
+        bids = []
+        for rid, data_bin in enumerate(data_bins):
+            sparse_vec = data_bin.features.sparse_vec
+            nnz[rid] = len(sparse_vec)
+            fids.extend(sparse_vec.keys())
+            bids.extend(sparse_vec.values())
+
+        rows = np.repeat(np.arange(len(data_bins)), nnz)
+        fids = np.asarray(fids, dtype=np.int64)
+        bids = np.asarray(bids, dtype=np.int64)
+
+        if valid_features is not None:
+            valid_mask = np.asarray(valid_features, dtype=bool)
+            keep = valid_mask[fids]
+            rows, fids, bids = rows[keep], fids[keep], bids[keep]
+
+        index = (row_nodes[rows] * feature_num + fids) * bin_num + bids
+
+        node_histograms = np.empty((hist_size, 3))
+        node_histograms[:, 0] = np.bincount(index, weights=grad[rows], minlength=hist_size)
+        node_histograms[:, 1] = np.bincount(index, weights=hess[rows], minlength=hist_size)
+        node_histograms[:, 2] = np.bincount(index, minlength=hist_size)
+        node_histograms = node_histograms.reshape((node_num, feature_num, bin_num, 3))
+
+        if valid_features is not None:
+            node_sum = np.empty((node_num, 3))
+            node_sum[:, 0] = np.bincount(row_nodes, weights=grad, minlength=node_num)
+            node_sum[:, 1] = np.bincount(row_nodes, weights=hess, minlength=node_num)
+            node_sum[:, 2] = np.bincount(row_nodes, minlength=node_num)
+
+            sparse_fids = np.flatnonzero(valid_mask)
+            sparse_bids = np.asarray(bin_sparse_points, dtype=np.int64)[sparse_fids]
+            feature_sum = node_histograms[:, sparse_fids].sum(axis=2)
+            node_histograms[:, sparse_fids, sparse_bids] += node_sum[:, np.newaxis, :] - feature_sum
+
+        return node_histograms
@@ -63,6 +63,7 @@ class HeteroDecisionTreeGuest(DecisionTree):
         self.valid_features = None
         self.encrypter = None
         self.encrypted_mode_calculator = None
+        self.grad_and_hess_packer = None
         self.best_splitinfo_guest = None
         self.tree_node_queue = None
         self.cur_split_nodes = None
@@ -95,12 +96,21 @@ class HeteroDecisionTreeGuest(DecisionTree):
     def set_encrypted_mode_calculator(self, encrypted_mode_calculator):
         self.encrypted_mode_calculator = encrypted_mode_calculator
 
+    def set_grad_and_hess_packer(self, grad_and_hess_packer):
+        self.grad_and_hess_packer = grad_and_hess_packer
+
     def encrypt(self, val):
         return self.encrypter.encrypt(val)
 
     def decrypt(self, val):
         return self.encrypter.decrypt(val)
 
+    def decrypt_grad_and_hess(self, sum_grad, sum_hess):
+        if self.grad_and_hess_packer is not None:
+            return self.grad_and_hess_packer.unpack(self.decrypt(sum_grad))
+
+        return self.decrypt(sum_grad), self.decrypt(sum_hess)
+
     def encode(self, etype="feature_idx", val=None, nid=None):
         if etype == "feature_idx":
             return val
@@ -139,6 +149,14 @@ class HeteroDecisionTreeGuest(DecisionTree):
 
     def encrypt_grad_and_hess(self):
         LOGGER.info("start to encrypt grad and hess")
+        if self.grad_and_hess_packer is not None:
+            # host sums the packed ciphertext in the grad slot of its histograms, hess slot stays plain zero
+            packer = self.grad_and_hess_packer
+            packed_grad_and_hess = self.grad_and_hess.mapValues(packer.pack)
+            encrypted_grad_and_hess = self.encrypted_mode_calculator.encrypt(packed_grad_and_hess).mapValues(
+                lambda encrypted_val: (encrypted_val, 0))
+            return encrypted_grad_and_hess
+
         encrypted_grad_and_hess = self.encrypted_mode_calculator.encrypt(self.grad_and_hess)
         """
         encrypter = self.encrypter
@@ -154,12 +172,20 @@ class HeteroDecisionTreeGuest(DecisionTree):
             lambda value1, value2: (value1[0] + value2[0], value1[1] + value2[1]))
         return grad, hess
 
+    def init_tree_node_queue(self):
+        LOGGER.info("init tree node queue with root node")
+        root_sum_grad, root_sum_hess = self.get_grad_hess_sum(self.grad_and_hess)
+        root_node = Node(id=0, sitename=consts.GUEST, sum_grad=root_sum_grad, sum_hess=root_sum_hess,
+                         weight=self.splitter.node_weight(root_sum_grad, root_sum_hess),
+                         sample_num=self.grad_and_hess.count())
+        self.tree_node_queue = [root_node]
+
     def dispatch_all_node_to_root(self, root_id=0):
         LOGGER.info("dispatch all node to root")
         self.node_dispatch = self.data_bin.mapValues(lambda data_inst: (1, root_id))
 
-    def get_histograms(self, node_map={}):
-        LOGGER.info("start to get node histograms")
+    def compute_histograms(self, node_map={}):
+        LOGGER.info("start to compute node histograms")
         histograms = FeatureHistogram.calculate_histogram(
             self.data_bin_with_node_dispatch, self.grad_and_hess,
             self.bin_split_points, self.bin_sparse_points,
@@ -172,7 +198,10 @@ class HeteroDecisionTreeGuest(DecisionTree):
         LOGGER.info("send tree node queue of depth {}".format(dep))
         mask_tree_node_queue = copy.deepcopy(tree_node_queue)
         for i in range(len(mask_tree_node_queue)):
-            mask_tree_node_queue[i] = Node(id=mask_tree_node_queue[i].id)
+            mask_tree_node_queue[i] = Node(id=mask_tree_node_queue[i].id,
+                                           parent_nodeid=mask_tree_node_queue[i].parent_nodeid,
+                                           sibling_nodeid=mask_tree_node_queue[i].sibling_nodeid,
+                                           sample_num=mask_tree_node_queue[i].sample_num)
 
         federation.remote(obj=mask_tree_node_queue,
                           name=self.transfer_inst.tree_node_queue.name,
@@ -206,6 +235,9 @@ class HeteroDecisionTreeGuest(DecisionTree):
                           role=consts.HOST,
                           idx=idx)
 
+    def find_split_guest(self, acc_histograms):
+        return self.splitter.find_split(acc_histograms, self.valid_features)
+
     def find_host_split(self, value):
         cur_split_node, encrypted_splitinfo_host = value
         sum_grad = cur_split_node.sum_grad
@@ -215,8 +247,7 @@ class HeteroDecisionTreeGuest(DecisionTree):
 
         for i in range(len(encrypted_splitinfo_host)):
             sum_grad_l, sum_hess_l = encrypted_splitinfo_host[i]
-            sum_grad_l = self.decrypt(sum_grad_l)
-            sum_hess_l = self.decrypt(sum_hess_l)
+            sum_grad_l, sum_hess_l = self.decrypt_grad_and_hess(sum_grad_l, sum_hess_l)
             sum_grad_r = sum_grad - sum_grad_l
             sum_hess_r = sum_hess - sum_hess_l
             gain = self.splitter.split_gain(sum_grad, sum_hess, sum_grad_l,
@@ -266,8 +297,8 @@ class HeteroDecisionTreeGuest(DecisionTree):
             best_splitinfo = splitinfo_guest_host[0]
         else:
             best_splitinfo = splitinfo_guest_host[best_gain_host_idx]
-            best_splitinfo.sum_grad = self.decrypt(best_splitinfo.sum_grad)
-            best_splitinfo.sum_hess = self.decrypt(best_splitinfo.sum_hess)
+            best_splitinfo.sum_grad, best_splitinfo.sum_hess = self.decrypt_grad_and_hess(best_splitinfo.sum_grad,
+                                                                                          best_splitinfo.sum_hess)
             best_splitinfo.gain = best_gain_host
 
         return best_splitinfo
@@ -313,6 +344,7 @@ class HeteroDecisionTreeGuest(DecisionTree):
         for i in range(len(self.tree_node_queue)):
             sum_grad = self.tree_node_queue[i].sum_grad
             sum_hess = self.tree_node_queue[i].sum_hess
+            sample_num = self.tree_node_queue[i].sample_num
             if max_depth_reach or splitinfos[i].gain <= \
                     self.min_impurity_split + consts.FLOAT_ZERO:
                 self.tree_node_queue[i].is_leaf = True
@@ -325,14 +357,20 @@ class HeteroDecisionTreeGuest(DecisionTree):
                                  sitename=consts.GUEST,
                                  sum_grad=splitinfos[i].sum_grad,
                                  sum_hess=splitinfos[i].sum_hess,
-                                 weight=self.splitter.node_weight(splitinfos[i].sum_grad, splitinfos[i].sum_hess))
+                                 weight=self.splitter.node_weight(splitinfos[i].sum_grad, splitinfos[i].sum_hess),
+                                 parent_nodeid=self.tree_node_queue[i].id,
+                                 sibling_nodeid=self.tree_node_queue[i].right_nodeid,
+                                 sample_num=int(splitinfos[i].sample_count))
                 right_node = Node(id=self.tree_node_queue[i].right_nodeid,
                                   sitename=consts.GUEST,
                                   sum_grad=sum_grad - splitinfos[i].sum_grad,
                                   sum_hess=sum_hess - splitinfos[i].sum_hess,
                                   weight=self.splitter.node_weight( \
                                       sum_grad - splitinfos[i].sum_grad,
-                                      sum_hess - splitinfos[i].sum_hess))
+                                      sum_hess - splitinfos[i].sum_hess),
+                                  parent_nodeid=self.tree_node_queue[i].id,
+                                  sibling_nodeid=self.tree_node_queue[i].left_nodeid,
+                                  sample_num=sample_num - int(splitinfos[i].sample_count))
 
                 new_tree_node_queue.append(left_node)
                 new_tree_node_queue.append(right_node)
@@ -395,7 +433,7 @@ class HeteroDecisionTreeGuest(DecisionTree):
                                                  decoder=self.decode,
                                                  split_maskdict=self.split_maskdict,
                                                  bin_sparse_points=self.bin_sparse_points)
-        dispatch_guest_result = self.data_bin_with_node_dispatch.mapValues(dispatch_node_method)
+        dispatch_guest_result = self.data_bin_with_node_dispatch.mapValues(dispatch_node_method).materialize()
         tree_node_num = self.tree_node_num
         LOGGER.info("remask dispatch node result of depth {}".format(dep))
         
@@ -448,11 +486,7 @@ class HeteroDecisionTreeGuest(DecisionTree):
         LOGGER.info("begin to fit guest decision tree")
         self.sync_encrypted_grad_and_hess()
 
-        root_sum_grad, root_sum_hess = self.get_grad_hess_sum(self.grad_and_hess)
-        root_node = Node(id=0, sitename=consts.GUEST, sum_grad=root_sum_grad, sum_hess=root_sum_hess,
-                         weight=self.splitter.node_weight(root_sum_grad, root_sum_hess))
-        self.tree_node_queue = [root_node]
-
+        self.init_tree_node_queue()
         self.dispatch_all_node_to_root()
 
         for dep in range(self.max_depth):
@@ -463,10 +497,12 @@ class HeteroDecisionTreeGuest(DecisionTree):
                 break
 
             self.sync_node_positions(dep)
+            self.reset_histogram_cache()
 
-            self.data_bin_with_node_dispatch = self.data_bin.join(self.node_dispatch,
-                                                                  lambda data_inst, dispatch_info: (
-                                                                      data_inst, dispatch_info))
+            # a lazy join, read together with grad and hess by each histogram pass instead of copied every depth
+            self.data_bin_with_node_dispatch = self.data_bin.lazy().join(self.node_dispatch,
+                                                                         lambda data_inst, dispatch_info: (
+                                                                             data_inst, dispatch_info))
 
             batch = 0
             splitinfos = []
@@ -481,8 +517,7 @@ class HeteroDecisionTreeGuest(DecisionTree):
 
                 acc_histograms = self.get_histograms(node_map=node_map)
 
-                self.best_splitinfo_guest = self.splitter.find_split(acc_histograms, self.valid_features,
-                                                                     self.data_bin._partitions)
+                self.best_splitinfo_guest = self.find_split_guest(acc_histograms)
                 self.federated_find_split(dep, batch)
                 final_splitinfo_host = self.sync_final_split_host(dep, batch)
 
@@ -550,7 +585,8 @@ class HeteroDecisionTreeGuest(DecisionTree):
 
     def predict(self, data_inst):
         LOGGER.info("start to predict!")
-        predict_data = data_inst.mapValues(lambda data_inst: (0, 1))
+        # the start state and the states merged from hosts are fused into the next traverse by the lazy plan
+        predict_data = data_inst.lazy().mapValues(lambda data_inst: (0, 1))
         site_host_send_times = 0
         predict_result = None
 
@@ -559,7 +595,7 @@ class HeteroDecisionTreeGuest(DecisionTree):
                                               tree_=self.tree_,
                                               decoder=self.decode,
                                               split_maskdict=self.split_maskdict)
-            predict_data = predict_data.join(data_inst, traverse_tree)
+            predict_data = predict_data.join(data_inst, traverse_tree).materialize()
             predict_leaf = predict_data.filter(lambda key, value: isinstance(value, tuple) is False)
             if predict_result is None:
                 predict_result = predict_leaf
@@ -578,6 +614,7 @@ class HeteroDecisionTreeGuest(DecisionTree):
             self.sync_predict_data(predict_data, site_host_send_times)
 
             predict_data_host = self.sync_data_predicted_by_host(site_host_send_times)
+            predict_data = predict_data.lazy()
             for i in range(len(predict_data_host)):
                 predict_data = predict_data.join(predict_data_host[i],
                                                  lambda state1_nodeid1, state2_nodeid2:
@@ -134,8 +134,8 @@ class HeteroDecisionTreeHost(DecisionTree):
                                                   self.transfer_inst.tree_node_queue, dep),
                                               idx=0)
 
-    def get_histograms(self, node_map={}):
-        LOGGER.info("start to get node histograms")
+    def compute_histograms(self, node_map={}):
+        LOGGER.info("start to compute node histograms")
         # self.data_bin_with_position = self.data_bin.join(node_positions, lambda v1, v2: (v1, v2))
         histograms = FeatureHistogram.calculate_histogram(
             self.data_bin_with_position, self.grad_and_hess,
@@ -146,6 +146,10 @@ class HeteroDecisionTreeHost(DecisionTree):
         LOGGER.info("acc histogram shape is {}".format(len(acc_histograms)))
         return acc_histograms
 
+    def find_split_host(self, acc_histograms):
+        return self.splitter.find_split_host(acc_histograms, self.valid_features, self.data_bin._partitions,
+                                             self.sitename)
+
     def sync_encrypted_splitinfo_host(self, encrypted_splitinfo_host, dep=-1, batch=-1):
         LOGGER.info("send encrypted splitinfo of depth {}, batch {}".format(dep, batch))
         federation.remote(obj=encrypted_splitinfo_host,
@@ -313,7 +317,9 @@ class HeteroDecisionTreeHost(DecisionTree):
                 break
 
             node_positions = self.sync_node_positions(dep)
-            self.data_bin_with_position = self.data_bin.join(node_positions, lambda v1, v2: (v1, v2))
+            # a lazy join, read together with grad and hess by each histogram pass instead of copied every depth
+            self.data_bin_with_position = self.data_bin.lazy().join(node_positions, lambda v1, v2: (v1, v2))
+            self.reset_histogram_cache()
 
             batch = 0
             for i in range(0, len(self.tree_node_queue), self.max_split_nodes):
@@ -326,10 +332,7 @@ class HeteroDecisionTreeHost(DecisionTree):
 
                 acc_histograms = self.get_histograms(node_map=node_map)
 
-                splitinfo_host, encrypted_splitinfo_host = self.splitter.find_split_host(acc_histograms,
-                                                                                         self.valid_features,
-                                                                                         self.data_bin._partitions,
-                                                                                         self.sitename)
+                splitinfo_host, encrypted_splitinfo_host = self.find_split_host(acc_histograms)
                 self.sync_encrypted_splitinfo_host(encrypted_splitinfo_host, dep, batch)
                 federated_best_splitinfo_host = self.sync_federated_best_splitinfo_host(dep, batch)
                 self.sync_final_splitinfo_host(splitinfo_host, federated_best_splitinfo_host, dep, batch)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+################################################################################
+#
+#
+################################################################################
+
+# =============================================================================
+# HeteroLockstepDecisionTreeGuest
+# =============================================================================
+
+import functools
+
+from arch.api.utils import log_utils
+from federatedml.tree import HeteroDecisionTreeGuest
+from federatedml.tree import Node
+from federatedml.util import consts
+
+LOGGER = log_utils.getLogger()
+
+
+class HeteroLockstepDecisionTreeGuest(HeteroDecisionTreeGuest):
+    """
+    Grow the tree_num trees of a boosting round, one for each class, in lockstep.
+
+    The trees share one node id space, their roots are nodes 0 to tree_num - 1, so each depth of all trees
+    takes one round of the protocol of HeteroDecisionTreeGuest: grad and hess of all trees are encrypted
+    and sent once, each host histogram pass computes histograms of nodes of all trees, and split infos
+    and node dispatch of all trees are exchanged in the same batches.
+    An instance has a node state and a (g, h) in each tree, as lists ordered by tree.
+
+    Parameters
+    ----------
+    tree_param : DecisionTreeParam Object
+
+    tree_num : int, number of trees grown together
+    """
+
+    def __init__(self, tree_param, tree_num):
+        super(HeteroLockstepDecisionTreeGuest, self).__init__(tree_param)
+        self.tree_param = tree_param
+        self.tree_num = tree_num
+        self.tree_valid_features = None
+        self.node_tree_idx = {}
+        self.trees = []
+
+    def set_inputinfo(self, data_bin=None, grad_and_hess=None, bin_split_points=None, bin_sparse_points=None):
+        """
+        grad_and_hess : DTable, values are (grad, hess) of all trees, as in HeteroSecureBoostingTreeGuest
+        """
+        tree_num = self.tree_num
+        grad_and_hess = grad_and_hess.mapValues(
+            lambda grad_and_hess: [(grad_and_hess[0][tidx], grad_and_hess[1][tidx]) for tidx in range(tree_num)])
+        super(HeteroLockstepDecisionTreeGuest, self).set_inputinfo(data_bin, grad_and_hess, bin_split_points,
+                                                                   bin_sparse_points)
+
+    def set_valid_features(self, valid_features=None):
+        """
+        valid_features : list of valid features of each tree, histograms are computed on features valid in any tree
+        """
+        LOGGER.info("set valid features of {} trees".format(len(valid_features)))
+        self.tree_valid_features = valid_features
+        self.valid_features = [any(tree_valid_features[fid] for tree_valid_features in valid_features)
+                               for fid in range(len(valid_features[0]))]
+
+    def encrypt_grad_and_hess(self):
+        LOGGER.info("start to encrypt grad and hess of {} trees".format(self.tree_num))
+        if self.grad_and_hess_packer is not None:
+            packer = self.grad_and_hess_packer
+            packed_grad_and_hess = self.grad_and_hess.mapValues(
+                lambda grad_and_hess: [packer.pack(g_h) for g_h in grad_and_hess])
+            return self.encrypted_mode_calculator.encrypt(packed_grad_and_hess).mapValues(
+                lambda encrypted_vals: [(encrypted_val, 0) for encrypted_val in encrypted_vals])
+
+        flat_grad_and_hess = self.grad_and_hess.mapValues(
+            lambda grad_and_hess: [val for g_h in grad_and_hess for val in g_h])
+        return self.encrypted_mode_calculator.encrypt(flat_grad_and_hess).mapValues(
+            lambda encrypted_vals: list(zip(encrypted_vals[::2], encrypted_vals[1::2])))
+
+    def init_tree_node_queue(self):
+        LOGGER.info("init tree node queue with root nodes of {} trees".format(self.tree_num))
+        sum_grad_and_hess = self.grad_and_hess.reduce(
+            lambda value1, value2: [(g_h1[0] + g_h2[0], g_h1[1] + g_h2[1]) for g_h1, g_h2 in zip(value1, value2)])
+        sample_num = self.grad_and_hess.count()
+
+        self.tree_node_queue = []
+        for tidx, (root_sum_grad, root_sum_hess) in enumerate(sum_grad_and_hess):
+            self.tree_node_queue.append(Node(id=tidx, sitename=consts.GUEST, sum_grad=root_sum_grad,
+                                             sum_hess=root_sum_hess,
+                                             weight=self.splitter.node_weight(root_sum_grad, root_sum_hess),
+                                             sample_num=sample_num))
+            self.node_tree_idx[tidx] = tidx
+
+        self.tree_node_num = self.tree_num - 1
+
+    def dispatch_all_node_to_root(self, root_id=0):
+        LOGGER.info("dispatch all node to roots of {} trees".format(self.tree_num))
+        tree_num = self.tree_num
+        self.node_dispatch = self.data_bin.mapValues(lambda data_inst: [(1, tidx) for tidx in range(tree_num)])
+
+    def find_split_guest(self, acc_histograms):
+        splitinfos = [None for i in range(len(self.cur_split_nodes))]
+        for tidx in range(self.tree_num):
+            node_idx = [i for i, node in enumerate(self.cur_split_nodes) if self.node_tree_idx[node.id] == tidx]
+            if not node_idx:
+                continue
+
+            tree_splitinfos = self.splitter.find_split([acc_histograms[i] for i in node_idx],
+                                                       self.tree_valid_features[tidx])
+            for i, splitinfo in zip(node_idx, tree_splitinfos):
+                splitinfos[i] = splitinfo
+
+        return splitinfos
+
+    def update_tree_node_queue(self, splitinfos, max_depth_reach):
+        super(HeteroLockstepDecisionTreeGuest, self).update_tree_node_queue(splitinfos, max_depth_reach)
+        for node in self.tree_node_queue:
+            self.node_tree_idx[node.id] = self.node_tree_idx[node.parent_nodeid]
+
+    @staticmethod
+    def dispatch_node(value, tree_=None, decoder=None,
+                      split_maskdict=None, bin_sparse_points=None):
+        data_inst, nodeid_states = value
+        dispatch_states = []
+        for unleaf_state, nodeid in nodeid_states:
+            if unleaf_state == 0 or tree_[nodeid].is_leaf is True:
+                dispatch_states.append((0, nodeid))
+            else:
+                dispatch_states.append(HeteroDecisionTreeGuest.dispatch_node((data_inst, (unleaf_state, nodeid)),
+                                                                             tree_, decoder, split_maskdict,
+                                                                             bin_sparse_points))
+
+        return dispatch_states
+
+    @staticmethod
+    def merge_dispatch_host_result(dispatch_states1, dispatch_states2):
+        return [state1 if len(state1) == 2 else state2 for state1, state2 in zip(dispatch_states1, dispatch_states2)]
+
+    def redispatch_node(self, dep=-1):
+        LOGGER.info("redispatch node of depth {}".format(dep))
+        dispatch_node_method = functools.partial(self.dispatch_node,
+                                                 tree_=self.tree_,
+                                                 decoder=self.decode,
+                                                 split_maskdict=self.split_maskdict,
+                                                 bin_sparse_points=self.bin_sparse_points)
+        dispatch_guest_result = self.data_bin_with_node_dispatch.mapValues(dispatch_node_method).materialize()
+
+        dispatch_to_host_result = dispatch_guest_result.filter(
+            lambda key, value: any(len(state) > 2 for state in value))
+        dispatch_guest_result = dispatch_guest_result.subtractByKey(dispatch_to_host_result)
+
+        tree_ = self.tree_
+        leaf = dispatch_guest_result.filter(lambda key, value: all(state[0] == 0 for state in value))
+        leaf_weights = leaf.mapValues(lambda value: [tree_[nodeid].weight for _, nodeid in value])
+        if self.predict_weights is None:
+            self.predict_weights = leaf_weights
+        else:
+            self.predict_weights = self.predict_weights.union(leaf_weights)
+
+        dispatch_guest_result = dispatch_guest_result.subtractByKey(leaf)
+
+        self.sync_dispatch_node_host(dispatch_to_host_result, dep)
+        dispatch_node_host_result = self.sync_dispatch_node_host_result(dep)
+
+        self.node_dispatch = dispatch_node_host_result[0]
+        for idx in range(1, len(dispatch_node_host_result)):
+            self.node_dispatch = self.node_dispatch.join(dispatch_node_host_result[idx],
+                                                         self.merge_dispatch_host_result)
+        self.node_dispatch = self.node_dispatch.union(dispatch_guest_result)
+
+    def fit(self):
+        super(HeteroLockstepDecisionTreeGuest, self).fit()
+
+        self.trees = []
+        for tree_, split_maskdict in self.split_lockstep_tree(self.tree_, self.split_maskdict, self.tree_num):
+            tree_inst = HeteroDecisionTreeGuest(self.tree_param)
+            tree_inst.tree_ = tree_
+            tree_inst.split_maskdict = split_maskdict
+            self.trees.append(tree_inst)
+
+        LOGGER.info("split {} trees grown in lockstep".format(self.tree_num))
+
+    def get_trees(self):
+        """
+        return list of HeteroDecisionTreeGuest, the trees fitted
+        """
+        return self.trees
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+################################################################################
+#
+#
+################################################################################
+
+# =============================================================================
+# HeteroLockstepDecisionTreeHost
+# =============================================================================
+
+import functools
+
+from arch.api.utils import log_utils
+from federatedml.tree import HeteroDecisionTreeHost
+
+LOGGER = log_utils.getLogger()
+
+
+class HeteroLockstepDecisionTreeHost(HeteroDecisionTreeHost):
+    """
+    Host side of HeteroLockstepDecisionTreeGuest, grow the tree_num trees of a boosting round in lockstep.
+
+    Parameters
+    ----------
+    tree_param : DecisionTreeParam Object
+
+    tree_num : int, number of trees grown together
+    """
+
+    def __init__(self, tree_param, tree_num):
+        super(HeteroLockstepDecisionTreeHost, self).__init__(tree_param)
+        self.tree_param = tree_param
+        self.tree_num = tree_num
+        self.tree_valid_features = None
+        self.node_tree_idx = dict((tidx, tidx) for tidx in range(tree_num))
+        self.trees = []
+
+    def set_valid_features(self, valid_features=None):
+        """
+        valid_features : list of valid features of each tree, histograms are computed on features valid in any tree
+        """
+        LOGGER.info("set valid features of {} trees".format(len(valid_features)))
+        self.tree_valid_features = valid_features
+        self.valid_features = [any(tree_valid_features[fid] for tree_valid_features in valid_features)
+                               for fid in range(len(valid_features[0]))]
+
+    def sync_tree_node_queue(self, dep=-1):
+        super(HeteroLockstepDecisionTreeHost, self).sync_tree_node_queue(dep)
+        for node in self.tree_node_queue:
+            if node.id not in self.node_tree_idx:
+                self.node_tree_idx[node.id] = self.node_tree_idx[node.parent_nodeid]
+
+    def find_split_host(self, acc_histograms):
+        splitinfo_host = [None for i in range(len(self.cur_split_nodes))]
+        encrypted_splitinfo_host = [None for i in range(len(self.cur_split_nodes))]
+        for tidx in range(self.tree_num):
+            node_idx = [i for i, node in enumerate(self.cur_split_nodes) if self.node_tree_idx[node.id] == tidx]
+            if not node_idx:
+                continue
+
+            tree_splitinfo_host, tree_encrypted_splitinfo_host = self.splitter.find_split_host(
+                [acc_histograms[i] for i in node_idx], self.tree_valid_features[tidx], self.data_bin._partitions,
+                self.sitename)
+            for i, splitinfo, encrypted_splitinfo in zip(node_idx, tree_splitinfo_host,
+                                                         tree_encrypted_splitinfo_host):
+                splitinfo_host[i] = splitinfo
+                encrypted_splitinfo_host[i] = encrypted_splitinfo
+
+        return splitinfo_host, encrypted_splitinfo_host
+
+    @staticmethod
+    def dispatch_node(value1, value2, sitename=None, decoder=None,
+                      split_maskdict=None, bin_sparse_points=None):
+        dispatch_states = []
+        for state in value1:
+            if len(state) > 2:
+                state = HeteroDecisionTreeHost.dispatch_node(state, value2, sitename, decoder,
+                                                             split_maskdict, bin_sparse_points)
+            dispatch_states.append(state)
+
+        return dispatch_states
+
+    def find_dispatch(self, dispatch_node_host, dep=-1):
+        LOGGER.info("start to find host dispath of depth {}".format(dep))
+        dispatch_node_method = functools.partial(self.dispatch_node,
+                                                 sitename=self.sitename,
+                                                 decoder=self.decode,
+                                                 split_maskdict=self.split_maskdict,
+                                                 bin_sparse_points=self.bin_sparse_points)
+        dispatch_node_host_result = dispatch_node_host.join(self.data_bin, dispatch_node_method)
+        self.sync_dispatch_node_host_result(dispatch_node_host_result, dep)
+
+    def fit(self):
+        super(HeteroLockstepDecisionTreeHost, self).fit()
+
+        self.trees = []
+        for tree_, split_maskdict in self.split_lockstep_tree(self.tree_, self.split_maskdict, self.tree_num):
+            tree_inst = HeteroDecisionTreeHost(self.tree_param)
+            tree_inst.tree_ = tree_
+            tree_inst.split_maskdict = split_maskdict
+            self.trees.append(tree_inst)
+
+        LOGGER.info("split {} trees grown in lockstep".format(self.tree_num))
+
+    def get_trees(self):
+        """
+        return list of HeteroDecisionTreeHost, the trees fitted
+        """
+        return self.trees
@@ -29,13 +29,16 @@ from federatedml.feature.quantile import Quantile
 from federatedml.util import ClassifyLabelChecker
 from federatedml.util import RegressionLabelChecker
 from federatedml.tree import HeteroDecisionTreeGuest
+from federatedml.tree import HeteroLockstepDecisionTreeGuest
 from federatedml.optim import DiffConverge
 from federatedml.tree import BoostingTree
+from federatedml.tree import CompiledTrees
 from federatedml.util import HeteroSecureBoostingTreeTransferVariable
 from federatedml.util import consts
 from numpy import random
 from federatedml.secureprotol import PaillierEncrypt
 from federatedml.secureprotol.encrypt_mode import EncryptModeCalculator
+from federatedml.secureprotol.packing import FixedPointPacker
 from federatedml.loss import SigmoidBinaryCrossEntropyLoss
 from federatedml.loss import SoftmaxCrossEntropyLoss
 from federatedml.loss import LeastSquaredErrorLoss
@@ -54,7 +57,11 @@ from arch.api.proto.boosting_tree_model_meta_pb2 import BoostingTreeModelMeta
 from arch.api.proto.boosting_tree_model_param_pb2 import FeatureImportanceInfo
 from arch.api.proto.boosting_tree_model_param_pb2 import BoostingTreeModelParam
 import numpy as np
+import copy
 import functools
+import hashlib
+import heapq
+import struct
 from operator import itemgetter
 from arch.api.utils import log_utils
 
@@ -77,6 +84,7 @@ class HeteroSecureBoostingTreeGuest(BoostingTree):
         self.classify_target = "binary"
         self.feature_num = None
         self.encrypter = None
+        self.grad_and_hess_packer = None
         self.grad_and_hess = None
         self.flowid = 0
         self.tree_dim = 1
@@ -184,6 +192,9 @@ class HeteroSecureBoostingTreeGuest(BoostingTree):
 
         self.encrypted_calculator = EncryptModeCalculator(self.encrypter, self.calculated_mode, self.re_encrypted_rate)
 
+        if self.pack_grad_and_hess:
+            self.grad_and_hess_packer = FixedPointPacker.from_public_key(self.encrypter.get_public_key(), slot_num=2)
+
     @staticmethod
     def accumulate_f(f_val, new_f_val, lr=0.1, idx=0):
         f_val[idx] += lr * new_f_val
@@ -211,6 +222,17 @@ class HeteroSecureBoostingTreeGuest(BoostingTree):
 
             self.F = self.F.join(new_f, accumuldate_f)
 
+    @staticmethod
+    def accumulate_trees_f(f_val, new_f_vals, lr=0.1):
+        for idx, new_f_val in enumerate(new_f_vals):
+            f_val = HeteroSecureBoostingTreeGuest.accumulate_f(f_val, new_f_val, lr=lr, idx=idx)
+        return f_val
+
+    def update_f_value_by_trees(self, new_f):
+        LOGGER.info("update tree f value of {} trees".format(self.tree_dim))
+        accumulate_trees_f = functools.partial(self.accumulate_trees_f, lr=self.learning_rate)
+        self.F = self.F.join(new_f, accumulate_trees_f)
+
     def compute_grad_and_hess(self):
         LOGGER.info("compute grad and hess")
         loss_method = self.loss
@@ -244,8 +266,49 @@ class HeteroSecureBoostingTreeGuest(BoostingTree):
         LOGGER.info("get grad and hess of tree {}".format(tree_idx))
         grad_and_hess_subtree = self.grad_and_hess.mapValues(
             lambda grad_and_hess: (grad_and_hess[0][tree_idx], grad_and_hess[1][tree_idx]))
+        if self.use_goss:
+            grad_and_hess_subtree = self.goss_sample(grad_and_hess_subtree, self.top_rate, self.other_rate,
+                                                     seed=random.randint(0, 2 ** 31 - 1))
         return grad_and_hess_subtree
 
+    @staticmethod
+    def goss_sample(grad_and_hess, top_rate, other_rate, seed=0):
+        """
+        Gradient-based one-side sampling: keep the instances with the top_rate largest absolute gradients,
+        and randomly keep other_rate of all instances from the rest, amplifying their gradients and hessians
+        by (1 - top_rate) / other_rate so that sums over the sample estimate sums over all instances.
+        Gradients of all classes are sampled together by the sum of their absolute values, ties are broken by
+        a hash of the key, so exactly int(top_rate * n) instances are top ones.
+        The tree is built on the sampled grad_and_hess only, instances not in it are still dispatched.
+        """
+        LOGGER.info("goss sample grad and hess, top rate {}, other rate {}".format(top_rate, other_rate))
+        if top_rate >= 1:
+            return grad_and_hess
+
+        def rank(key, g_h):
+            return np.abs(g_h[0]).sum(), hashlib.md5(str(key).encode("utf-8")).hexdigest()
+
+        top_num = int(top_rate * grad_and_hess.count())
+        threshold = (np.inf, "")
+        if top_num > 0:
+            top_ranks = grad_and_hess.mapPartitions(
+                lambda kv_iterator: heapq.nlargest(top_num, (rank(k, g_h) for k, g_h in kv_iterator))).reduce(
+                lambda ranks1, ranks2: heapq.nlargest(top_num, ranks1 + ranks2))
+            threshold = top_ranks[-1]
+
+        other_prob = other_rate / (1 - top_rate)
+        amplify = (1 - top_rate) / other_rate if other_rate > 0 else 0
+
+        def is_sampled(key, g_h):
+            if rank(key, g_h) >= threshold:
+                return True
+            digest = hashlib.md5("{}_{}".format(seed, key).encode("utf-8")).digest()
+            return struct.unpack("<I", digest[:4])[0] < other_prob * 2 ** 32
+
+        sample = grad_and_hess.filter(is_sampled)
+        return sample.map(lambda key, g_h: (key, g_h if rank(key, g_h) >= threshold else
+                                            (g_h[0] * amplify, g_h[1] * amplify)))
+
     def check_convergence(self, loss):
         LOGGER.info("check convergence")
         if self.convegence is None:
@@ -295,27 +358,31 @@ class HeteroSecureBoostingTreeGuest(BoostingTree):
         for i in range(self.num_trees):
             # n_tree = []
             self.compute_grad_and_hess()
-            for tidx in range(self.tree_dim):
-                tree_inst = HeteroDecisionTreeGuest(self.tree_param)
+            if self.lockstep_multi_class and self.tree_dim > 1:
+                self.fit_lockstep_trees(i)
+            else:
+                for tidx in range(self.tree_dim):
+                    tree_inst = HeteroDecisionTreeGuest(self.tree_param)
 
-                tree_inst.set_inputinfo(self.data_bin, self.get_grad_and_hess(tidx), self.bin_split_points,
-                                        self.bin_sparse_points)
+                    tree_inst.set_inputinfo(self.data_bin, self.get_grad_and_hess(tidx), self.bin_split_points,
+                                            self.bin_sparse_points)
 
-                valid_features = self.sample_valid_features()
-                tree_inst.set_valid_features(valid_features)
-                tree_inst.set_encrypter(self.encrypter)
-                tree_inst.set_encrypted_mode_calculator(self.encrypted_calculator)
-                tree_inst.set_flowid(self.generate_flowid(i, tidx))
+                    valid_features = self.sample_valid_features()
+                    tree_inst.set_valid_features(valid_features)
+                    tree_inst.set_encrypter(self.encrypter)
+                    tree_inst.set_encrypted_mode_calculator(self.encrypted_calculator)
+                    tree_inst.set_grad_and_hess_packer(self.grad_and_hess_packer)
+                    tree_inst.set_flowid(self.generate_flowid(i, tidx))
 
-                tree_inst.fit()
+                    tree_inst.fit()
 
-                tree_meta, tree_param = tree_inst.get_model()
-                self.trees_.append(tree_param)
-                if self.tree_meta is None:
-                    self.tree_meta = tree_meta
-                # n_tree.append(tree_inst.get_tree_model())
-                self.update_f_value(new_f=tree_inst.predict_weights, tidx=tidx)
-                self.update_feature_importance(tree_inst.get_feature_importance())
+                    tree_meta, tree_param = tree_inst.get_model()
+                    self.trees_.append(tree_param)
+                    if self.tree_meta is None:
+                        self.tree_meta = tree_meta
+                    # n_tree.append(tree_inst.get_tree_model())
+                    self.update_f_value(new_f=tree_inst.predict_weights, tidx=tidx)
+                    self.update_feature_importance(tree_inst.get_feature_importance())
 
             # self.trees_.append(n_tree)
             loss = self.compute_loss()
@@ -331,7 +398,96 @@ class HeteroSecureBoostingTreeGuest(BoostingTree):
 
         LOGGER.info("end to train secureboosting guest model")
 
+    def fit_lockstep_trees(self, round_num):
+        LOGGER.info("fit {} trees of round {} in lockstep".format(self.tree_dim, round_num))
+        grad_and_hess = self.grad_and_hess
+        if self.use_goss:
+            grad_and_hess = self.goss_sample(grad_and_hess, self.top_rate, self.other_rate,
+                                             seed=random.randint(0, 2 ** 31 - 1))
+
+        tree_inst = HeteroLockstepDecisionTreeGuest(self.tree_param, self.tree_dim)
+        tree_inst.set_inputinfo(self.data_bin, grad_and_hess, self.bin_split_points, self.bin_sparse_points)
+
+        valid_features = [self.sample_valid_features() for tidx in range(self.tree_dim)]
+        tree_inst.set_valid_features(valid_features)
+        tree_inst.set_encrypter(self.encrypter)
+        tree_inst.set_encrypted_mode_calculator(self.encrypted_calculator)
+        tree_inst.set_grad_and_hess_packer(self.grad_and_hess_packer)
+        tree_inst.set_flowid(self.generate_flowid(round_num, 0))
+
+        tree_inst.fit()
+
+        for tree in tree_inst.get_trees():
+            tree_meta, tree_param = tree.get_model()
+            self.trees_.append(tree_param)
+            if self.tree_meta is None:
+                self.tree_meta = tree_meta
+
+        self.update_f_value_by_trees(new_f=tree_inst.predict_weights)
+        self.update_feature_importance(tree_inst.get_feature_importance())
+
+    def compile_trees(self):
+        trees = []
+        for tree_param in self.trees_:
+            tree_inst = HeteroDecisionTreeGuest(self.tree_param)
+            tree_inst.load_model(self.tree_meta, tree_param)
+            trees.append(tree_inst)
+
+        return CompiledTrees([tree_inst.tree_ for tree_inst in trees],
+                             [tree_inst.split_maskdict for tree_inst in trees],
+                             consts.GUEST)
+
+    def sync_host_split_bitmap(self):
+        LOGGER.info("get split bitmaps of hosts")
+        host_split_bitmaps = federation.get(name=self.transfer_inst.host_split_bitmap.name,
+                                            tag=self.transfer_inst.generate_transferid(
+                                                self.transfer_inst.host_split_bitmap),
+                                            idx=-1)
+        return host_split_bitmaps
+
+    @staticmethod
+    def predict_block(kv_list, compiled_trees=None, host_sitenames=None, init_score=None, lr=0.1, tree_dim=1):
+        weights = compiled_trees.predict_weights([features for _, (features, _) in kv_list], consts.GUEST,
+                                                 [host_bitmaps for _, (_, host_bitmaps) in kv_list],
+                                                 host_sitenames)
+        predicts = []
+        for (key, _), tree_weights in zip(kv_list, weights):
+            f_val = copy.deepcopy(init_score)
+            for i in range(compiled_trees.tree_num):
+                f_val = HeteroSecureBoostingTreeGuest.accumulate_f(f_val, tree_weights[i], lr=lr, idx=i % tree_dim)
+            predicts.append((key, f_val))
+
+        return predicts
+
     def predict_f_value(self, data_inst):
+        if self.use_bitmap_predict:
+            self.predict_f_value_by_bitmap(data_inst)
+        else:
+            self.predict_f_value_by_tree(data_inst)
+
+    def predict_f_value_by_bitmap(self, data_inst):
+        """
+        Traverse all trees locally block by block, with the decisions of host split nodes
+        received from each host once as a packed bitmap per row
+        """
+        LOGGER.info("predict tree f value, there are {} trees".format(len(self.trees_)))
+        compiled_trees = self.compile_trees()
+        host_split_bitmaps = self.sync_host_split_bitmap()
+        host_sitenames = [".".join([consts.HOST, str(i)]) for i in range(len(host_split_bitmaps))]
+
+        predict_data = data_inst.lazy().mapValues(lambda inst: (inst.features, []))
+        for split_bitmap in host_split_bitmaps:
+            predict_data = predict_data.join(split_bitmap, lambda value, bitmap: (value[0], value[1] + [bitmap]))
+
+        predict_block = functools.partial(self.predict_block,
+                                          compiled_trees=compiled_trees,
+                                          host_sitenames=host_sitenames,
+                                          init_score=self.init_score,
+                                          lr=self.learning_rate,
+                                          tree_dim=self.tree_dim)
+        self.F = predict_data.toBlocks(predict_block).flatMap(lambda key, predicts: predicts)
+
+    def predict_f_value_by_tree(self, data_inst):
         LOGGER.info("predict tree f value, there are {} trees".format(len(self.trees_)))
         tree_dim = self.tree_dim
         init_score = self.init_score
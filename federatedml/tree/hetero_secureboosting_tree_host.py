@@ -27,8 +27,11 @@
 
 from federatedml.feature.quantile import Quantile
 from federatedml.tree import HeteroDecisionTreeHost
+from federatedml.tree import HeteroLockstepDecisionTreeHost
 from federatedml.tree import BoostingTree
+from federatedml.tree import CompiledTrees
 from federatedml.util import HeteroSecureBoostingTreeTransferVariable
+from federatedml.util import consts
 from arch.api.proto.boosting_tree_model_meta_pb2 import QuantileMeta
 from arch.api.proto.boosting_tree_model_meta_pb2 import BoostingTreeModelMeta
 from arch.api.proto.boosting_tree_model_param_pb2 import BoostingTreeModelParam
@@ -109,23 +112,26 @@ class HeteroSecureBoostingTreeHost(BoostingTree):
 
         for i in range(self.num_trees):
             # n_tree = []
-            for tidx in range(self.tree_dim):
-                tree_inst = HeteroDecisionTreeHost(self.tree_param)
-
-                tree_inst.set_inputinfo(data_bin=self.data_bin, bin_split_points=self.bin_split_points,
-                                        bin_sparse_points=self.bin_sparse_points)
-
-                valid_features = self.sample_valid_features()
-                tree_inst.set_flowid(self.generate_flowid(i, tidx))
-                tree_inst.set_runtime_idx(self.runtime_idx)
-                tree_inst.set_valid_features(valid_features)
-
-                tree_inst.fit()
-                tree_meta, tree_param = tree_inst.get_model()
-                self.trees_.append(tree_param)
-                if self.tree_meta is None:
-                    self.tree_meta = tree_meta
-                # n_tree.append(tree_inst.get_tree_model())
+            if self.lockstep_multi_class and self.tree_dim > 1:
+                self.fit_lockstep_trees(i)
+            else:
+                for tidx in range(self.tree_dim):
+                    tree_inst = HeteroDecisionTreeHost(self.tree_param)
+
+                    tree_inst.set_inputinfo(data_bin=self.data_bin, bin_split_points=self.bin_split_points,
+                                            bin_sparse_points=self.bin_sparse_points)
+
+                    valid_features = self.sample_valid_features()
+                    tree_inst.set_flowid(self.generate_flowid(i, tidx))
+                    tree_inst.set_runtime_idx(self.runtime_idx)
+                    tree_inst.set_valid_features(valid_features)
+
+                    tree_inst.fit()
+                    tree_meta, tree_param = tree_inst.get_model()
+                    self.trees_.append(tree_param)
+                    if self.tree_meta is None:
+                        self.tree_meta = tree_meta
+                    # n_tree.append(tree_inst.get_tree_model())
 
             # self.trees_.append(n_tree)
 
@@ -136,7 +142,64 @@ class HeteroSecureBoostingTreeHost(BoostingTree):
 
         LOGGER.info("end to train secureboosting guest model")
 
+    def fit_lockstep_trees(self, round_num):
+        LOGGER.info("fit {} trees of round {} in lockstep".format(self.tree_dim, round_num))
+        tree_inst = HeteroLockstepDecisionTreeHost(self.tree_param, self.tree_dim)
+        tree_inst.set_inputinfo(data_bin=self.data_bin, bin_split_points=self.bin_split_points,
+                                bin_sparse_points=self.bin_sparse_points)
+
+        valid_features = [self.sample_valid_features() for tidx in range(self.tree_dim)]
+        tree_inst.set_flowid(self.generate_flowid(round_num, 0))
+        tree_inst.set_runtime_idx(self.runtime_idx)
+        tree_inst.set_valid_features(valid_features)
+
+        tree_inst.fit()
+        for tree in tree_inst.get_trees():
+            tree_meta, tree_param = tree.get_model()
+            self.trees_.append(tree_param)
+            if self.tree_meta is None:
+                self.tree_meta = tree_meta
+
+    def compile_trees(self):
+        trees = []
+        for tree_param in self.trees_:
+            tree_inst = HeteroDecisionTreeHost(self.tree_param)
+            tree_inst.load_model(self.tree_meta, tree_param)
+            trees.append(tree_inst)
+
+        sitename = ".".join([consts.HOST, str(self.runtime_idx)])
+        return CompiledTrees([tree_inst.tree_ for tree_inst in trees],
+                             [tree_inst.split_maskdict for tree_inst in trees],
+                             sitename), sitename
+
+    def sync_host_split_bitmap(self, split_bitmap):
+        LOGGER.info("send split bitmap of host to guest")
+        federation.remote(obj=split_bitmap,
+                          name=self.transfer_inst.host_split_bitmap.name,
+                          tag=self.transfer_inst.generate_transferid(self.transfer_inst.host_split_bitmap),
+                          role=consts.GUEST,
+                          idx=0)
+
     def predict(self, data_inst, predict_param=None):
+        if self.use_bitmap_predict:
+            self.predict_by_bitmap(data_inst, predict_param)
+        else:
+            self.predict_by_tree(data_inst, predict_param)
+
+    def predict_by_bitmap(self, data_inst, predict_param=None):
+        """
+        Compute the left/right decisions of all host split nodes of all trees for each row in one pass,
+        and send them to guest once as a packed bitmap, guest traverses the trees locally
+        """
+        LOGGER.info("start predict")
+        data_inst = self.data_alignment(data_inst)
+        compiled_trees, sitename = self.compile_trees()
+        split_bitmap = data_inst.mapValues(lambda inst: compiled_trees.split_bitmap(inst.features, sitename))
+        self.sync_host_split_bitmap(split_bitmap)
+
+        LOGGER.info("end predict")
+
+    def predict_by_tree(self, data_inst, predict_param=None):
         LOGGER.info("start predict")
         data_inst = self.data_alignment(data_inst)
         rounds = len(self.trees_) // self.tree_dim
@@ -27,7 +27,9 @@
 
 from arch.api import eggroll
 from arch.api.utils import log_utils
+import numpy as np
 import warnings
+from federatedml.secureprotol.encrypted_vector import EncryptedMatrix
 from federatedml.tree import XgboostCriterion
 from federatedml.tree import SplitInfo
 from federatedml.util import consts
@@ -57,58 +59,106 @@ class Splitter(object):
         self.min_sample_split = min_sample_split
         self.min_leaf_node = min_leaf_node
 
-    def find_split_single_histogram_guest(self, histogram, valid_features):
-        best_fid = None
-        best_gain = self.min_impurity_split - consts.FLOAT_ZERO
-        best_bid = None
-        best_sum_grad_l = None
-        best_sum_hess_l = None
-        for fid in range(len(histogram)):
-            if valid_features[fid] is False:
-                continue
-            bin_num = len(histogram[fid])
-            if bin_num == 0:
+    @staticmethod
+    def histogram_array(histograms):
+        """
+        Convert accumulated histograms of nodes, each an ndarray or a list of features of list of bins
+        of [sum_grad, sum_hess, count], to an ndarray of shape (node_num, feature_num, bin_num, 3).
+
+        return ndarray and bin mask of shape (feature_num, bin_num), which is None for an ndarray input,
+        False for the bins padded to features having fewer bins than bin_num
+        """
+        if isinstance(histograms, np.ndarray):
+            return histograms, None
+        if histograms and all(isinstance(histogram, np.ndarray) for histogram in histograms):
+            return np.stack(histograms), None
+
+        feature_bin_nums = [len(feature_histogram) for feature_histogram in histograms[0]] if histograms else []
+        bin_num = max(feature_bin_nums, default=0)
+        histogram_array = np.zeros((len(histograms), len(feature_bin_nums), bin_num, 3))
+        for nid, histogram in enumerate(histograms):
+            for fid, feature_histogram in enumerate(histogram):
+                if len(feature_histogram) > 0:
+                    histogram_array[nid, fid, :len(feature_histogram)] = feature_histogram
+        bin_mask = np.arange(bin_num) < np.asarray(feature_bin_nums, dtype=np.int64)[:, np.newaxis]
+        return histogram_array, bin_mask
+
+    def find_best_splits(self, histograms, valid_features, bin_mask=None):
+        """
+        Search the best split of every node at once, over all (node, feature, bin) candidates.
+
+        Parameters
+        ----------
+        histograms : ndarray of shape (node_num, feature_num, bin_num, 3), accumulated histograms
+
+        valid_features : list of bool, features marked False are skipped
+
+        bin_mask : ndarray of shape (feature_num, bin_num), bins to search, None for all
+
+        return list of SplitInfo of guest, one for each node
+        """
+        node_num, feature_num, bin_num, _ = histograms.shape
+        if feature_num == 0 or bin_num == 0:
+            return [self.no_split_guest() for nid in range(node_num)]
+        if bin_mask is None:
+            bin_mask = np.ones((feature_num, bin_num), dtype=bool)
+
+        feature_mask = np.fromiter((valid_features[fid] is not False for fid in range(feature_num)),
+                                   dtype=bool, count=feature_num) & bin_mask.any(axis=1)
+        last_bids = np.maximum(bin_mask.sum(axis=1) - 1, 0)
+        node_sums = histograms[:, np.arange(feature_num), last_bids]
+
+        # the search of a node stops at the first feature having fewer samples than min_sample_split
+        feature_mask = feature_mask & ~np.logical_or.accumulate(
+            feature_mask & (node_sums[:, :, 2] < self.min_sample_split), axis=1)
+
+        sum_grad = node_sums[:, :, np.newaxis, 0]
+        sum_hess = node_sums[:, :, np.newaxis, 1]
+        sum_grad_l = histograms[..., 0]
+        sum_hess_l = histograms[..., 1]
+        node_cnt_l = histograms[..., 2]
+        sum_grad_r = sum_grad - sum_grad_l
+        sum_hess_r = sum_hess - sum_hess_l
+        node_cnt_r = node_sums[:, :, np.newaxis, 2] - node_cnt_l
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gains = self.criterion.split_gain([sum_grad, sum_hess],
+                                              [sum_grad_l, sum_hess_l], [sum_grad_r, sum_hess_r])
+
+        candidates = feature_mask[:, :, np.newaxis] & bin_mask & \
+                     (node_cnt_l >= self.min_leaf_node) & (node_cnt_r >= self.min_leaf_node) & \
+                     (gains > self.min_impurity_split)
+        gains = np.where(candidates, gains, -np.inf).reshape(node_num, -1)
+        best_candidates = np.argmax(gains, axis=1)
+        has_split = candidates.reshape(node_num, -1).any(axis=1)
+
+        splitinfos = []
+        for nid in range(node_num):
+            if not has_split[nid]:
+                splitinfos.append(self.no_split_guest())
                 continue
-            sum_grad = histogram[fid][bin_num - 1][0]
-            sum_hess = histogram[fid][bin_num - 1][1]
-            node_cnt = histogram[fid][bin_num - 1][2]
-
-            if node_cnt < self.min_sample_split:
-                break
-
-            for bid in range(bin_num):
-                sum_grad_l = histogram[fid][bid][0]
-                sum_hess_l = histogram[fid][bid][1]
-                node_cnt_l = histogram[fid][bid][2]
 
-                sum_grad_r = sum_grad - sum_grad_l
-                sum_hess_r = sum_hess - sum_hess_l
-                node_cnt_r = node_cnt - node_cnt_l
+            fid, bid = divmod(int(best_candidates[nid]), bin_num)
+            splitinfos.append(SplitInfo(sitename=consts.GUEST, best_fid=fid, best_bid=bid,
+                                        gain=gains[nid, best_candidates[nid]],
+                                        sum_grad=sum_grad_l[nid, fid, bid], sum_hess=sum_hess_l[nid, fid, bid],
+                                        sample_count=node_cnt_l[nid, fid, bid]))
 
-                if node_cnt_l >= self.min_leaf_node and node_cnt_r >= self.min_leaf_node:
-                    gain = self.criterion.split_gain([sum_grad, sum_hess],
-                                                     [sum_grad_l, sum_hess_l], [sum_grad_r, sum_hess_r])
+        return splitinfos
 
-                    if gain > self.min_impurity_split and gain > best_gain:
-                        best_gain = gain
-                        best_fid = fid
-                        best_bid = bid
-                        best_sum_grad_l = sum_grad_l
-                        best_sum_hess_l = sum_hess_l
+    def no_split_guest(self):
+        return SplitInfo(sitename=consts.GUEST, best_fid=None, best_bid=None,
+                         gain=self.min_impurity_split - consts.FLOAT_ZERO,
+                         sum_grad=None, sum_hess=None, sample_count=-1)
 
-        splitinfo = SplitInfo(sitename=consts.GUEST, best_fid=best_fid, best_bid=best_bid,
-                              gain=best_gain, sum_grad=best_sum_grad_l, sum_hess=best_sum_hess_l)
-
-        return splitinfo
+    def find_split_single_histogram_guest(self, histogram, valid_features):
+        histograms, bin_mask = self.histogram_array([histogram])
+        return self.find_best_splits(histograms, valid_features, bin_mask)[0]
 
-    def find_split(self, histograms, valid_features, partitions=1):
+    def find_split(self, histograms, valid_features):
         LOGGER.info("splitter find split of raw data")
-        histogram_table = eggroll.parallelize(histograms, include_key=False, partition=partitions)
-        splitinfo_table = histogram_table.mapValues(lambda sub_hist:
-                                                    self.find_split_single_histogram_guest(sub_hist, valid_features))
-        tree_node_splitinfo = [splitinfo[1] for splitinfo in splitinfo_table.collect()]
-
-        return tree_node_splitinfo
+        histograms, bin_mask = self.histogram_array(histograms)
+        return self.find_best_splits(histograms, valid_features, bin_mask)
 
     def find_split_single_histogram_host(self, histogram, valid_features, sitename):
         node_splitinfo = []
@@ -133,11 +183,16 @@ class Splitter(object):
 
                 if node_cnt_l >= self.min_leaf_node and node_cnt_r >= self.min_leaf_node:
                     splitinfo = SplitInfo(sitename=sitename, best_fid=fid,
-                                          best_bid=bid, sum_grad=sum_grad_l, sum_hess=sum_hess_l)
+                                          best_bid=bid, sum_grad=sum_grad_l, sum_hess=sum_hess_l,
+                                          sample_count=node_cnt_l)
 
                     node_splitinfo.append(splitinfo)
                     node_grad_hess.append((sum_grad_l, sum_hess_l))
 
+        # sent to guest, so keep the encrypted pairs compact, packed pairs of (ciphertext, 0) are left as they are
+        if EncryptedMatrix.can_hold(node_grad_hess):
+            node_grad_hess = EncryptedMatrix.from_encrypted_numbers(node_grad_hess)
+
         return node_splitinfo, node_grad_hess
 
     def find_split_host(self, histograms, valid_features, partitions=1, sitename=consts.HOST):
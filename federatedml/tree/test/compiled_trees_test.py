@@ -0,0 +1,86 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import unittest
+
+import numpy as np
+from federatedml.feature.sparse_vector import SparseVector
+from federatedml.tree import CompiledTrees
+from federatedml.tree import Node
+
+
+class TestCompiledTrees(unittest.TestCase):
+    def setUp(self):
+        self.random_state = np.random.RandomState(0)
+        self.sitenames = ["guest", "host.0", "host.1"]
+        self.features = {sitename: [SparseVector(np.arange(4), self.random_state.rand(4), 4) for _ in range(50)]
+                         for sitename in self.sitenames}
+        self.trees = [self.random_tree(depth) for depth in [0, 1, 3, 4]]
+
+    def random_tree(self, max_depth):
+        tree_ = []
+        split_maskdicts = {sitename: {} for sitename in self.sitenames}
+        queue = [(0, 0)]
+        while queue:
+            nid, depth = queue.pop(0)
+            if depth == max_depth or self.random_state.rand() < 0.2:
+                tree_.append(Node(id=nid, weight=self.random_state.randn(), is_leaf=True))
+                continue
+            sitename = self.sitenames[self.random_state.randint(len(self.sitenames))]
+            left_nodeid = len(tree_) + len(queue) + 1
+            tree_.append(Node(id=nid, sitename=sitename, fid=self.random_state.randint(4),
+                              left_nodeid=left_nodeid, right_nodeid=left_nodeid + 1))
+            split_maskdicts[sitename][nid] = self.random_state.rand()
+            queue.extend([(left_nodeid, depth + 1), (left_nodeid + 1, depth + 1)])
+        return tree_, split_maskdicts
+
+    def traverse(self, tree_, split_maskdicts, row):
+        nid = 0
+        while not tree_[nid].is_leaf:
+            node = tree_[nid]
+            if self.features[node.sitename][row].get_data(node.fid, 0) <= split_maskdicts[node.sitename][nid]:
+                nid = node.left_nodeid
+            else:
+                nid = node.right_nodeid
+        return tree_[nid].weight
+
+    def compile(self, sitename):
+        return CompiledTrees([tree_ for tree_, _ in self.trees],
+                             [split_maskdicts[sitename] for _, split_maskdicts in self.trees], sitename)
+
+    def test_predict_weights(self):
+        host_sitenames = self.sitenames[1:]
+        host_bitmaps = [[self.compile(sitename).split_bitmap(self.features[sitename][row], sitename)
+                         for sitename in host_sitenames] for row in range(50)]
+
+        weights = self.compile("guest").predict_weights(self.features["guest"], "guest", host_bitmaps, host_sitenames)
+        self.assertEqual(weights.shape, (50, len(self.trees)))
+        for row in range(50):
+            for tidx, (tree_, split_maskdicts) in enumerate(self.trees):
+                self.assertEqual(weights[row, tidx], self.traverse(tree_, split_maskdicts, row))
+
+    def test_split_nodes(self):
+        compiled_trees = self.compile("host.0")
+        tree_idx, node_idx = compiled_trees.split_nodes("host.0")
+        expect = [(tidx, node.id) for tidx, (tree_, _) in enumerate(self.trees)
+                  for node in tree_ if not node.is_leaf and node.sitename == "host.0"]
+        self.assertEqual(list(zip(tree_idx, node_idx)), expect)
+        bitmap = compiled_trees.split_bitmap(self.features["host.0"][0], "host.0")
+        self.assertEqual(len(bitmap), (len(expect) + 7) // 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import unittest
+
+import numpy as np
+
+from federatedml.param import DecisionTreeParam
+from federatedml.tree import DecisionTree
+from federatedml.tree import Node
+
+
+class DirectHistogramTree(DecisionTree):
+    """
+    computes the histograms of the rows of each node from arrays, and records the nodes it computes
+    """
+    def __init__(self, bins, grad, hess, bin_num):
+        super(DirectHistogramTree, self).__init__(DecisionTreeParam())
+        self.bins = bins
+        self.grad_hess = np.stack([grad, hess, np.ones(grad.shape[0])], axis=1)
+        self.bin_num = bin_num
+        self.node_rows = {}
+        self.computed_nodes = []
+
+    def histogram(self, nid):
+        rows = self.node_rows[nid]
+        histogram = np.zeros((self.bins.shape[1], self.bin_num, 3))
+        for fid in range(self.bins.shape[1]):
+            np.add.at(histogram[fid], self.bins[rows, fid], self.grad_hess[rows])
+        return histogram
+
+    def compute_histograms(self, node_map):
+        histograms = [None for i in range(len(node_map))]
+        for nid, idx in node_map.items():
+            self.computed_nodes.append(nid)
+            histograms[idx] = self.histogram(nid)
+        return histograms
+
+    def grow(self, nodes):
+        self.reset_histogram_cache()
+        self.computed_nodes = []
+        self.cur_split_nodes = [Node(id=nid, parent_nodeid=parent, sibling_nodeid=sibling,
+                                     sample_num=len(self.node_rows[nid])) for nid, parent, sibling in nodes]
+        return self.get_histograms(dict((nid, i) for i, (nid, _, _) in enumerate(nodes)))
+
+
+class TestDecisionTree(unittest.TestCase):
+    def test_histogram_subtraction(self):
+        bins = np.random.randint(0, 4, (100, 3))
+        tree = DirectHistogramTree(bins, np.random.uniform(-1, 1, 100), np.random.uniform(0, 1, 100), 4)
+        # the larger child is the left one under node 0, the right one under node 1
+        tree.node_rows = {0: np.arange(100), 1: np.arange(70), 2: np.arange(70, 100),
+                          3: np.arange(20), 4: np.arange(20, 70), 5: np.arange(70, 80), 6: np.arange(80, 100)}
+        tree.grow([(0, -1, -1)])
+        self.assertEqual(tree.computed_nodes, [0])
+
+        histograms = tree.grow([(1, 0, 2), (2, 0, 1)])
+        self.assertEqual(tree.computed_nodes, [2])
+        for nid, histogram in zip([1, 2], histograms):
+            self.assertTrue(np.allclose(histogram, tree.histogram(nid)))
+
+        # the parent histogram of nodes 5 and 6 is missing, both are computed
+        del tree.cur_histograms[2]
+        histograms = tree.grow([(3, 1, 4), (4, 1, 3), (5, 2, 6), (6, 2, 5)])
+        self.assertEqual(sorted(tree.computed_nodes), [3, 5, 6])
+        for nid, histogram in zip([3, 4, 5, 6], histograms):
+            self.assertTrue(np.allclose(histogram, tree.histogram(nid)))
+
+    def test_split_lockstep_tree(self):
+        # tree 0: 0 -> (2, 3), 3 -> (6, 7); tree 1: 1 -> (4, 5); node ids are given level by level
+        tree_ = [Node(id=0, fid=0, left_nodeid=2, right_nodeid=3),
+                 Node(id=1, fid=1, left_nodeid=4, right_nodeid=5),
+                 Node(id=2, weight=0.2, is_leaf=True, parent_nodeid=0, sibling_nodeid=3),
+                 Node(id=3, fid=3, left_nodeid=6, right_nodeid=7, parent_nodeid=0, sibling_nodeid=2),
+                 Node(id=4, weight=0.4, is_leaf=True, parent_nodeid=1, sibling_nodeid=5),
+                 Node(id=5, weight=0.5, is_leaf=True, parent_nodeid=1, sibling_nodeid=4),
+                 Node(id=6, weight=0.6, is_leaf=True, parent_nodeid=3, sibling_nodeid=7),
+                 Node(id=7, weight=0.7, is_leaf=True, parent_nodeid=3, sibling_nodeid=6)]
+        split_maskdict = {0: 1.0, 1: 1.1, 3: 1.3}
+
+        trees = DecisionTree.split_lockstep_tree(tree_, split_maskdict, 2)
+        self.assertEqual(len(trees), 2)
+
+        tree0, split_maskdict0 = trees[0]
+        self.assertEqual([node.id for node in tree0], [0, 1, 2, 3, 4])
+        self.assertEqual([(node.left_nodeid, node.right_nodeid) for node in tree0],
+                         [(1, 2), (-1, -1), (3, 4), (-1, -1), (-1, -1)])
+        self.assertEqual([node.weight for node in tree0 if node.is_leaf], [0.2, 0.6, 0.7])
+        self.assertEqual([(node.parent_nodeid, node.sibling_nodeid) for node in tree0],
+                         [(-1, -1), (0, 2), (0, 1), (2, 4), (2, 3)])
+        self.assertEqual(split_maskdict0, {0: 1.0, 2: 1.3})
+
+        tree1, split_maskdict1 = trees[1]
+        self.assertEqual([(node.id, node.fid) for node in tree1], [(0, 1), (1, None), (2, None)])
+        self.assertEqual([node.weight for node in tree1 if node.is_leaf], [0.4, 0.5])
+        self.assertEqual(split_maskdict1, {0: 1.1})
+
+        self.assertEqual(tree_[3].id, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -20,6 +20,7 @@ from arch.api import eggroll
 from federatedml.tree import FeatureHistogram
 from federatedml.feature.instance import Instance
 from federatedml.feature.sparse_vector import SparseVector
+from federatedml.secureprotol import PaillierEncrypt
 from federatedml.util import consts
 import copy
 import numpy as np
@@ -91,6 +92,114 @@ class TestFeatureHistogram(unittest.TestCase):
                     for r in range(len(his2[i][j][k])):
                         self.assertTrue(np.fabs(his2[i][j][k][r] - histograms[i][j][k][r]) < consts.FLOAT_ZERO)
 
+    def test_calculate_histogram_with_valid_features(self):
+        valid_features = [i % 3 != 0 for i in range(10)]
+        bin_sparse = [i % 6 for i in range(10)]
+        histograms = self.feature_histogram.calculate_histogram(
+            self.data_bin, self.grad_and_hess,
+            self.bin_split_points, bin_sparse,
+            valid_features=valid_features, node_map=self.node_map)
+
+        his2 = [[[[0 for i in range(3)]
+                  for j in range(6)]
+                 for k in range(10)]
+                for r in range(4)]
+        for i in range(1000):
+            grad, hess = self.grad_and_hess_list[i]
+            id = self.node_map[self.data_insts[i][1][1]]
+            for fid in range(10):
+                if not valid_features[fid]:
+                    continue
+                bid = self.data_insts[i][0].features.get_data(fid, bin_sparse[fid])
+                his2[id][fid][bid][0] += grad
+                his2[id][fid][bid][1] += hess
+                his2[id][fid][bid][2] += 1
+
+        for i in range(len(his2)):
+            for j in range(len(his2[i])):
+                for k in range(len(his2[i][j])):
+                    for r in range(len(his2[i][j][k])):
+                        self.assertTrue(np.fabs(his2[i][j][k][r] - histograms[i][j][k][r]) < consts.FLOAT_ZERO)
+
+    def test_calculate_histogram_of_lockstep_trees(self):
+        other_grad_and_hess_list = [(random.random(), random.random()) for i in range(1000)]
+        data_insts = [(inst, [nodeid_state, (0 if i % 5 == 0 else 1, 4 + i % 4)])
+                      for i, (inst, nodeid_state) in enumerate(self.data_insts)]
+        grad_and_hess = eggroll.parallelize(zip(self.grad_and_hess_list, other_grad_and_hess_list), include_key=False)
+        node_map = dict((nid, nid) for nid in range(8))
+        for valid_features in [None, [i % 3 != 0 for i in range(10)]]:
+            histograms = self.feature_histogram.calculate_histogram(
+                eggroll.parallelize(data_insts, include_key=False), grad_and_hess,
+                self.bin_split_points, self.bin_sparse,
+                valid_features=valid_features, node_map=node_map)
+
+            tree_histograms = self.feature_histogram.calculate_histogram(
+                self.data_bin, self.grad_and_hess,
+                self.bin_split_points, self.bin_sparse,
+                valid_features=valid_features, node_map=self.node_map)
+            self.assertTrue(np.max(np.fabs(np.array(histograms[:4]) - np.array(tree_histograms))) < consts.FLOAT_ZERO)
+
+            other_tree_histograms = self.feature_histogram.calculate_histogram(
+                eggroll.parallelize([(inst, nodeid_states[1]) for inst, nodeid_states in data_insts],
+                                    include_key=False),
+                eggroll.parallelize(other_grad_and_hess_list, include_key=False),
+                self.bin_split_points, self.bin_sparse,
+                valid_features=valid_features, node_map=dict((nid + 4, nid) for nid in range(4)))
+            self.assertTrue(
+                np.max(np.fabs(np.array(histograms[4:]) - np.array(other_tree_histograms))) < consts.FLOAT_ZERO)
+
+    def test_calculate_empty_histogram(self):
+        node_map = {4: 0, 5: 1}
+        histograms = self.feature_histogram.calculate_histogram(
+            self.data_bin, self.grad_and_hess,
+            self.bin_split_points, self.bin_sparse,
+            node_map=node_map)
+        self.assertTrue(isinstance(histograms, np.ndarray))
+        self.assertEqual(histograms.shape, (2, 10, 6, 3))
+        self.assertFalse(histograms.any())
+
+        encrypter = PaillierEncrypt()
+        encrypter.generate_key(1024)
+        data_insts = self.data_insts[:10]
+        grad_and_hess = eggroll.parallelize([tuple(encrypter.encrypt(v) for v in g_h)
+                                             for g_h in self.grad_and_hess_list[:10]], include_key=False)
+        valid_features = [i % 3 != 0 for i in range(10)]
+        histograms = self.feature_histogram.calculate_histogram(
+            eggroll.parallelize(data_insts, include_key=False), grad_and_hess,
+            self.bin_split_points, self.bin_sparse,
+            valid_features=valid_features, node_map=node_map)
+        self.assertTrue(isinstance(histograms, list))
+        self.assertEqual(histograms, self.feature_histogram.zero_histogram(self.bin_split_points,
+                                                                           valid_features, node_map))
+        self.assertEqual(histograms[0][0], [])
+        self.assertEqual(histograms[0][1], [[0, 0, 0] for i in range(6)])
+
+    def test_accumulate_dense_histogram(self):
+        data = np.random.random((5, 4, 3, 3))
+        histograms = self.feature_histogram.accumulate_histogram(data.copy())
+        for i in range(data.shape[0]):
+            for j in range(data.shape[1]):
+                for k in range(1, data.shape[2]):
+                    data[i][j][k] += data[i][j][k - 1]
+                    self.assertTrue(np.max(np.fabs(data[i][j][k] - histograms[i][j][k])) < consts.FLOAT_ZERO)
+
+    def test_subtract_histogram(self):
+        parent = [[[random.randint(10, 20) for i in range(3)]
+                   for j in range(4)]
+                  for k in range(5)]
+        child = [[[random.randint(0, 10) for i in range(3)]
+                  for j in range(4)]
+                 for k in range(5)]
+
+        sibling = self.feature_histogram.subtract_histogram(parent, child)
+        for i in range(len(parent)):
+            for j in range(len(parent[i])):
+                for k in range(len(parent[i][j])):
+                    self.assertTrue(parent[i][j][k] - child[i][j][k] == sibling[i][j][k])
+
+        dense_sibling = self.feature_histogram.subtract_histogram(np.array(parent), np.array(child))
+        self.assertTrue((dense_sibling == np.array(sibling)).all())
+
     def test_aggregate_histogram(self):
         data1 = [[[[random.randint(0, 10) for i in range(2)]
                    for j in range(3)]
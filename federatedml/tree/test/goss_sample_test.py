@@ -0,0 +1,77 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import unittest
+
+import numpy as np
+from arch.api import eggroll
+
+eggroll.init("test_goss_sample")
+
+from federatedml.tree import HeteroSecureBoostingTreeGuest
+
+
+class TestGossSample(unittest.TestCase):
+    def setUp(self):
+        random_state = np.random.RandomState(0)
+        self.grad_and_hess = {"id" + str(i): (g, h) for i, (g, h) in
+                              enumerate(zip(random_state.randn(10000), random_state.rand(10000)))}
+        self.table = eggroll.parallelize(self.grad_and_hess.items(), include_key=True, partition=4)
+
+    def test_top_and_other(self):
+        sample = dict(HeteroSecureBoostingTreeGuest.goss_sample(self.table, 0.2, 0.1, seed=1).collect())
+        threshold = sorted([abs(g) for g, _ in self.grad_and_hess.values()], reverse=True)[1999]
+
+        top_keys = [k for k, (g, _) in self.grad_and_hess.items() if abs(g) >= threshold]
+        self.assertEqual(len(top_keys), 2000)
+        for k in top_keys:
+            self.assertEqual(sample[k], self.grad_and_hess[k])
+
+        other_keys = set(sample) - set(top_keys)
+        self.assertTrue(800 < len(other_keys) < 1200)
+        for k in other_keys:
+            g, h = self.grad_and_hess[k]
+            self.assertTrue(abs(g) < threshold)
+            self.assertAlmostEqual(sample[k][0], g * 8)
+            self.assertAlmostEqual(sample[k][1], h * 8)
+
+    def test_ties(self):
+        # equal gradients are ranked by key, exactly top_rate of the instances are kept as they are
+        grad_and_hess = {"id" + str(i): (1.0 if i < 3000 else 0.5, 1.0) for i in range(10000)}
+        table = eggroll.parallelize(grad_and_hess.items(), include_key=True, partition=4)
+        sample = dict(HeteroSecureBoostingTreeGuest.goss_sample(table, 0.2, 0.1, seed=1).collect())
+        top_keys = [k for k, g_h in sample.items() if g_h == grad_and_hess[k]]
+        self.assertEqual(len(top_keys), 2000)
+        self.assertTrue(all(grad_and_hess[k][0] == 1.0 for k in top_keys))
+        self.assertTrue(all(v == (grad_and_hess[k][0] * 8, 8.0) for k, v in sample.items() if k not in top_keys))
+
+        sample2 = dict(HeteroSecureBoostingTreeGuest.goss_sample(table, 0.2, 0.1, seed=2).collect())
+        self.assertEqual(sorted(k for k, g_h in sample2.items() if g_h == grad_and_hess[k]), sorted(top_keys))
+
+    def test_seed(self):
+        sample1 = HeteroSecureBoostingTreeGuest.goss_sample(self.table, 0.1, 0.2, seed=1)
+        sample2 = HeteroSecureBoostingTreeGuest.goss_sample(self.table, 0.1, 0.2, seed=1)
+        sample3 = HeteroSecureBoostingTreeGuest.goss_sample(self.table, 0.1, 0.2, seed=2)
+        self.assertEqual(sorted(k for k, _ in sample1.collect()), sorted(k for k, _ in sample2.collect()))
+        self.assertNotEqual(sorted(k for k, _ in sample1.collect()), sorted(k for k, _ in sample3.collect()))
+
+    def test_keep_all(self):
+        sample = HeteroSecureBoostingTreeGuest.goss_sample(self.table, 1, 0)
+        self.assertEqual(dict(sample.collect()), self.grad_and_hess)
+
+
+if __name__ == '__main__':
+    unittest.main()
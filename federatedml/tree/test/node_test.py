@@ -26,9 +26,11 @@ class TestNode(unittest.TestCase):
     def test_node(self):
         param_dict = {"id": 5, "sitename": "test", "fid": 55, "bid": 555,
                       "weight": -1, "is_leaf": True, "sum_grad": 2, "sum_hess": 3,
-                      "left_nodeid": 6, "right_nodeid": 7}
+                      "left_nodeid": 6, "right_nodeid": 7,
+                      "parent_nodeid": 2, "sibling_nodeid": 4, "sample_num": 100}
         node = Node(id=5, sitename="test", fid=55, bid=555, weight=-1, is_leaf=True,
-                    sum_grad=2, sum_hess=3, left_nodeid=6, right_nodeid=7)
+                    sum_grad=2, sum_hess=3, left_nodeid=6, right_nodeid=7,
+                    parent_nodeid=2, sibling_nodeid=4, sample_num=100)
         for key in param_dict:
             self.assertTrue(param_dict[key] == getattr(node, key))
 
@@ -41,9 +43,10 @@ class TestSplitInfo(unittest.TestCase):
         pass
         param_dict = {"sitename": "testsplitinfo",
                       "best_fid": 23, "best_bid": 233,
-                      "sum_grad": 2333, "sum_hess": 23333, "gain": 233333}
+                      "sum_grad": 2333, "sum_hess": 23333, "gain": 233333,
+                      "sample_count": 2333333}
         splitinfo = SplitInfo(sitename="testsplitinfo", best_fid=23, best_bid=233,
-                              sum_grad=2333, sum_hess=23333, gain=233333)
+                              sum_grad=2333, sum_hess=23333, gain=233333, sample_count=2333333)
         for key in param_dict:
             self.assertTrue(param_dict[key] == getattr(splitinfo, key))
 
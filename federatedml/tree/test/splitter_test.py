@@ -0,0 +1,80 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import unittest
+
+import numpy as np
+from federatedml.tree import Splitter
+
+
+class TestSplitter(unittest.TestCase):
+    def setUp(self):
+        self.splitter = Splitter("xgboost", [0.1], min_impurity_split=1e-2, min_sample_split=2, min_leaf_node=1)
+        random_state = np.random.RandomState(0)
+        counts = random_state.randint(0, 4, size=(4, 6, 5)).astype(float)
+        grads = random_state.randn(4, 6, 5) * (counts > 0)
+        hesses = random_state.rand(4, 6, 5) * (counts > 0)
+        self.histograms = np.cumsum(np.stack([grads, hesses, counts], axis=3), axis=2)
+        self.valid_features = [True, False, True, True, False, True]
+
+    def brute_force_split(self, histogram):
+        best = (None, None, self.splitter.min_impurity_split)
+        for fid, feature_histogram in enumerate(histogram):
+            if not self.valid_features[fid]:
+                continue
+            sum_grad, sum_hess, node_cnt = feature_histogram[-1]
+            for bid, (sum_grad_l, sum_hess_l, node_cnt_l) in enumerate(feature_histogram):
+                if node_cnt_l < 1 or node_cnt - node_cnt_l < 1:
+                    continue
+                gain = self.splitter.split_gain(sum_grad, sum_hess, sum_grad_l, sum_hess_l,
+                                                sum_grad - sum_grad_l, sum_hess - sum_hess_l)
+                if gain > best[2]:
+                    best = (fid, bid, gain)
+        return best
+
+    def test_find_split(self):
+        splitinfos = self.splitter.find_split(self.histograms, self.valid_features)
+        self.assertEqual(len(splitinfos), 4)
+        node_splitinfos = self.splitter.find_split(list(self.histograms), self.valid_features)
+        self.assertEqual([s.best_bid for s in node_splitinfos], [s.best_bid for s in splitinfos])
+        for histogram, splitinfo in zip(self.histograms, splitinfos):
+            best_fid, best_bid, best_gain = self.brute_force_split(histogram)
+            self.assertEqual(splitinfo.best_fid, best_fid)
+            self.assertEqual(splitinfo.best_bid, best_bid)
+            if best_fid is not None:
+                self.assertAlmostEqual(splitinfo.gain, best_gain)
+                self.assertEqual(splitinfo.sum_grad, histogram[best_fid][best_bid][0])
+                self.assertEqual(splitinfo.sample_count, histogram[best_fid][best_bid][2])
+
+    def test_list_histograms(self):
+        histograms = self.histograms.tolist()
+        for histogram in histograms:
+            histogram[1] = []
+            histogram[2] = histogram[2][:3]
+        splitinfos = self.splitter.find_split(histograms, self.valid_features)
+        for histogram, splitinfo in zip(histograms, splitinfos):
+            self.assertEqual(splitinfo.best_fid, self.brute_force_split(histogram)[0])
+            self.assertEqual(splitinfo.best_bid, self.brute_force_split(histogram)[1])
+
+    def test_min_sample_split(self):
+        self.splitter.min_sample_split = np.inf
+        for splitinfo in self.splitter.find_split(self.histograms, self.valid_features):
+            self.assertIsNone(splitinfo.best_fid)
+            self.assertEqual(splitinfo.sample_count, -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -38,6 +38,10 @@ HOMO = "homo"
 
 RAW = "raw"
 RSA = "rsa"
+RSA_SIGN_CACHE_NAMESPACE = "rsa_sign_cache"
+TABLE = "table"
+BLOOM_FILTER = "bloom_filter"
+BLOOM_FILTER_CHUNK_SIZE = 2 ** 20
 
 # evaluation
 AUC = "auc"
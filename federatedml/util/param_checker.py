@@ -270,6 +270,31 @@ class BoostingTreeParamChecker(object):
             raise ValueError("boosting tree param's n_iter_no_change {} not supported, should be bool type".format(
                 boost_param.n_iter_no_change))
 
+        if type(boost_param.pack_grad_and_hess).__name__ != "bool":
+            raise ValueError("boosting tree param's pack_grad_and_hess {} not supported, should be bool type".format(
+                boost_param.pack_grad_and_hess))
+
+        if type(boost_param.use_goss).__name__ != "bool":
+            raise ValueError("boosting tree param's use_goss {} not supported, should be bool type".format(
+                boost_param.use_goss))
+
+        if type(boost_param.lockstep_multi_class).__name__ != "bool":
+            raise ValueError("boosting tree param's lockstep_multi_class {} not supported, should be bool type".format(
+                boost_param.lockstep_multi_class))
+
+        if type(boost_param.use_bitmap_predict).__name__ != "bool":
+            raise ValueError("boosting tree param's use_bitmap_predict {} not supported, should be bool type".format(
+                boost_param.use_bitmap_predict))
+
+        if boost_param.use_goss:
+            if type(boost_param.top_rate).__name__ not in ["float", "int", "long"] or \
+                    boost_param.top_rate <= 0 or boost_param.top_rate > 1:
+                raise ValueError("boosting tree param's top_rate should be a numeric number in (0, 1]")
+
+            if type(boost_param.other_rate).__name__ not in ["float", "int", "long"] or \
+                    boost_param.other_rate < 0 or boost_param.top_rate + boost_param.other_rate > 1:
+                raise ValueError("boosting tree param's other_rate should be a numeric number in [0, 1 - top_rate]")
+
         if type(boost_param.tol).__name__ not in ["float", "int", "long"]:
             raise ValueError("boosting tree param's tol {} not supported, should be numeric".format(boost_param.tol))
 
@@ -356,6 +381,21 @@ class IntersectParamChecker(object):
                 "intersect param's only_output_key {} not supported, should be bool type".format(
                     intersect_param.is_send_intersect_ids))
 
+        if intersect_param.sign_cache_name is not None and type(intersect_param.sign_cache_name).__name__ != "str":
+            raise ValueError(
+                "intersect param's sign_cache_name {} not supported, should be str or None".format(
+                    intersect_param.sign_cache_name))
+
+        intersect_param.transfer_mode = check_and_change_lower(intersect_param.transfer_mode,
+                                                               [consts.TABLE, consts.BLOOM_FILTER],
+                                                               descr)
+
+        if type(intersect_param.bloom_filter_fpr).__name__ not in ["float"] or \
+                intersect_param.bloom_filter_fpr <= 0 or intersect_param.bloom_filter_fpr >= 1:
+            raise ValueError(
+                "intersect param's bloom_filter_fpr {} not supported, should be float between 0 and 1".format(
+                    intersect_param.bloom_filter_fpr))
+
         EncodeParamChecker.check_param(intersect_param.encode_params)
         LOGGER.debug("Finish intersect parameter check!")
         return True
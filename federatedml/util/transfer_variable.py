@@ -52,6 +52,10 @@ class RawIntersectTransferVariable(BaseTransferVariable):
         self.send_ids_guest = Variable(name="RawIntersectTransferVariable.send_ids_guest", auth={'src': "guest", 'dst': ['host']})
         self.intersect_ids_host = Variable(name="RawIntersectTransferVariable.intersect_ids_host", auth={'src': "host", 'dst': ['guest']})
         self.intersect_ids_guest = Variable(name="RawIntersectTransferVariable.intersect_ids_guest", auth={'src': "guest", 'dst': ['host']})
+        self.send_filter_host = Variable(name="RawIntersectTransferVariable.send_filter_host", auth={'src': "host", 'dst': ['guest']})
+        self.send_filter_guest = Variable(name="RawIntersectTransferVariable.send_filter_guest", auth={'src': "guest", 'dst': ['host']})
+        self.candidate_ids_host = Variable(name="RawIntersectTransferVariable.candidate_ids_host", auth={'src': "host", 'dst': ['guest']})
+        self.candidate_ids_guest = Variable(name="RawIntersectTransferVariable.candidate_ids_guest", auth={'src': "guest", 'dst': ['host']})
         pass
 
 
@@ -97,6 +101,7 @@ class HeteroSecureBoostingTreeTransferVariable(BaseTransferVariable):
     def define_transfer_variable(self):
         self.tree_dim = Variable(name="HeteroSecureBoostingTreeTransferVariable.tree_dim", auth={'src': "guest", 'dst': ['host']})
         self.stop_flag = Variable(name="HeteroSecureBoostingTreeTransferVariable.stop_flag", auth={'src': "guest", 'dst': ['host']})
+        self.host_split_bitmap = Variable(name="HeteroSecureBoostingTreeTransferVariable.host_split_bitmap", auth={'src': "host", 'dst': ['guest']})
         pass
 
 
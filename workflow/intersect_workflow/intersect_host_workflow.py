@@ -17,6 +17,7 @@
 from arch.api.utils import log_utils
 from federatedml.param import IntersectParam
 from federatedml.statistic.intersect.intersect_host import RsaIntersectionHost, RawIntersectionHost
+from federatedml.util import consts
 from federatedml.util.param_extract import ParamExtract
 from workflow.workflow import WorkFlow
 
@@ -42,8 +43,16 @@ class IntersectHostWorkFlow(WorkFlow):
         else:
             raise TypeError("intersect_method {} is not support yet".format(self.workflow_param.intersect_method))
 
+        # the rsa key of a sign cache is kept in the model table, the cache itself only knows its public part
+        keep_rsa_key = self.intersect_param.intersect_method == consts.RSA and \
+                       self.intersect_param.sign_cache_name is not None
+        if keep_rsa_key:
+            self.intersection.load_model(self.workflow_param.model_table, self.workflow_param.model_namespace)
+
         intersect_ids = self.intersection.run(data_instance)
 
+        if keep_rsa_key:
+            self.intersection.save_model(self.workflow_param.model_table, self.workflow_param.model_namespace)
 
         self.save_intersect_result(intersect_ids)
         LOGGER.info("Save intersect results")